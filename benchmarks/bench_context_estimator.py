@@ -0,0 +1,45 @@
+"""Benchmark: Context-Schätzung per Datei-Lesen ('read') vs. Dateigrößen ('stat')
+
+Verwendung:
+    python -m benchmarks.bench_context_estimator [verzeichnis ...]
+
+Ohne Argument wird das aktuelle Verzeichnis gemessen.
+"""
+
+import os
+import sys
+import time
+
+from my_agents.project_index import ProjectIndex
+from my_agents.context_estimator import estimate_project_context_size, categorize_token_count
+
+
+def bench(work_dir: str) -> None:
+    results = {}
+    for mode in ('read', 'stat'):
+        # Eigener Index pro Modus: 'read' füllt entry.tokens, ein geteilter
+        # Index würde 'stat' die exakten Werte liefern (0% Abweichung)
+        start = time.perf_counter()
+        project_index = ProjectIndex.build(work_dir)
+        index_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        tokens = estimate_project_context_size(project_index, mode=mode)
+        results[mode] = (tokens, time.perf_counter() - start)
+
+    read_tokens, read_time = results['read']
+    stat_tokens, stat_time = results['stat']
+    error = abs(stat_tokens - read_tokens) / read_tokens * 100 if read_tokens else 0.0
+
+    print(f"📂 {work_dir}: {len(project_index)} Dateien, "
+          f"{project_index.total_size / 1e6:.1f} MB (Index: {index_time:.3f}s)")
+    print(f"   read: {read_tokens:>12,} Tokens  {read_time:8.3f}s  → {categorize_token_count(read_tokens)}")
+    print(f"   stat: {stat_tokens:>12,} Tokens  {stat_time:8.3f}s  → {categorize_token_count(stat_tokens)}")
+    print(f"   Abweichung: {error:.2f}%  Speed-Up: {read_time / max(stat_time, 1e-9):.1f}x")
+
+
+if __name__ == "__main__":
+    # Kalt messen: ohne Scan-Cache aus früheren Läufen
+    os.environ['AGENTS_SCAN_CACHE'] = '0'
+    for work_dir in sys.argv[1:] or ['.']:
+        bench(work_dir)
@@ -0,0 +1,84 @@
+"""Benchmark: os.walk vs. paralleler os.scandir-Walker auf synthetischen Repos
+
+Verwendung:
+    python -m benchmarks.bench_fs_walker [anzahl_dateien ...]
+
+Standard: 10k, 100k und 1M Dateien (1M benötigt einige GB Inodes und Zeit).
+Die Repos werden in einem temporären Verzeichnis erzeugt und danach gelöscht.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from my_agents.fs_walker import walk_files, WALK_WORKERS
+from my_agents.ignore_rules import DEFAULT_IGNORE_DIRS, IgnoreMatcher
+from my_agents.project_index import ProjectIndex, _is_relevant
+
+FILES_PER_DIR = 50
+DIRS_PER_LEVEL = 20
+EXTENSIONS = ('.py', '.js', '.md', '.json', '.bin')
+
+
+def create_synthetic_repo(root: str, file_count: int) -> None:
+    """Erzeugt file_count kleine Dateien in einem Baum mit 50 Dateien pro Ordner"""
+    for i in range(file_count):
+        d = i // FILES_PER_DIR
+        rel_dir = os.path.join(f"pkg{d // (DIRS_PER_LEVEL ** 2)}",
+                               f"mod{(d // DIRS_PER_LEVEL) % DIRS_PER_LEVEL}",
+                               f"sub{d % DIRS_PER_LEVEL}")
+        if i % FILES_PER_DIR == 0:
+            os.makedirs(os.path.join(root, rel_dir), exist_ok=True)
+        with open(os.path.join(root, rel_dir, f"file{i}{EXTENSIONS[i % len(EXTENSIONS)]}"), 'w') as f:
+            f.write("x = 1\n")
+    # Ein ignorierter Teilbaum, der nicht gescannt werden darf
+    os.makedirs(os.path.join(root, 'node_modules', 'dep'), exist_ok=True)
+
+
+def walk_baseline(root: str) -> int:
+    """Bisheriges Verfahren: os.walk + Path-Objekte + os.stat pro Datei"""
+    from pathlib import Path
+    count = 0
+    for dirpath, dirs, files in os.walk(root):
+        dirs[:] = [d for d in dirs if d not in DEFAULT_IGNORE_DIRS]
+        for name in files:
+            path = Path(dirpath) / name
+            if _is_relevant(name):
+                path.stat()
+                count += 1
+    return count
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def bench(file_count: int) -> None:
+    root = tempfile.mkdtemp(prefix='bench_walker_')
+    try:
+        create_synthetic_repo(root, file_count)
+
+        matcher = IgnoreMatcher.for_project(root)
+        baseline, t_base = timed(lambda: walk_baseline(root))
+        sequential, t_seq = timed(lambda: sum(1 for _ in walk_files(root, matcher, _is_relevant, workers=1)))
+        parallel, t_par = timed(lambda: sum(1 for _ in walk_files(root, matcher, _is_relevant)))
+        index, t_index = timed(lambda: ProjectIndex.build(root))
+        assert baseline == sequential == parallel == len(index)
+
+        print(f"📂 {file_count:>9,} Dateien ({parallel:,} relevant)")
+        print(f"   os.walk (bisher):         {t_base:8.3f}s")
+        print(f"   scandir sequentiell:      {t_seq:8.3f}s  ({t_base / t_seq:.1f}x)")
+        print(f"   scandir {WALK_WORKERS:>2} Threads:      {t_par:8.3f}s  ({t_base / t_par:.1f}x)")
+        print(f"   ProjectIndex.build:       {t_index:8.3f}s")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    for size in sizes:
+        bench(size)
@@ -0,0 +1,117 @@
+"""Benchmark: Trigramm-Index vs. vollständiger Regex-Scan auf einem synthetischen Repo
+
+Verwendung:
+    python -m benchmarks.bench_grep [größe_in_mb ...]
+
+Standard: 100 MB. Das Repo wird in einem temporären Verzeichnis erzeugt und
+danach gelöscht. Gemessen werden Index-Aufbau, No-op-Abgleich und die
+Latenz typischer Anfragen (erste Seite, 50 Treffer) über get_grep_index -
+wie im Grep-Tool, inklusive Abgleich vor der Suche - gegenüber einem Scan
+aller Dateien.
+"""
+
+import os
+import random
+import re
+import shutil
+import sys
+import tempfile
+import time
+
+from my_agents.grep_index import TrigramIndex, get_grep_index
+
+FILE_BYTES = 8 * 1024
+FILES_PER_DIR = 100
+WORDS = ['user', 'account', 'session', 'token', 'request', 'response', 'handler', 'config',
+         'cache', 'value', 'result', 'item', 'index', 'buffer', 'stream', 'parse', 'render',
+         'update', 'delete', 'create', 'load', 'save', 'query', 'filter', 'order', 'price']
+QUERIES = [
+    r'def load_user_session',               # selten, langes Literal
+    r'class \w+Handler\(',                  # Literal + Regex
+    r'rare_marker_\d+',                     # sehr selten
+    r'import (os|sys)',                     # Alternative: nur 'import ' als Literal
+]
+
+
+def _identifier(rng: random.Random) -> str:
+    return '_'.join(rng.choice(WORDS) for _ in range(rng.randint(1, 3)))
+
+
+def create_synthetic_repo(root: str, size_mb: int) -> int:
+    """Erzeugt Python-ähnliche Dateien mit insgesamt size_mb MB"""
+    rng = random.Random(42)
+    count = size_mb * 1024 * 1024 // FILE_BYTES
+    for i in range(count):
+        rel_dir = os.path.join(f"pkg{i // (FILES_PER_DIR * 50)}", f"mod{(i // FILES_PER_DIR) % 50}")
+        if i % FILES_PER_DIR == 0:
+            os.makedirs(os.path.join(root, rel_dir), exist_ok=True)
+        parts = [f"import {rng.choice(['os', 'sys', 'json', 're'])}\n\n"]
+        size = 0
+        while size < FILE_BYTES:
+            if rng.random() < 0.2:
+                block = f"class {_identifier(rng).title().replace('_', '')}Handler(object):\n"
+            else:
+                block = (f"def {_identifier(rng)}({_identifier(rng)}, {_identifier(rng)}):\n"
+                         f"    {_identifier(rng)} = {_identifier(rng)}.{_identifier(rng)}({rng.randint(0, 999)})\n"
+                         f"    return {_identifier(rng)}\n\n")
+            parts.append(block)
+            size += len(block)
+        if i % 997 == 0:
+            parts.append(f"rare_marker_{i} = True\n")
+        with open(os.path.join(root, rel_dir, f"file{i}.py"), 'w') as f:
+            f.write(''.join(parts))
+    return count
+
+
+def full_scan(root: str, pattern: str, limit: int = 50) -> int:
+    """Referenz: jede Datei lesen und die Regex ausführen (erste Seite)"""
+    regex = re.compile(pattern)
+    found = 0
+    for dirpath, _, files in sorted(os.walk(root)):
+        for name in sorted(files):
+            with open(os.path.join(dirpath, name), encoding='utf-8', errors='ignore') as f:
+                for line in f:
+                    if regex.search(line):
+                        found += 1
+                        if found >= limit:
+                            return found
+    return found
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def bench(size_mb: int) -> None:
+    root = tempfile.mkdtemp(prefix='bench_grep_')
+    try:
+        files = create_synthetic_repo(root, size_mb)
+        index = TrigramIndex(root)
+        (indexed, _), t_build = timed(index.update)
+        _, t_noop = timed(index.update)
+        db_size = os.path.getsize(os.path.join(root, '.agents_cache', 'grep.sqlite'))
+
+        print(f"📂 {size_mb} MB, {files:,} Dateien ({indexed:,} indexiert)")
+        print(f"   Index-Aufbau:      {t_build:8.2f}s  (Index {db_size / 1024 / 1024:.0f} MB)")
+        print(f"   No-op-Abgleich:    {t_noop:8.2f}s")
+        index.close()
+        # Wie das Tool: erster Zugriff gleicht einmal ab, danach nur gemeldete Änderungen
+        _, t_first = timed(lambda: get_grep_index(root))
+        print(f"   Erster Zugriff:    {t_first:8.2f}s")
+        for pattern in QUERIES:
+            get_grep_index(root).grep(pattern)  # Seiten-Cache des OS aufwärmen
+            result, t_index = timed(lambda: get_grep_index(root).grep(pattern))
+            _, t_scan = timed(lambda: full_scan(root, pattern))
+            print(f"   {pattern!r:34} Index {t_index * 1000:7.1f} ms  Scan {t_scan * 1000:8.1f} ms  "
+                  f"({result.candidates:,} Kandidaten, {len(result.matches)} Treffer)")
+        get_grep_index(root).close()
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100]
+    for size in sizes:
+        bench(size)
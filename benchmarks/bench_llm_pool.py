@@ -0,0 +1,121 @@
+"""Benchmark: LLM-Registry mit gemeinsamem Verbindungs-Pool vs. eine LLM-Instanz pro Agent
+
+Verwendung:
+    python -m benchmarks.bench_llm_pool [aufrufe] [handshake_ms]
+
+Standard: 50 Aufrufe, 40 ms Handshake. Ein lokaler Stub-Server beantwortet
+Chat-Completions im OpenAI-Format; jede neue Verbindung wird um handshake_ms
+verzögert (simuliert TCP + TLS + Round-Trip zu openrouter.ai). Die Aufrufe
+werden reihum auf die Agents der Fullstack-Crew verteilt - einmal wie bisher
+mit einem neuen LLM pro Agent, einmal über get_llm().
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+COMPLETION = {
+    'id': 'stub', 'object': 'chat.completion', 'created': 0, 'model': 'stub',
+    'choices': [{'index': 0, 'finish_reason': 'stop',
+                 'message': {'role': 'assistant', 'content': 'ok'}}],
+    'usage': {'prompt_tokens': 1, 'completion_tokens': 1, 'total_tokens': 2},
+}
+
+# Die Agents der Fullstack-Crew (Orchestrator + 8 Agents, Architect doppelt)
+FULLSTACK_ROLES = ['orchestrator', 'architect', 'backend', 'developer', 'architect',
+                   'tester', 'devops', 'documenter']
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Antwort in einem Stück senden - sonst misst man Nagle/Delayed-ACK statt Handshakes
+    disable_nagle_algorithm = True
+    wbufsize = 64 * 1024
+    handshake_seconds = 0.0
+    connections = 0
+    lock = threading.Lock()
+
+    def setup(self):
+        # Einmal pro Verbindung - wie ein Handshake
+        with StubHandler.lock:
+            StubHandler.connections += 1
+        time.sleep(self.handshake_seconds)
+        super().setup()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        body = json.dumps(COMPLETION).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_stub(handshake_ms: float) -> ThreadingHTTPServer:
+    StubHandler.handshake_seconds = handshake_ms / 1000
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run(name: str, make_llms, calls: int) -> None:
+    StubHandler.connections = 0
+    start = time.perf_counter()
+    llms = make_llms()
+    t_create = time.perf_counter() - start
+    for i in range(calls):
+        llms[i % len(llms)].call(f"Aufruf {i}")
+    total = time.perf_counter() - start
+    print(f"   {name:28} {total * 1000:8.0f} ms  (Erzeugen {t_create * 1000:6.0f} ms, "
+          f"{len({id(llm) for llm in llms})} Instanzen, {StubHandler.connections} Verbindungen)")
+
+
+def bench(calls: int, handshake_ms: float) -> None:
+    server = start_stub(handshake_ms)
+    # Der Stub muss feststehen, bevor llm_config die Basis-URL liest
+    os.environ['OPENROUTER_BASE_URL'] = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    os.environ.setdefault('OPENROUTER_API_KEY', 'stub')
+    from crewai import LLM
+    from my_agents import llm_config
+
+    def role_models():
+        # Modellnamen über die Rollen-Funktionen, ohne Registry
+        models = []
+        for role in FULLSTACK_ROLES:
+            models.append(getattr(llm_config, f"get_{role}_llm")().model)
+        llm_config.clear_llm_registry()
+        return models
+
+    models = role_models()
+
+    def one_llm_per_agent():
+        return [LLM(model=f"openrouter/{model}" if not model.startswith('openrouter/') else model,
+                    api_key=os.environ['OPENROUTER_API_KEY'], base_url=llm_config.OPENROUTER_BASE_URL)
+                for model in models]
+
+    def registry():
+        llm_config.clear_llm_registry()
+        return [getattr(llm_config, f"get_{role}_llm")() for role in FULLSTACK_ROLES]
+
+    # Aufwärmen: Lazy-Imports von openai/crewai beim ersten Aufruf nicht mitmessen
+    one_llm_per_agent()[0].call("warmup")
+
+    print(f"🔌 {calls} Aufrufe, {len(FULLSTACK_ROLES)} Agents, {handshake_ms:.0f} ms pro Verbindungsaufbau")
+    run("Ein LLM pro Agent (vorher)", one_llm_per_agent, calls)
+    run("Registry + Pool", registry, calls)
+    llm_config.clear_llm_registry()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    handshake_ms = float(sys.argv[2]) if len(sys.argv) > 2 else 40
+    bench(calls, handshake_ms)
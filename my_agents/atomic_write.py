@@ -0,0 +1,191 @@
+"""Atomisches Schreiben und Löschen mehrerer Dateien (Temp-Datei + Rename, alles oder nichts)"""
+
+import os
+import shutil
+import stat
+import tempfile
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+
+class WrittenFile(NamedTuple):
+    """Ergebnis für eine geschriebene Datei"""
+    path: str       # relativ zum Arbeitsverzeichnis
+    created: bool   # neu angelegt (sonst überschrieben)
+
+
+def resolve_in_work_dir(work_dir: Path, filename: str) -> Path:
+    """
+    Löst einen Dateinamen relativ zum Arbeitsverzeichnis auf.
+
+    Raises:
+        ValueError: Pfad liegt außerhalb des Arbeitsverzeichnisses
+    """
+    file_path = (work_dir / filename).resolve()
+    if work_dir not in file_path.parents:
+        raise ValueError(f"Pfad liegt außerhalb des Arbeitsverzeichnisses: {filename}")
+    return file_path
+
+
+def _read_umask() -> int:
+    # Lässt sich nur durch Setzen auslesen - daher einmal beim Import, nicht während Threads schreiben
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+_UMASK = _read_umask()
+
+
+def _target_mode(file_path: Path) -> int:
+    """Rechte für die neue Version: wie die bestehende Datei, sonst 0666 minus umask"""
+    try:
+        return stat.S_IMODE(os.stat(file_path).st_mode)
+    except FileNotFoundError:
+        return 0o666 & ~_UMASK
+
+
+def _fsync_directory(directory: Path) -> None:
+    """Macht Renames in einem Ordner dauerhaft (nicht auf allen Plattformen möglich)"""
+    if not hasattr(os, 'O_DIRECTORY'):
+        return
+    fd = os.open(str(directory), os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def write_files_atomic(work_dir: str, files: Sequence[Tuple[str, str]],
+                       deletes: Sequence[str] = ()) -> List[WrittenFile]:
+    """
+    Schreibt (und löscht) mehrere Dateien als eine Einheit.
+
+    1. Alle Pfade prüfen - liegt einer außerhalb von work_dir, wird nichts geschrieben
+    2. Inhalte in Temp-Dateien im Zielordner schreiben (fsync pro Datei)
+    3. Temp-Dateien per os.replace an ihr Ziel bewegen (atomar pro Datei)
+    4. Zu löschende Dateien per os.replace zur Seite legen
+    5. fsync einmal pro betroffenem Ordner, dann Sicherungen entfernen
+
+    Schlägt ein Schritt fehl, werden bereits ersetzte und gelöschte Dateien
+    aus Sicherungen wiederhergestellt, neue Dateien und neu angelegte Ordner
+    entfernt.
+
+    Args:
+        work_dir: Arbeitsverzeichnis
+        files: (Dateiname relativ zu work_dir, Inhalt)
+        deletes: Zu löschende Dateinamen relativ zu work_dir (fehlende werden übersprungen)
+
+    Returns:
+        Geschriebene Dateien in Eingabe-Reihenfolge
+
+    Raises:
+        ValueError: Pfad außerhalb von work_dir oder doppelt im Batch
+        OSError: Schreibfehler (nach dem Rollback)
+    """
+    work_dir_path = Path(work_dir).resolve()
+    targets: Dict[Path, str] = {}
+    for filename, content in files:
+        file_path = resolve_in_work_dir(work_dir_path, filename)
+        if file_path in targets:
+            raise ValueError(f"Datei kommt mehrfach im Batch vor: {filename}")
+        targets[file_path] = content
+    removals: List[Path] = []
+    for filename in deletes:
+        # Nur den Ordner auflösen - gelöscht wird der Eintrag selbst, nie das Ziel eines Symlinks
+        parent = (work_dir_path / filename).parent.resolve()
+        if parent != work_dir_path and work_dir_path not in parent.parents:
+            raise ValueError(f"Pfad liegt außerhalb des Arbeitsverzeichnisses: {filename}")
+        file_path = parent / Path(filename).name
+        if file_path in targets or file_path in removals:
+            raise ValueError(f"Datei kommt mehrfach im Batch vor: {filename}")
+        removals.append(file_path)
+
+    created_dirs: List[Path] = []
+    temp_files: Dict[Path, str] = {}
+    backups: Dict[Path, str] = {}
+    replaced: List[Path] = []
+    removed_backups: Dict[Path, str] = {}
+    removed: List[Path] = []
+    try:
+        # Phase 1: Temp-Dateien schreiben (Zielordner bleiben unverändert)
+        for file_path, content in targets.items():
+            missing = []
+            parent = file_path.parent
+            while not parent.exists():
+                missing.append(parent)
+                parent = parent.parent
+            for directory in reversed(missing):
+                directory.mkdir()
+                created_dirs.append(directory)
+
+            fd, temp_path = tempfile.mkstemp(dir=str(file_path.parent), prefix=f".{file_path.name}.", suffix='.tmp')
+            temp_files[file_path] = temp_path
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(content)
+                f.flush()
+                os.fsync(f.fileno())
+            # mkstemp legt 0600 an - Rechte der bestehenden Datei bzw. Standard (umask) übernehmen
+            os.chmod(temp_path, _target_mode(file_path))
+
+        # Phase 2: Sicherungen der bestehenden Dateien, dann atomar ersetzen
+        for file_path, temp_path in temp_files.items():
+            if file_path.exists():
+                backup = f"{temp_path}.bak"
+                try:
+                    os.link(file_path, backup)
+                except OSError:
+                    shutil.copy2(file_path, backup)
+                backups[file_path] = backup
+            os.replace(temp_path, file_path)
+            replaced.append(file_path)
+
+        # Phase 3: Löschen = zur Seite legen (Name per mkstemp reserviert)
+        for file_path in removals:
+            if not os.path.lexists(file_path):
+                continue
+            fd, backup = tempfile.mkstemp(dir=str(file_path.parent), prefix=f".{file_path.name}.", suffix='.del')
+            os.close(fd)
+            removed_backups[file_path] = backup
+            os.replace(file_path, backup)
+            removed.append(file_path)
+
+        for directory in {file_path.parent for file_path in list(targets) + removed}:
+            _fsync_directory(directory)
+
+    except BaseException:
+        # Rollback in umgekehrter Reihenfolge
+        for file_path in reversed(removed):
+            try:
+                os.replace(removed_backups[file_path], file_path)
+            except OSError:
+                pass
+        for file_path in reversed(replaced):
+            backup = backups.pop(file_path, None)
+            try:
+                if backup is not None:
+                    os.replace(backup, file_path)
+                else:
+                    file_path.unlink()
+            except OSError:
+                pass
+        for path in list(temp_files.values()) + list(backups.values()) + list(removed_backups.values()):
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+        for directory in reversed(created_dirs):
+            try:
+                directory.rmdir()
+            except OSError:
+                pass
+        raise
+
+    for backup in list(backups.values()) + list(removed_backups.values()):
+        try:
+            os.unlink(backup)
+        except OSError:
+            pass
+
+    return [WrittenFile(str(file_path.relative_to(work_dir_path)), file_path not in backups)
+            for file_path in targets]
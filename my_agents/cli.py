@@ -19,6 +19,9 @@ def print_help():
     print("   agents \"Deine Aufgabe\"          → 🤖 LLM-Router wählt Team")
     print("   agents --team small \"Aufgabe\"   → Manuell Team wählen")
     print("   agents --list                    → Zeige alle Teams")
+    print("   agents --refresh-summary \"...\"   → Projekt-Zusammenfassung neu erstellen")
+    print("   agents --dry-run \"...\"           → Änderungen nur als Diff anzeigen, nichts schreiben")
+    print("   agents --clear-cache             → Lösche Cache (.agents_cache/)")
     print()
     print("💡 Beispiele:")
     print("   agents \"Erstelle eine FastAPI Todo-App\"")
@@ -54,6 +57,20 @@ def list_teams():
     print()
     print("💡 Verwendung: agents --team <name> \"Deine Aufgabe\"")
 
+def print_tool_metrics(work_dir):
+    """Zeige die Tool-Aufrufe des Laufs und speichere den JSON-Bericht"""
+    from my_agents.tool_metrics import TOOL_METRICS_ENABLED, get_tool_metrics
+    if not TOOL_METRICS_ENABLED:
+        return
+    metrics = get_tool_metrics()
+    print("─" * 60)
+    print("🔧 Tool-Aufrufe:")
+    print(metrics.format_table())
+    try:
+        print(f"📊 Bericht: {metrics.write_report(work_dir)}")
+    except OSError as e:
+        print(f"⚠️  Bericht nicht gespeichert: {e}")
+
 def main():
     # Prüfe ob OpenRouter API Key gesetzt ist
     if not os.getenv('OPENROUTER_API_KEY'):
@@ -76,20 +93,37 @@ def main():
         list_teams()
         sys.exit(0)
     
-    # Manuelle Team-Auswahl?
-    manual_team = None
-    task_start_idx = 0
-    
-    if len(args) >= 2 and args[0] in ['-t', '--team']:
-        manual_team = args[1]
-        task_start_idx = 2
+    if args[0] == '--clear-cache':
+        from my_agents.scan_cache import clear_cache
+        if clear_cache(work_dir):
+            print(f"🗑️  Cache gelöscht: {work_dir}")
+        else:
+            print("ℹ️  Kein Cache vorhanden")
+        sys.exit(0)
     
-    if len(args) <= task_start_idx:
+    # Optionen vor der Aufgabe (Manuelle Team-Auswahl, Cache-Steuerung)
+    manual_team = None
+    dry_run = False
+    
+    while args:
+        if len(args) >= 2 and args[0] in ['-t', '--team']:
+            manual_team = args[1]
+            args = args[2:]
+        elif args[0] == '--refresh-summary':
+            os.environ['AGENTS_REFRESH_SUMMARY'] = '1'
+            args = args[1:]
+        elif args[0] == '--dry-run':
+            dry_run = True
+            args = args[1:]
+        else:
+            break
+    
+    if not args:
         print("❌ Keine Aufgabe angegeben!")
         print("💡 Verwendung: agents \"Deine Aufgabe\"")
         sys.exit(1)
     
-    task = " ".join(args[task_start_idx:])
+    task = " ".join(args)
     
     print("╔════════════════════════════════════════════════════════╗")
     print("║         🤖 Starte Multi-Agent System                  ║")
@@ -98,6 +132,10 @@ def main():
     print(f"📋 Aufgabe: {task}")
     print("─" * 60)
     
+    # Projekt einmal scannen - der Index wird von allen Crews wiederverwendet
+    from my_agents.project_index import ProjectIndex
+    project_index = ProjectIndex.build(work_dir)
+    
     # Crew auswählen
     from my_agents.crew_selector import select_crew, get_crew_description
     
@@ -124,14 +162,14 @@ def main():
                 print("💡 Nutze: agents --list")
                 sys.exit(1)
             
-            crew = get_crew(work_dir)
+            crew = get_crew(work_dir, project_index, task)
         except ImportError as e:
             print(f"❌ Fehler beim Laden des Teams: {e}")
             sys.exit(1)
     else:
         # Auto-Auswahl mit LLM-Router
         print("🤖 Router-Agent analysiert Aufgabe für beste Team-Auswahl...")
-        crew, team_name = select_crew(task, work_dir)
+        crew, team_name = select_crew(task, work_dir, project_index)
         print(f"🎯 Router wählt: {get_crew_description(team_name)}")
     
     print("─" * 60)
@@ -140,6 +178,15 @@ def main():
     # Wechsle zum Arbeitsverzeichnis
     os.chdir(work_dir)
     
+    # Schreib-/Löschzugriffe der Tools im Speicher sammeln - erst nach
+    # erfolgreichem Lauf auf die Platte (ein fehlgeschlagener Lauf ändert nichts)
+    from my_agents.overlay_fs import activate_overlay, deactivate_overlay
+    overlay = activate_overlay(work_dir)
+    
+    # Tool-Aufrufe pro Agent und Task messen (Tabelle + JSON-Bericht am Ende)
+    from my_agents.tool_metrics import instrument_crew
+    instrument_crew(crew)
+    
     # Starte Crew
     try:
         result = crew.kickoff(inputs={'topic': task})
@@ -150,11 +197,31 @@ def main():
         print("─" * 60)
         print(result)
         
+        print("─" * 60)
+        if dry_run:
+            diff = overlay.diff()
+            print("🔍 Dry-Run - folgende Änderungen wurden NICHT geschrieben:")
+            print(diff if diff else "   (keine Änderungen)")
+        else:
+            # Offene Dateien des Lese-Caches schließen, bevor sie ersetzt werden
+            from my_agents.file_reader import get_read_cache
+            get_read_cache().clear()
+            written, deleted = overlay.flush()
+            print(f"💾 {len(written)} Dateien geschrieben, {len(deleted)} gelöscht")
+        
     except Exception as e:
         print(f"❌ Fehler: {e}")
+        print("↩️  Keine Dateien geändert")
         import traceback
         traceback.print_exc()
         sys.exit(1)
+    finally:
+        deactivate_overlay(work_dir)
+        print_tool_metrics(work_dir)
+        from my_agents.llm_cache import get_llm_cache
+        llm_cache_stats = get_llm_cache().format_stats()
+        if llm_cache_stats:
+            print(llm_cache_stats)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,220 @@
+"""Kompakte Code-Outlines: Klassen, Funktionen, Signaturen, Docstrings und Zeilennummern"""
+
+import ast
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Pattern
+
+from my_agents.disk_cache import LRUDiskCache, make_key
+from my_agents.scan_cache import get_cache_dir, hash_content
+
+
+# Bei Format-Änderungen erhöhen - alte Outlines werden dann nicht mehr gefunden
+OUTLINE_VERSION = 1
+OUTLINE_CACHE_FILE = 'outlines.sqlite'
+OUTLINE_CACHE_BYTES = 64 * 1024 * 1024
+
+# Größere Dateien (meist generiert) werden nicht analysiert
+OUTLINE_MAX_FILE_BYTES = 2 * 1024 * 1024
+DOCSTRING_MAX_CHARS = 120
+
+
+def _first_line(text: Optional[str]) -> str:
+    """Erste nicht-leere Zeile eines Docstrings/Kommentars (gekürzt)"""
+    for line in (text or '').strip().splitlines():
+        line = line.strip()
+        if line:
+            return line if len(line) <= DOCSTRING_MAX_CHARS else line[:DOCSTRING_MAX_CHARS - 1] + '…'
+    return ''
+
+
+def _python_signature(node: ast.AST) -> str:
+    """Signatur einer Funktion: name(args) -> return"""
+    prefix = 'async def' if isinstance(node, ast.AsyncFunctionDef) else 'def'
+    try:
+        args = ast.unparse(node.args)
+        returns = f" -> {ast.unparse(node.returns)}" if node.returns else ''
+    except Exception:
+        args, returns = '...', ''
+    return f"{prefix} {node.name}({args}){returns}"
+
+
+def _outline_python_nodes(nodes: List[ast.stmt], indent: str, lines: List[str]) -> None:
+    for node in nodes:
+        if isinstance(node, ast.ClassDef):
+            try:
+                bases = ', '.join(ast.unparse(base) for base in node.bases)
+            except Exception:
+                bases = ''
+            doc = _first_line(ast.get_docstring(node))
+            lines.append(f"{indent}{node.lineno}: class {node.name}" + (f"({bases})" if bases else '')
+                         + (f"  # {doc}" if doc else ''))
+            _outline_python_nodes(node.body, indent + '    ', lines)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            decorators = ''.join(f"@{ast.unparse(d)} " for d in node.decorator_list
+                                 if isinstance(d, (ast.Name, ast.Attribute)))
+            doc = _first_line(ast.get_docstring(node))
+            lines.append(f"{indent}{node.lineno}: {decorators}{_python_signature(node)}"
+                         + (f"  # {doc}" if doc else ''))
+        elif not indent and isinstance(node, (ast.Assign, ast.AnnAssign)):
+            # Modul-Konstanten (GROSS_GESCHRIEBEN)
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            names = [t.id for t in targets if isinstance(t, ast.Name) and t.id.isupper()]
+            if names:
+                lines.append(f"{node.lineno}: {', '.join(names)} = …")
+        elif not indent and isinstance(node, ast.If):
+            try:
+                if 'main' in ast.unparse(node.test) and '__name__' in ast.unparse(node.test):
+                    lines.append(f"{node.lineno}: if __name__ == '__main__'")
+            except Exception:
+                pass
+
+
+def outline_python(source: str) -> Optional[str]:
+    """Outline einer Python-Datei über das ast-Modul (None bei Syntaxfehlern)"""
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return None
+    lines = []
+    doc = _first_line(ast.get_docstring(tree))
+    if doc:
+        lines.append(f'"""{doc}"""')
+    _outline_python_nodes(tree.body, '', lines)
+    return '\n'.join(lines)
+
+
+# Zeilenbasierte Muster je Sprache (Signatur = gematchte Zeile bis '{' bzw. Zeilenende)
+_JS_PATTERNS = [
+    re.compile(r'^\s*(?:export\s+)?(?:default\s+)?(?:abstract\s+)?class\s+\w+'),
+    re.compile(r'^\s*(?:export\s+)?(?:interface|type|enum)\s+\w+'),
+    re.compile(r'^\s*(?:export\s+)?(?:default\s+)?(?:async\s+)?function\s*\*?\s*\w*\s*(?:<[^>]*>)?\s*\('),
+    re.compile(r'^\s*(?:export\s+)?(?:const|let|var)\s+\w+\s*(?::[^=]+)?=\s*(?:async\s+)?(?:\([^)]*\)|\w+)\s*(?::[^=]+)?=>'),
+    re.compile(r'^\s{2,}(?:(?:public|private|protected|static|async|readonly|get|set)\s+)*'
+               r'(?!if\b|for\b|while\b|switch\b|catch\b|return\b)\w+\s*(?:<[^>]*>)?\([^)]*\)\s*(?::\s*[^{]+)?\{'),
+]
+_GO_PATTERNS = [
+    re.compile(r'^func\s'),
+    re.compile(r'^type\s+\w+'),
+]
+_RUST_PATTERNS = [
+    re.compile(r'^\s*(?:pub(?:\([^)]*\))?\s+)?(?:async\s+)?(?:unsafe\s+)?(?:const\s+)?fn\s+\w+'),
+    re.compile(r'^\s*(?:pub(?:\([^)]*\))?\s+)?(?:struct|enum|trait|type|mod)\s+\w+'),
+    re.compile(r'^\s*impl\b'),
+]
+_JAVA_PATTERNS = [
+    re.compile(r'^\s*(?:(?:public|private|protected|static|final|abstract|sealed)\s+)*'
+               r'(?:class|interface|enum|record|@interface)\s+\w+'),
+    re.compile(r'^\s+(?:(?:public|private|protected|static|final|abstract|synchronized|native|default)\s+)+'
+               r'[\w<>\[\], ?]+\s+\w+\s*\([^)]*\)?'),
+]
+
+# Kommentar-Präfixe für Doku-Kommentare direkt über einer Definition
+_DOC_COMMENT = re.compile(r'^\s*(?:///?|/\*\*?|\*|//!)\s?(.*?)\s*(?:\*/)?$')
+
+LANGUAGE_PATTERNS: Dict[str, List[Pattern]] = {
+    '.js': _JS_PATTERNS, '.jsx': _JS_PATTERNS, '.ts': _JS_PATTERNS, '.tsx': _JS_PATTERNS,
+    '.mjs': _JS_PATTERNS, '.cjs': _JS_PATTERNS,
+    '.go': _GO_PATTERNS,
+    '.rs': _RUST_PATTERNS,
+    '.java': _JAVA_PATTERNS,
+}
+
+
+def outline_by_patterns(source: str, patterns: List[Pattern]) -> str:
+    """Outline über zeilenbasierte Regex-Muster (mit Einrückung und Doku-Kommentar)"""
+    lines = []
+    previous_doc: List[str] = []
+    for lineno, line in enumerate(source.splitlines(), 1):
+        stripped = line.strip()
+        if stripped.startswith(('//', '/*', '*')):
+            match = _DOC_COMMENT.match(line)
+            if match and match.group(1):
+                previous_doc.append(match.group(1))
+            continue
+        if any(pattern.match(line) for pattern in patterns):
+            signature = line.rstrip().rstrip('{').rstrip()
+            if len(signature) > 200:
+                signature = signature[:199] + '…'
+            doc = _first_line(previous_doc[0] if previous_doc else '')
+            lines.append(f"{lineno}: {signature}" + (f"  // {doc}" if doc else ''))
+        if stripped:
+            previous_doc = []
+    return '\n'.join(lines)
+
+
+def extract_outline(source: str, suffix: str) -> Optional[str]:
+    """
+    Erstellt die Outline eines Quelltexts.
+
+    Args:
+        source: Dateiinhalt
+        suffix: Dateiendung (z.B. '.py'), bestimmt die Sprache
+
+    Returns:
+        Outline (eine Definition pro Zeile mit Zeilennummer) oder None,
+        wenn die Sprache nicht unterstützt wird
+    """
+    suffix = suffix.lower()
+    if suffix == '.py':
+        return outline_python(source)
+    patterns = LANGUAGE_PATTERNS.get(suffix)
+    if patterns is None:
+        return None
+    return outline_by_patterns(source, patterns)
+
+
+def supports_outline(path: str) -> bool:
+    """Prüft ob für die Dateiendung eine Outline erstellt werden kann"""
+    suffix = os.path.splitext(path)[1].lower()
+    return suffix == '.py' or suffix in LANGUAGE_PATTERNS
+
+
+_outline_caches: Dict[str, LRUDiskCache] = {}
+_outline_caches_lock = threading.Lock()
+
+
+def get_outline_cache(work_dir: str) -> LRUDiskCache:
+    """Outline-Cache des Projekts (.agents_cache/outlines.sqlite), eine Verbindung pro Projekt und Prozess"""
+    key = str(Path(work_dir).resolve())
+    with _outline_caches_lock:
+        cache = _outline_caches.get(key)
+        if cache is None:
+            cache = _outline_caches[key] = LRUDiskCache(get_cache_dir(key) / OUTLINE_CACHE_FILE,
+                                                        max_bytes=OUTLINE_CACHE_BYTES)
+        return cache
+
+
+def outline_file(path: Path, cache: Optional[LRUDiskCache] = None) -> Optional[str]:
+    """
+    Outline einer Datei, gecacht über den Content-Hash.
+
+    Args:
+        path: Pfad zur Datei
+        cache: Optional, Outline-Cache (siehe get_outline_cache)
+
+    Returns:
+        Outline oder None (nicht unterstützt, nicht lesbar oder zu groß)
+    """
+    path = Path(path)
+    if not supports_outline(path.name):
+        return None
+    try:
+        if path.stat().st_size > OUTLINE_MAX_FILE_BYTES:
+            return None
+        data = path.read_bytes()
+    except OSError:
+        return None
+
+    key = make_key(str(OUTLINE_VERSION), path.suffix.lower(), hash_content(data))
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    outline = extract_outline(data.decode('utf-8', errors='ignore'), path.suffix)
+    if outline is not None and cache is not None:
+        cache.set(key, outline)
+    return outline
@@ -0,0 +1,313 @@
+"""Lokaler BM25-Suchindex über Code-Abschnitte des Arbeitsverzeichnisses"""
+
+import math
+import os
+import re
+import sqlite3
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from my_agents.ignore_rules import get_project_matcher
+from my_agents.project_index import ProjectIndex, _is_relevant
+from my_agents.scan_cache import get_cache_dir, hash_content
+
+
+SEARCH_INDEX_FILE = 'search.sqlite'
+
+# Bei Format-Änderungen erhöhen - alte Indizes werden dann neu aufgebaut
+SEARCH_INDEX_VERSION = 1
+
+# Zeilen pro Abschnitt (Suchtreffer = Abschnitt mit Pfad und Zeilenbereich)
+SEARCH_CHUNK_LINES = 40
+
+# Größere Dateien (meist generiert) werden nicht indexiert
+SEARCH_MAX_FILE_BYTES = 1024 * 1024
+
+# Zeilen pro Treffer in der Ausgabe
+SNIPPET_MAX_LINES = 12
+
+# BM25-Parameter
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_IDENTIFIER = re.compile(r'[A-Za-z_][A-Za-z0-9_]*|\d+')
+_CAMEL_PART = re.compile(r'[A-Z]?[a-z0-9]+|[A-Z]+(?![a-z])')
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Zerlegt Code in Suchbegriffe (klein geschrieben).
+
+    Bezeichner werden zusätzlich an camelCase- und snake_case-Grenzen
+    geteilt, sodass 'getUserName' auch für 'user' gefunden wird.
+    """
+    tokens = []
+    for word in _IDENTIFIER.findall(text):
+        lowered = word.lower()
+        if len(lowered) > 1:
+            tokens.append(lowered)
+        parts = [part.lower() for piece in word.split('_') for part in _CAMEL_PART.findall(piece)]
+        if len(parts) > 1:
+            tokens.extend(part for part in parts if len(part) > 1 and part != lowered)
+    return tokens
+
+
+class SearchHit(NamedTuple):
+    """Ein Treffer: Abschnitt einer Datei mit Score"""
+    path: str
+    start_line: int
+    end_line: int
+    score: float
+
+
+class CodeSearchIndex:
+    """
+    Invertierter Index über Datei-Abschnitte mit BM25-Ranking.
+
+    Persistiert in .agents_cache/search.sqlite. update() gleicht den Index
+    mit dem Dateisystem ab und indexiert nur neue oder geänderte Dateien
+    (Größe/mtime, dann Content-Hash); gelöschte Dateien werden entfernt.
+    Thread-sicher.
+    """
+
+    def __init__(self, work_dir: str):
+        self.work_dir = str(work_dir)
+        self._dirty: Set[str] = set()
+        self._lock = threading.RLock()
+        self._conn = self._open()
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(get_cache_dir(self.work_dir) / SEARCH_INDEX_FILE), check_same_thread=False)
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        row = conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        if row is None or row[0] != str(SEARCH_INDEX_VERSION):
+            for table in ('files', 'chunks', 'postings'):
+                conn.execute(f"DROP TABLE IF EXISTS {table}")
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)",
+                         (str(SEARCH_INDEX_VERSION),))
+        conn.execute("CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, size INTEGER, mtime REAL, hash TEXT)")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS chunks ("
+            " id INTEGER PRIMARY KEY, path TEXT, start_line INTEGER, end_line INTEGER, length INTEGER)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS chunks_path ON chunks (path)")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS postings ("
+            " term TEXT, chunk_id INTEGER, tf INTEGER, PRIMARY KEY (term, chunk_id)) WITHOUT ROWID"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS postings_chunk ON postings (chunk_id)")
+        conn.commit()
+        return conn
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def mark_dirty(self, rel_path: str) -> None:
+        """Markiert eine Datei zur Neu-Indexierung vor der nächsten Suche (z.B. nach Write File)"""
+        with self._lock:
+            self._dirty.add(os.path.normpath(rel_path))
+
+    def _remove(self, paths: Iterable[str]) -> None:
+        for path in paths:
+            chunk_ids = [(chunk_id,) for (chunk_id,) in
+                         self._conn.execute("SELECT id FROM chunks WHERE path = ?", (path,))]
+            self._conn.executemany("DELETE FROM postings WHERE chunk_id = ?", chunk_ids)
+            self._conn.execute("DELETE FROM chunks WHERE path = ?", (path,))
+            self._conn.execute("DELETE FROM files WHERE path = ?", (path,))
+
+    def _index_file(self, rel_path: str, size: int, mtime: float, data: bytes) -> None:
+        lines = data.decode('utf-8', errors='ignore').splitlines()
+        for start in range(0, max(len(lines), 1), SEARCH_CHUNK_LINES):
+            tokens = tokenize('\n'.join(lines[start:start + SEARCH_CHUNK_LINES]))
+            if not tokens:
+                continue
+            cursor = self._conn.execute(
+                "INSERT INTO chunks (path, start_line, end_line, length) VALUES (?, ?, ?, ?)",
+                (rel_path, start + 1, min(start + SEARCH_CHUNK_LINES, len(lines)), len(tokens))
+            )
+            self._conn.executemany(
+                "INSERT INTO postings (term, chunk_id, tf) VALUES (?, ?, ?)",
+                [(term, cursor.lastrowid, tf) for term, tf in Counter(tokens).items()]
+            )
+        self._conn.execute("INSERT OR REPLACE INTO files (path, size, mtime, hash) VALUES (?, ?, ?, ?)",
+                           (rel_path, size, mtime, hash_content(data)))
+
+    def update(self, project_index: Optional[ProjectIndex] = None) -> Tuple[int, int]:
+        """
+        Gleicht den Index mit dem Arbeitsverzeichnis ab.
+
+        Args:
+            project_index: Optional, bereits gebauter Projekt-Index
+
+        Returns:
+            (neu indexierte Dateien, entfernte Dateien)
+        """
+        with self._lock:
+            project_index = project_index or ProjectIndex.build(self.work_dir)
+            known = {path: (size, mtime, content_hash) for path, size, mtime, content_hash in
+                     self._conn.execute("SELECT path, size, mtime, hash FROM files")}
+
+            removed = [path for path in known if project_index.get(path) is None]
+            self._remove(removed)
+
+            indexed = 0
+            for entry in project_index:
+                cached = known.get(entry.path)
+                if cached is not None and cached[:2] == (entry.size, entry.mtime) and entry.path not in self._dirty:
+                    continue
+                if entry.size > SEARCH_MAX_FILE_BYTES:
+                    self._remove([entry.path])
+                    continue
+                try:
+                    data = project_index.abs_path(entry).read_bytes()
+                except OSError:
+                    continue
+                if cached is not None and cached[2] == hash_content(data):
+                    # Nur mtime geändert (z.B. git checkout) - Inhalt identisch
+                    self._conn.execute("UPDATE files SET size = ?, mtime = ? WHERE path = ?",
+                                       (entry.size, entry.mtime, entry.path))
+                    continue
+                self._remove([entry.path])
+                self._index_file(entry.path, entry.size, entry.mtime, data)
+                indexed += 1
+
+            self._conn.commit()
+            self._dirty.clear()
+            return indexed, len(removed)
+
+    def update_dirty(self) -> int:
+        """
+        Indexiert nur die als geändert markierten Dateien neu (ohne Verzeichnis-Scan).
+
+        Returns:
+            Anzahl neu indexierter Dateien
+        """
+        with self._lock:
+            matcher = get_project_matcher(self.work_dir)
+            indexed = 0
+            for rel_path in self._dirty:
+                self._remove([rel_path])
+                abs_path = os.path.join(self.work_dir, rel_path)
+                if not _is_relevant(os.path.basename(rel_path)) or matcher.is_path_ignored(rel_path):
+                    continue
+                try:
+                    stat = os.stat(abs_path)
+                    if stat.st_size > SEARCH_MAX_FILE_BYTES:
+                        continue
+                    with open(abs_path, 'rb') as f:
+                        data = f.read()
+                except OSError:
+                    # Gelöscht - Einträge sind bereits entfernt
+                    continue
+                self._index_file(rel_path, stat.st_size, stat.st_mtime, data)
+                indexed += 1
+            self._conn.commit()
+            self._dirty.clear()
+            return indexed
+
+    def search(self, query: str, top_k: int = 5) -> List[SearchHit]:
+        """
+        Sucht die top_k relevantesten Abschnitte (BM25).
+
+        Args:
+            query: Suchbegriffe (Bezeichner, Wörter)
+            top_k: Anzahl Treffer
+
+        Returns:
+            Treffer absteigend nach Score
+        """
+        terms = sorted(set(tokenize(query)))
+        if not terms:
+            return []
+
+        with self._lock:
+            total, avg_length = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(AVG(length), 0) FROM chunks").fetchone()
+            if not total:
+                return []
+
+            scores: Dict[int, float] = {}
+            for term in terms:
+                postings = self._conn.execute(
+                    "SELECT p.chunk_id, p.tf, c.length FROM postings p JOIN chunks c ON c.id = p.chunk_id"
+                    " WHERE p.term = ?", (term,)
+                ).fetchall()
+                if not postings:
+                    continue
+                idf = math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+                for chunk_id, tf, length in postings:
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length)
+                    scores[chunk_id] = scores.get(chunk_id, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + norm)
+
+            best = sorted(scores.items(), key=lambda item: -item[1])[:top_k]
+            hits = []
+            for chunk_id, score in best:
+                path, start_line, end_line = self._conn.execute(
+                    "SELECT path, start_line, end_line FROM chunks WHERE id = ?", (chunk_id,)).fetchone()
+                hits.append(SearchHit(path, start_line, end_line, score))
+            return hits
+
+    def snippet(self, hit: SearchHit, query: str, max_lines: int = SNIPPET_MAX_LINES) -> Tuple[int, List[str]]:
+        """
+        Ausschnitt eines Treffers rund um die erste passende Zeile.
+
+        Returns:
+            (erste Zeilennummer, Zeilen)
+        """
+        try:
+            with open(os.path.join(self.work_dir, hit.path), encoding='utf-8', errors='ignore') as f:
+                lines = f.read().splitlines()[hit.start_line - 1:hit.end_line]
+        except OSError:
+            return hit.start_line, []
+
+        terms = set(tokenize(query))
+        first = next((i for i, line in enumerate(lines) if terms & set(tokenize(line))), 0)
+        start = max(0, min(first - 2, len(lines) - max_lines))
+        return hit.start_line + start, lines[start:start + max_lines]
+
+
+_indexes: Dict[str, CodeSearchIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def _index_key(work_dir: str) -> str:
+    # Wie die schreibenden Tools: Symlinks aufgelöst
+    return str(Path(work_dir).resolve())
+
+
+def get_search_index(work_dir: str, refresh: bool = False,
+                     project_index: Optional[ProjectIndex] = None) -> CodeSearchIndex:
+    """
+    Liefert den (pro Prozess geteilten) Suchindex eines Projekts.
+
+    Mit dem Dateisystem abgeglichen wird nur beim ersten Zugriff im Prozess
+    und bei refresh=True. Danach werden vor jeder Suche nur die als geändert
+    gemeldeten Dateien (mark_search_dirty) neu indexiert - eine Suche scannt
+    nie das ganze Verzeichnis.
+
+    Args:
+        work_dir: Arbeitsverzeichnis
+        refresh: Abgleich erzwingen
+        project_index: Optional, bereits gebauter Projekt-Index für den Abgleich
+    """
+    key = _index_key(work_dir)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        created = index is None
+        if created:
+            index = _indexes[key] = CodeSearchIndex(key)
+    if created or refresh:
+        index.update(project_index)
+    elif index._dirty:
+        index.update_dirty()
+    return index
+
+
+def mark_search_dirty(work_dir: str, rel_path: str) -> None:
+    """Meldet eine geschriebene/gelöschte Datei an einen bereits geladenen Suchindex"""
+    index = _indexes.get(_index_key(work_dir))
+    if index is not None:
+        index.mark_dirty(rel_path)
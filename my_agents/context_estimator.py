@@ -1,100 +1,219 @@
 """Schätzt Context-Größe eines Projekts"""
 
 import os
-from pathlib import Path
+from collections import defaultdict
+from typing import Dict, Optional
 
+from my_agents.project_index import ProjectIndex
+from my_agents.scan_cache import ScanCache
+from my_agents.token_counter import get_token_counter
 
-def estimate_project_context_size(work_dir: str) -> int:
+
+# Dateiendungen die in die Context-Schätzung einfließen
+ESTIMATE_EXTENSIONS = {
+    '.py', '.js', '.ts', '.jsx', '.tsx', '.java', '.cpp', '.c', 
+    '.h', '.hpp', '.cs', '.go', '.rs', '.rb', '.php', '.swift',
+    '.md', '.txt', '.json', '.yaml', '.yml', '.xml', '.html', 
+    '.css', '.scss', '.sql'
+}
+
+# Schätz-Modi: 'read' liest jede Datei, 'stat' nutzt nur Dateigrößen
+ESTIMATE_MODES = ('read', 'stat')
+DEFAULT_ESTIMATE_MODE = 'stat'
+
+# Schwellwerte für die Größenkategorien (in Tokens)
+SMALL_PROJECT_TOKENS = 100_000
+LARGE_PROJECT_TOKENS = 400_000
+
+# Fallback wenn für eine Endung keine Stichprobe gelesen werden konnte
+DEFAULT_BYTES_PER_TOKEN = 4.0
+
+# Grenzen der Kalibrierungs-Stichprobe
+CALIBRATION_MAX_SAMPLES = 64
+CALIBRATION_SAMPLES_PER_EXTENSION = 8
+CALIBRATION_MAX_SAMPLE_BYTES = 256 * 1024
+
+
+def _get_estimate_mode(mode: Optional[str]) -> str:
+    """Ermittelt den Schätz-Modus (Parameter > AGENTS_ESTIMATE_MODE > Standard)"""
+    mode = mode or os.getenv('AGENTS_ESTIMATE_MODE', DEFAULT_ESTIMATE_MODE)
+    if mode not in ESTIMATE_MODES:
+        # Tippfehler in der Umgebung soll den Lauf nicht abbrechen
+        print(f"⚠️  Unbekannter Schätz-Modus: {mode} (erlaubt: {', '.join(ESTIMATE_MODES)}) "
+              f"- nutze '{DEFAULT_ESTIMATE_MODE}'")
+        return DEFAULT_ESTIMATE_MODE
+    return mode
+
+
+def calibrate_bytes_per_token(project_index: ProjectIndex,
+                              max_samples: int = CALIBRATION_MAX_SAMPLES,
+                              samples_per_extension: int = CALIBRATION_SAMPLES_PER_EXTENSION,
+                              max_sample_bytes: int = CALIBRATION_MAX_SAMPLE_BYTES) -> Dict[str, float]:
     """
-    Schätzt die Context-Größe eines Projekts in Tokens.
+    Bestimmt das Verhältnis Bytes pro Token je Dateiendung anhand einer Stichprobe.
     
-    Grobe Schätzung: 1 Token ≈ 4 Zeichen
+    Endungen mit dem größten Byte-Anteil werden zuerst kalibriert. Pro Endung
+    werden höchstens samples_per_extension gleichmäßig verteilte Dateien gelesen,
+    insgesamt höchstens max_samples Dateien mit je max_sample_bytes Bytes.
     
     Args:
-        work_dir: Arbeitsverzeichnis
+        project_index: Projekt-Index
+        max_samples: Maximale Anzahl gelesener Dateien insgesamt
+        samples_per_extension: Maximale Anzahl gelesener Dateien pro Endung
+        max_sample_bytes: Maximale Bytes pro gelesener Datei
         
     Returns:
-        Geschätzte Context-Größe in Tokens
+        Dictionary {Endung: Bytes pro Token}
     """
-    try:
-        total_chars = 0
-        file_count = 0
-        
-        work_path = Path(work_dir)
-        
-        # Ignoriere bestimmte Ordner
-        ignore_dirs = {
-            'node_modules', '.git', '__pycache__', '.venv', 'venv', 
-            'dist', 'build', '.cache', '.pytest_cache', 'env'
-        }
+    by_extension = defaultdict(list)
+    for entry in project_index:
+        if entry.suffix in ESTIMATE_EXTENSIONS and entry.size > 0:
+            by_extension[entry.suffix].append(entry)
+    
+    # Endungen mit dem meisten Volumen zuerst
+    ordered = sorted(by_extension.items(), key=lambda item: -sum(e.size for e in item[1]))
+    
+    token_counter = get_token_counter()
+    ratios = {}
+    remaining = max_samples
+    for suffix, entries in ordered:
+        if remaining <= 0:
+            break
         
-        # Relevante Dateiendungen
-        relevant_extensions = {
-            '.py', '.js', '.ts', '.jsx', '.tsx', '.java', '.cpp', '.c', 
-            '.h', '.hpp', '.cs', '.go', '.rs', '.rb', '.php', '.swift',
-            '.md', '.txt', '.json', '.yaml', '.yml', '.xml', '.html', 
-            '.css', '.scss', '.sql'
-        }
+        count = min(samples_per_extension, remaining, len(entries))
+        step = len(entries) / count
+        sample = [entries[int(i * step)] for i in range(count)]
         
-        # Durchsuche Verzeichnis
-        for root, dirs, files in os.walk(work_path):
-            # Filtere ignorierte Ordner
-            dirs[:] = [d for d in dirs if d not in ignore_dirs]
-            
-            for file in files:
-                file_path = Path(root) / file
-                
-                # Prüfe Dateiendung
-                if file_path.suffix.lower() in relevant_extensions:
-                    try:
-                        # Lese Datei und zähle Zeichen
-                        content = file_path.read_text(encoding='utf-8', errors='ignore')
-                        total_chars += len(content)
-                        file_count += 1
-                    except Exception:
-                        # Ignoriere Dateien die nicht gelesen werden können
-                        pass
+        sampled_bytes = 0
+        sampled_tokens = 0.0
+        for entry in sample:
+            try:
+                with open(project_index.abs_path(entry), 'rb') as f:
+                    data = f.read(max_sample_bytes)
+            except OSError:
+                continue
+            tokens = token_counter.count_bytes(data)
+            if tokens > 0:
+                sampled_bytes += len(data)
+                sampled_tokens += tokens
         
-        # Schätze Tokens (1 Token ≈ 4 Zeichen)
-        estimated_tokens = total_chars // 4
+        remaining -= count
+        if sampled_tokens > 0:
+            ratios[suffix] = sampled_bytes / sampled_tokens
+    
+    return ratios
+
+
+def _estimate_by_reading(project_index: ProjectIndex) -> int:
+    """Zählt Tokens aller relevanten Dateien (liest nur seit dem letzten Lauf geänderte)"""
+    relevant = [entry for entry in project_index if entry.suffix in ESTIMATE_EXTENSIONS]
+    
+    with ScanCache(project_index.work_dir) as cache:
+        cache.refresh(project_index, relevant)
+    
+    return sum(entry.tokens or 0 for entry in relevant)
+
+
+def _estimate_by_stat(project_index: ProjectIndex) -> int:
+    """Rechnet Dateigrößen über kalibrierte Bytes-pro-Token-Verhältnisse um"""
+    # Exakte Token-Anzahl für unveränderte Dateien aus früheren Läufen
+    with ScanCache(project_index.work_dir) as cache:
+        cache.load(project_index)
+        cache.prune(project_index)
+    
+    ratios = calibrate_bytes_per_token(project_index)
+    
+    estimated_tokens = 0.0
+    for entry in project_index:
+        if entry.suffix not in ESTIMATE_EXTENSIONS:
+            continue
+        if entry.tokens is not None:
+            estimated_tokens += entry.tokens
+        else:
+            estimated_tokens += entry.size / ratios.get(entry.suffix, DEFAULT_BYTES_PER_TOKEN)
+    
+    return int(estimated_tokens)
+
+
+def estimate_project_context_size(project_index: ProjectIndex, mode: Optional[str] = None) -> int:
+    """
+    Schätzt die Context-Größe eines Projekts in Tokens.
+    
+    Tokens werden mit dem konfigurierten Token-Zähler gezählt (AGENTS_TOKENIZER,
+    siehe token_counter.get_token_counter). Im Modus 'stat' (Standard) werden
+    nur die Dateigrößen aus dem Index gelesen und über eine kleine Stichprobe
+    je Dateiendung in Tokens umgerechnet; 'read' liest jede Datei komplett.
+    Beide Modi nutzen den Scan-Cache: unveränderte Dateien werden nicht gelesen.
+    
+    Args:
+        project_index: Projekt-Index (siehe ProjectIndex.build)
+        mode: 'stat' oder 'read' (Standard: AGENTS_ESTIMATE_MODE oder 'stat')
         
-        return estimated_tokens
+    Returns:
+        Geschätzte Context-Größe in Tokens
+    """
+    mode = _get_estimate_mode(mode)
+    
+    try:
+        if mode == 'stat':
+            return _estimate_by_stat(project_index)
+        return _estimate_by_reading(project_index)
         
     except Exception:
         # Bei Fehler: Annahme kleines Projekt
         return 0
 
 
-def needs_large_context(work_dir: str, threshold: int = 100_000) -> bool:
+def needs_large_context(project_index: ProjectIndex, threshold: int = SMALL_PROJECT_TOKENS,
+                        mode: Optional[str] = None, estimated: Optional[int] = None) -> bool:
     """
     Prüft ob ein Projekt ein großes Context-Window benötigt.
     
     Args:
-        work_dir: Arbeitsverzeichnis
+        project_index: Projekt-Index
         threshold: Schwellwert in Tokens (Standard: 100k)
+        mode: Schätz-Modus (siehe estimate_project_context_size)
+        estimated: Bereits berechnete Schätzung (überspringt die Schätzung)
         
     Returns:
         True wenn großes Context-Window benötigt wird
     """
-    estimated = estimate_project_context_size(work_dir)
+    if estimated is None:
+        estimated = estimate_project_context_size(project_index, mode)
     return estimated > threshold
 
 
-def get_project_size_category(work_dir: str) -> str:
+def categorize_token_count(estimated: int) -> str:
     """
-    Kategorisiert die Projektgröße.
+    Ordnet eine Token-Schätzung einer Größenkategorie zu.
     
     Args:
-        work_dir: Arbeitsverzeichnis
+        estimated: Geschätzte Context-Größe in Tokens
         
     Returns:
         'small' (<100k tokens), 'medium' (100-400k), oder 'large' (>400k)
     """
-    estimated = estimate_project_context_size(work_dir)
-    
-    if estimated < 100_000:
+    if estimated < SMALL_PROJECT_TOKENS:
         return 'small'
-    elif estimated < 400_000:
+    elif estimated < LARGE_PROJECT_TOKENS:
         return 'medium'
     else:
         return 'large'
+
+
+def get_project_size_category(project_index: ProjectIndex, mode: Optional[str] = None,
+                              estimated: Optional[int] = None) -> str:
+    """
+    Kategorisiert die Projektgröße.
+    
+    Args:
+        project_index: Projekt-Index
+        mode: Schätz-Modus (siehe estimate_project_context_size)
+        estimated: Bereits berechnete Schätzung (überspringt die Schätzung)
+        
+    Returns:
+        'small' (<100k tokens), 'medium' (100-400k), oder 'large' (>400k)
+    """
+    if estimated is None:
+        estimated = estimate_project_context_size(project_index, mode)
+    return categorize_token_count(estimated)
@@ -1,6 +1,7 @@
 from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task
-from crewai_tools import FileReadTool, DirectoryReadTool
+from my_agents.tools import ReadFileTool, ListDirectoryTool, FileOutlineTool, SearchCodeTool, GrepTool, FetchResultTool
+from my_agents.tool_memo import memoize_tools
 import os
 from pathlib import Path
 import yaml
@@ -44,10 +45,14 @@ class MyAgentsCrew():
             backstory=config['backstory'],
             verbose=config.get('verbose', True),
             allow_delegation=config.get('allow_delegation', True),
-            tools=[
-                DirectoryReadTool(directory=self.work_dir),
-                FileReadTool(),
-            ],
+            tools=memoize_tools([
+                ListDirectoryTool(work_dir=self.work_dir),
+                FileOutlineTool(work_dir=self.work_dir),
+                SearchCodeTool(work_dir=self.work_dir),
+                GrepTool(work_dir=self.work_dir),
+                FetchResultTool(),
+                ReadFileTool(work_dir=self.work_dir),
+            ]),
             llm="anthropic/claude-3.5-sonnet",
         )
     
@@ -60,10 +65,14 @@ class MyAgentsCrew():
             backstory=config['backstory'],
             verbose=config.get('verbose', True),
             allow_delegation=config.get('allow_delegation', False),
-            tools=[
-                DirectoryReadTool(directory=self.work_dir),
-                FileReadTool(),
-            ],
+            tools=memoize_tools([
+                ListDirectoryTool(work_dir=self.work_dir),
+                FileOutlineTool(work_dir=self.work_dir),
+                SearchCodeTool(work_dir=self.work_dir),
+                GrepTool(work_dir=self.work_dir),
+                FetchResultTool(),
+                ReadFileTool(work_dir=self.work_dir),
+            ]),
             llm="deepseek/deepseek-coder",
         )
     
@@ -76,10 +85,14 @@ class MyAgentsCrew():
             backstory=config['backstory'],
             verbose=config.get('verbose', True),
             allow_delegation=config.get('allow_delegation', False),
-            tools=[
-                DirectoryReadTool(directory=self.work_dir),
-                FileReadTool(),
-            ],
+            tools=memoize_tools([
+                ListDirectoryTool(work_dir=self.work_dir),
+                FileOutlineTool(work_dir=self.work_dir),
+                SearchCodeTool(work_dir=self.work_dir),
+                GrepTool(work_dir=self.work_dir),
+                FetchResultTool(),
+                ReadFileTool(work_dir=self.work_dir),
+            ]),
             llm="openai/gpt-4o-mini",
         )
     
@@ -92,10 +105,14 @@ class MyAgentsCrew():
             backstory=config['backstory'],
             verbose=config.get('verbose', True),
             allow_delegation=config.get('allow_delegation', False),
-            tools=[
-                DirectoryReadTool(directory=self.work_dir),
-                FileReadTool(),
-            ],
+            tools=memoize_tools([
+                ListDirectoryTool(work_dir=self.work_dir),
+                FileOutlineTool(work_dir=self.work_dir),
+                SearchCodeTool(work_dir=self.work_dir),
+                GrepTool(work_dir=self.work_dir),
+                FetchResultTool(),
+                ReadFileTool(work_dir=self.work_dir),
+            ]),
             llm="google/gemini-flash-1.5",
         )
     
@@ -1,12 +1,14 @@
 """Intelligente Crew-Auswahl basierend auf Task-Beschreibung mit LLM-Router"""
 
 import re
-from typing import Tuple
+from typing import Optional, Tuple
 from crewai import Crew, Agent, Task
 import os
 from my_agents.llm_config import get_orchestrator_llm
+from my_agents.project_index import ProjectIndex
 
-def select_crew_with_llm(task_description: str, work_dir: str) -> Tuple[Crew, str]:
+def select_crew_with_llm(task_description: str, work_dir: str,
+                         project_index: Optional[ProjectIndex] = None) -> Tuple[Crew, str]:
     """
     Nutze ein LLM als Router-Agent zur intelligenten Team-Auswahl.
     
@@ -130,15 +132,16 @@ Antworte NUR mit dem Team-Namen (ein Wort): small, standard, fullstack, security
             from my_agents.crews.standard_crew import get_crew
             team_name = 'standard'
         
-        return get_crew(work_dir), team_name
+        return get_crew(work_dir, project_index, task_description), team_name
         
     except Exception as e:
         print(f"⚠️  Router-Agent Fehler: {e} - Nutze Standard-Team")
         from my_agents.crews.standard_crew import get_crew
-        return get_crew(work_dir), "standard"
+        return get_crew(work_dir, project_index, task_description), "standard"
 
 
-def select_crew_with_keywords(task_description: str, work_dir: str) -> Tuple[Crew, str]:
+def select_crew_with_keywords(task_description: str, work_dir: str,
+                              project_index: Optional[ProjectIndex] = None) -> Tuple[Crew, str]:
     """
     Keyword-basierte Team-Auswahl (Fallback-Methode).
     
@@ -199,35 +202,36 @@ def select_crew_with_keywords(task_description: str, work_dir: str) -> Tuple[Cre
     # Wenn kein klarer Gewinner oder alle Scores niedrig → Standard
     if max_score == 0 or list(scores.values()).count(max_score) > 1:
         from my_agents.crews.standard_crew import get_crew
-        return get_crew(work_dir), "standard"
+        return get_crew(work_dir, project_index, task_description), "standard"
     
     # Wähle Team basierend auf höchstem Score
     if security_score == max_score:
         from my_agents.crews.security_crew import get_crew
-        return get_crew(work_dir), "security"
+        return get_crew(work_dir, project_index, task_description), "security"
     
     elif refactoring_score == max_score:
         from my_agents.crews.refactoring_crew import get_crew
-        return get_crew(work_dir), "refactoring"
+        return get_crew(work_dir, project_index, task_description), "refactoring"
     
     elif performance_score == max_score:
         from my_agents.crews.performance_crew import get_crew
-        return get_crew(work_dir), "performance"
+        return get_crew(work_dir, project_index, task_description), "performance"
     
     elif fullstack_score == max_score:
         from my_agents.crews.fullstack_crew import get_crew
-        return get_crew(work_dir), "fullstack"
+        return get_crew(work_dir, project_index, task_description), "fullstack"
     
     elif small_score == max_score:
         from my_agents.crews.small_task_crew import get_crew
-        return get_crew(work_dir), "small"
+        return get_crew(work_dir, project_index, task_description), "small"
     
     # Fallback
     from my_agents.crews.standard_crew import get_crew
-    return get_crew(work_dir), "standard"
+    return get_crew(work_dir, project_index, task_description), "standard"
 
 
-def select_crew(task_description: str, work_dir: str) -> Tuple[Crew, str]:
+def select_crew(task_description: str, work_dir: str,
+                project_index: Optional[ProjectIndex] = None) -> Tuple[Crew, str]:
     """
     Intelligente Team-Auswahl (Standard: LLM-Router, Fallback: Keywords).
     
@@ -242,10 +246,10 @@ def select_crew(task_description: str, work_dir: str) -> Tuple[Crew, str]:
     
     if use_keywords:
         # Keyword-basierte Auswahl (schnell, offline)
-        return select_crew_with_keywords(task_description, work_dir)
+        return select_crew_with_keywords(task_description, work_dir, project_index)
     else:
         # LLM-basierte Auswahl (intelligent, benötigt API-Call)
-        return select_crew_with_llm(task_description, work_dir)
+        return select_crew_with_llm(task_description, work_dir, project_index)
 
 
 def get_crew_description(crew_name: str) -> str:
@@ -1,19 +1,21 @@
 """Full-Stack Crew - Für komplette Web-Anwendungen"""
 
 from crewai import Agent, Crew, Process, Task
-from crewai_tools import FileReadTool, DirectoryReadTool
 import os
 from pathlib import Path
+from typing import Optional
 import yaml
 from my_agents.llm_config import (get_orchestrator_llm, get_large_context_orchestrator_llm,
                                    get_architect_llm, get_backend_llm, get_developer_llm, 
                                    get_tester_llm, get_documenter_llm, get_devops_llm,
                                    get_summarizer_llm)
-from my_agents.tools import WriteFileTool, DeleteFileTool
+from my_agents.tools import WriteFileTool, WriteFilesTool, EditFileTool, DeleteFileTool, ListDirectoryTool, ReadFileTool, FileOutlineTool, SearchCodeTool, GrepTool, FetchResultTool
+from my_agents.tool_memo import memoize_tools
+from my_agents.project_index import ProjectIndex
 from my_agents.context_estimator import get_project_size_category
-from my_agents.project_summarizer import summarize_project_with_gemini
+from my_agents.project_summarizer import summarize_project_with_gemini, summarize_large_project
 
-def get_crew(work_dir: str):
+def get_crew(work_dir: str, project_index: Optional[ProjectIndex] = None, task: str = ''):
     """8 Agents: Full Web Development Stack"""
     
     package_dir = Path(__file__).parent.parent
@@ -25,14 +27,24 @@ def get_crew(work_dir: str):
         tasks_config = yaml.safe_load(f)
     
     tools = [
-        DirectoryReadTool(directory=work_dir),
-        FileReadTool(),
+        ListDirectoryTool(work_dir=work_dir),
+        FileOutlineTool(work_dir=work_dir),
+        SearchCodeTool(work_dir=work_dir),
+        GrepTool(work_dir=work_dir),
+        FetchResultTool(),
+        ReadFileTool(work_dir=work_dir),
         WriteFileTool(work_dir=work_dir),
+        WriteFilesTool(work_dir=work_dir),
+        EditFileTool(work_dir=work_dir),
         DeleteFileTool(work_dir=work_dir),
     ]
     
+    # Projekt-Index: Ein einziger Scan für Größenschätzung und Zusammenfassung
+    if project_index is None:
+        project_index = ProjectIndex.build(work_dir)
+    
     # Intelligente LLM-Auswahl basierend auf Projektgröße
-    project_size = get_project_size_category(work_dir)
+    project_size = get_project_size_category(project_index)
     project_summary = None
     
     if project_size == 'small':
@@ -42,15 +54,24 @@ def get_crew(work_dir: str):
         print("\ud83d\udcc4 Mittleres Projekt (100-400k tokens) - Erstelle Zusammenfassung mit Gemini...")
         try:
             summarizer_llm = get_summarizer_llm()
-            project_summary = summarize_project_with_gemini(work_dir, summarizer_llm)
+            project_summary = summarize_project_with_gemini(project_index, summarizer_llm, task=task)
             print("\u2705 Zusammenfassung erstellt - Nutze gpt-5-nano mit kompakter Übersicht")
         except Exception as e:
             print(f"\u26a0\ufe0f  Zusammenfassung fehlgeschlagen: {e} - Nutze kimi-k2.5")
             project_summary = None
         orchestrator_llm = get_orchestrator_llm()
     else:  # large
-        orchestrator_llm = get_large_context_orchestrator_llm()
-        print("\ud83d\udcca Großes Projekt (>400k tokens) - Nutze kimi-k2.5 (200k+ context)")
+        print("\ud83d\udcca Großes Projekt (>400k tokens) - Erstelle Map-Reduce-Zusammenfassung mit Gemini...")
+        try:
+            summarizer_llm = get_summarizer_llm()
+            project_summary = summarize_large_project(project_index, summarizer_llm)
+            orchestrator_llm = get_orchestrator_llm()
+            print("\u2705 Zusammenfassung erstellt - Nutze gpt-5-nano mit kompakter Übersicht")
+        except Exception as e:
+            # Fallback: kimi-k2.5 mit großem Context-Window
+            print(f"\u26a0\ufe0f  Zusammenfassung fehlgeschlagen: {e} - Nutze kimi-k2.5 (200k+ context)")
+            project_summary = None
+            orchestrator_llm = get_large_context_orchestrator_llm()
     
     # Orchestrator (mit optionaler Projekt-Zusammenfassung)
     backstory = agents_config['orchestrator']['backstory']
@@ -63,7 +84,7 @@ def get_crew(work_dir: str):
         backstory=backstory,
         verbose=True,
         allow_delegation=True,
-        tools=tools,
+        tools=memoize_tools(tools),
         llm=orchestrator_llm,
     )
     
@@ -73,7 +94,7 @@ def get_crew(work_dir: str):
         goal=agents_config['architect']['goal'],
         backstory=agents_config['architect']['backstory'],
         verbose=True,
-        tools=tools,
+        tools=memoize_tools(tools),
         llm=get_architect_llm(),
     )
     
@@ -83,7 +104,7 @@ def get_crew(work_dir: str):
         goal=agents_config['backend_developer']['goal'],
         backstory=agents_config['backend_developer']['backstory'],
         verbose=True,
-        tools=tools,
+        tools=memoize_tools(tools),
         llm=get_backend_llm(),
     )
     
@@ -93,7 +114,7 @@ def get_crew(work_dir: str):
         goal=agents_config['frontend_developer']['goal'],
         backstory=agents_config['frontend_developer']['backstory'],
         verbose=True,
-        tools=tools,
+        tools=memoize_tools(tools),
         llm=get_developer_llm(),
     )
     
@@ -103,7 +124,7 @@ def get_crew(work_dir: str):
         goal=agents_config['database_expert']['goal'],
         backstory=agents_config['database_expert']['backstory'],
         verbose=True,
-        tools=tools,
+        tools=memoize_tools(tools),
         llm=get_architect_llm(),
     )
     
@@ -113,7 +134,7 @@ def get_crew(work_dir: str):
         goal=agents_config['tester']['goal'],
         backstory=agents_config['tester']['backstory'],
         verbose=True,
-        tools=tools,
+        tools=memoize_tools(tools),
         llm=get_tester_llm(),
     )
     
@@ -123,7 +144,7 @@ def get_crew(work_dir: str):
         goal=agents_config['devops_engineer']['goal'],
         backstory=agents_config['devops_engineer']['backstory'],
         verbose=True,
-        tools=tools,
+        tools=memoize_tools(tools),
         llm=get_devops_llm(),
     )
     
@@ -133,7 +154,7 @@ def get_crew(work_dir: str):
         goal=agents_config['documenter']['goal'],
         backstory=agents_config['documenter']['backstory'],
         verbose=True,
-        tools=tools,
+        tools=memoize_tools(tools),
         llm=get_documenter_llm(),
     )
     
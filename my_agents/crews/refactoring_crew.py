@@ -1,18 +1,20 @@
 """Refactoring Crew - Für Code-Qualität & Legacy Code"""
 
 from crewai import Agent, Crew, Process, Task
-from crewai_tools import FileReadTool, DirectoryReadTool
 import os
 from pathlib import Path
+from typing import Optional
 import yaml
 from my_agents.llm_config import (get_reviewer_llm, get_refactoring_llm, 
                                    get_tester_llm, get_documenter_llm,
                                    get_summarizer_llm)
-from my_agents.tools import WriteFileTool, DeleteFileTool
+from my_agents.tools import WriteFileTool, WriteFilesTool, EditFileTool, DeleteFileTool, ListDirectoryTool, ReadFileTool, FileOutlineTool, SearchCodeTool, GrepTool, FetchResultTool
+from my_agents.tool_memo import memoize_tools
+from my_agents.project_index import ProjectIndex
 from my_agents.context_estimator import get_project_size_category
-from my_agents.project_summarizer import summarize_project_with_gemini
+from my_agents.project_summarizer import summarize_project_with_gemini, summarize_large_project
 
-def get_crew(work_dir: str):
+def get_crew(work_dir: str, project_index: Optional[ProjectIndex] = None, task: str = ''):
     """4 Agents: Code Quality Improvement"""
     
     package_dir = Path(__file__).parent.parent
@@ -24,14 +26,24 @@ def get_crew(work_dir: str):
         tasks_config = yaml.safe_load(f)
     
     tools = [
-        DirectoryReadTool(directory=work_dir),
-        FileReadTool(),
+        ListDirectoryTool(work_dir=work_dir),
+        FileOutlineTool(work_dir=work_dir),
+        SearchCodeTool(work_dir=work_dir),
+        GrepTool(work_dir=work_dir),
+        FetchResultTool(),
+        ReadFileTool(work_dir=work_dir),
         WriteFileTool(work_dir=work_dir),
+        WriteFilesTool(work_dir=work_dir),
+        EditFileTool(work_dir=work_dir),
         DeleteFileTool(work_dir=work_dir),
     ]
     
+    # Projekt-Index: Ein einziger Scan für Größenschätzung und Zusammenfassung
+    if project_index is None:
+        project_index = ProjectIndex.build(work_dir)
+    
     # Erstelle Zusammenfassung für mittlere Projekte
-    project_size = get_project_size_category(work_dir)
+    project_size = get_project_size_category(project_index)
     project_summary = None
     
     if project_size == 'small':
@@ -40,13 +52,20 @@ def get_crew(work_dir: str):
         print("📄 Mittleres Projekt (100-400k tokens) - Erstelle Zusammenfassung mit Gemini...")
         try:
             summarizer_llm = get_summarizer_llm()
-            project_summary = summarize_project_with_gemini(work_dir, summarizer_llm)
+            project_summary = summarize_project_with_gemini(project_index, summarizer_llm, task=task)
             print("✅ Zusammenfassung erstellt - Agents erhalten kompakte Übersicht")
         except Exception as e:
             print(f"⚠️ Zusammenfassung fehlgeschlagen: {e}")
             project_summary = None
     else:  # large
-        print("📊 Großes Projekt (>400k tokens) erkannt")
+        print("📊 Großes Projekt (>400k tokens) - Erstelle Map-Reduce-Zusammenfassung mit Gemini...")
+        try:
+            summarizer_llm = get_summarizer_llm()
+            project_summary = summarize_large_project(project_index, summarizer_llm)
+            print("✅ Zusammenfassung erstellt - Agents erhalten kompakte Übersicht")
+        except Exception as e:
+            print(f"⚠️ Zusammenfassung fehlgeschlagen: {e}")
+            project_summary = None
     
     # Code Reviewer (mit optionaler Projekt-Zusammenfassung)
     reviewer_backstory = agents_config['code_reviewer']['backstory']
@@ -58,7 +77,7 @@ def get_crew(work_dir: str):
         goal=agents_config['code_reviewer']['goal'],
         backstory=reviewer_backstory,
         verbose=True,
-        tools=tools,
+        tools=memoize_tools(tools),
         llm=get_reviewer_llm(),
     )
     
@@ -68,7 +87,7 @@ def get_crew(work_dir: str):
         goal=agents_config['refactoring_expert']['goal'],
         backstory=agents_config['refactoring_expert']['backstory'],
         verbose=True,
-        tools=tools,
+        tools=memoize_tools(tools),
         llm=get_refactoring_llm(),
     )
     
@@ -78,7 +97,7 @@ def get_crew(work_dir: str):
         goal="Erstelle Regression Tests um sicherzustellen dass Refactoring nichts kaputt macht",
         backstory=agents_config['tester']['backstory'],
         verbose=True,
-        tools=tools,
+        tools=memoize_tools(tools),
         llm=get_tester_llm(),
     )
     
@@ -88,7 +107,7 @@ def get_crew(work_dir: str):
         goal=agents_config['documenter']['goal'],
         backstory=agents_config['documenter']['backstory'],
         verbose=True,
-        tools=tools,
+        tools=memoize_tools(tools),
         llm=get_documenter_llm(),
     )
     
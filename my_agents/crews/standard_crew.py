@@ -1,18 +1,20 @@
 """Standard Crew - Balanced für normale Projekte"""
 
 from crewai import Agent, Crew, Process, Task
-from crewai_tools import FileReadTool, DirectoryReadTool
 import os
 from pathlib import Path
+from typing import Optional
 import yaml
 from my_agents.llm_config import (get_orchestrator_llm, get_developer_llm, get_tester_llm, 
                                    get_documenter_llm, get_summarizer_llm, 
                                    get_large_context_orchestrator_llm)
-from my_agents.tools import WriteFileTool, DeleteFileTool
+from my_agents.tools import WriteFileTool, WriteFilesTool, EditFileTool, DeleteFileTool, ListDirectoryTool, ReadFileTool, FileOutlineTool, SearchCodeTool, GrepTool, FetchResultTool, RunTestsTool
+from my_agents.tool_memo import memoize_tools
+from my_agents.project_index import ProjectIndex
 from my_agents.context_estimator import get_project_size_category
-from my_agents.project_summarizer import summarize_project_with_gemini
+from my_agents.project_summarizer import summarize_project_with_gemini, summarize_large_project
 
-def get_crew(work_dir: str):
+def get_crew(work_dir: str, project_index: Optional[ProjectIndex] = None, task: str = ''):
     """4 Agents: Orchestrator + Developer + Tester + Documenter"""
     
     package_dir = Path(__file__).parent.parent
@@ -24,14 +26,24 @@ def get_crew(work_dir: str):
         tasks_config = yaml.safe_load(f)
     
     tools = [
-        DirectoryReadTool(directory=work_dir),
-        FileReadTool(),
+        ListDirectoryTool(work_dir=work_dir),
+        FileOutlineTool(work_dir=work_dir),
+        SearchCodeTool(work_dir=work_dir),
+        GrepTool(work_dir=work_dir),
+        FetchResultTool(),
+        ReadFileTool(work_dir=work_dir),
         WriteFileTool(work_dir=work_dir),
+        WriteFilesTool(work_dir=work_dir),
+        EditFileTool(work_dir=work_dir),
         DeleteFileTool(work_dir=work_dir),
     ]
     
+    # Projekt-Index: Ein einziger Scan für Größenschätzung und Zusammenfassung
+    if project_index is None:
+        project_index = ProjectIndex.build(work_dir)
+    
     # Intelligente LLM-Auswahl basierend auf Projektgröße
-    project_size = get_project_size_category(work_dir)
+    project_size = get_project_size_category(project_index)
     project_summary = None
     
     if project_size == 'small':
@@ -44,7 +56,7 @@ def get_crew(work_dir: str):
         print("\ud83d\udcc4 Mittleres Projekt (100-400k tokens) - Erstelle Zusammenfassung mit Gemini...")
         try:
             summarizer_llm = get_summarizer_llm()
-            project_summary = summarize_project_with_gemini(work_dir, summarizer_llm)
+            project_summary = summarize_project_with_gemini(project_index, summarizer_llm, task=task)
             print("\u2705 Zusammenfassung erstellt - Nutze gpt-5-nano mit kompakter Übersicht")
         except Exception as e:
             print(f"\u26a0\ufe0f  Zusammenfassung fehlgeschlagen: {e} - Nutze kimi-k2.5")
@@ -52,9 +64,18 @@ def get_crew(work_dir: str):
         orchestrator_llm = get_orchestrator_llm()
     
     else:  # large
-        # Groß (>400k): Nutze kimi-k2.5 direkt (großes Context-Window)
-        orchestrator_llm = get_large_context_orchestrator_llm()
-        print("\ud83d\udcca Großes Projekt (>400k tokens) - Nutze kimi-k2.5 (200k+ context)")
+        # Groß (>400k): Map-Reduce-Zusammenfassung mit Gemini, dann gpt-5-nano
+        print("\ud83d\udcca Großes Projekt (>400k tokens) - Erstelle Map-Reduce-Zusammenfassung mit Gemini...")
+        try:
+            summarizer_llm = get_summarizer_llm()
+            project_summary = summarize_large_project(project_index, summarizer_llm)
+            orchestrator_llm = get_orchestrator_llm()
+            print("\u2705 Zusammenfassung erstellt - Nutze gpt-5-nano mit kompakter Übersicht")
+        except Exception as e:
+            # Fallback: kimi-k2.5 mit großem Context-Window
+            print(f"\u26a0\ufe0f  Zusammenfassung fehlgeschlagen: {e} - Nutze kimi-k2.5 (200k+ context)")
+            project_summary = None
+            orchestrator_llm = get_large_context_orchestrator_llm()
     
     # Orchestrator (mit optionaler Projekt-Zusammenfassung)
     orch_config = agents_config['orchestrator']
@@ -70,7 +91,7 @@ def get_crew(work_dir: str):
         backstory=backstory,
         verbose=True,
         allow_delegation=True,
-        tools=tools,
+        tools=memoize_tools(tools),
         llm=orchestrator_llm,
     )
     
@@ -81,7 +102,7 @@ def get_crew(work_dir: str):
         goal=dev_config['goal'],
         backstory=dev_config['backstory'],
         verbose=True,
-        tools=tools,
+        tools=memoize_tools(tools),
         llm=get_developer_llm(),
     )
     
@@ -92,7 +113,7 @@ def get_crew(work_dir: str):
         goal=test_config['goal'],
         backstory=test_config['backstory'],
         verbose=True,
-        tools=tools,
+        tools=memoize_tools(tools + [RunTestsTool(work_dir=work_dir)]),
         llm=get_tester_llm(),
     )
     
@@ -103,7 +124,7 @@ def get_crew(work_dir: str):
         goal=doc_config['goal'],
         backstory=doc_config['backstory'],
         verbose=True,
-        tools=tools,
+        tools=memoize_tools(tools),
         llm=get_documenter_llm(),
     )
     
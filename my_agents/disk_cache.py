@@ -0,0 +1,165 @@
+"""Kleiner Key-Value-Cache auf SQLite-Basis mit LRU-Verdrängung und TTL"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+
+# Bei Format-Änderungen erhöhen - alte Caches werden dann verworfen
+DISK_CACHE_VERSION = 1
+
+
+def make_key(*parts: str) -> str:
+    """Content-adressierter Schlüssel aus beliebig vielen Bestandteilen"""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode('utf-8', errors='ignore'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+class LRUDiskCache:
+    """
+    Persistenter String-Cache mit Größenbegrenzung.
+
+    Einträge werden nach Anzahl (max_entries) und/oder Gesamtgröße
+    (max_bytes) begrenzt; bei Überschreitung werden die am längsten
+    nicht genutzten Einträge entfernt. Optional verfallen Einträge nach
+    ttl Sekunden. Fehler beim Zugriff (z.B. schreibgeschütztes
+    Verzeichnis) werden ignoriert - der Cache verhält sich dann leer.
+    Thread-sicher.
+    """
+
+    def __init__(self, path: Path, max_entries: Optional[int] = None,
+                 max_bytes: Optional[int] = None, ttl: Optional[float] = None):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._failed = False
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if self._conn is not None or self._failed:
+            return self._conn
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=10, check_same_thread=False)
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            row = conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+            if row is None or row[0] != str(DISK_CACHE_VERSION):
+                conn.execute("DROP TABLE IF EXISTS entries")
+                conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)",
+                    (str(DISK_CACHE_VERSION),)
+                )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " key TEXT PRIMARY KEY, value TEXT, size INTEGER,"
+                " created REAL, last_used REAL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used)")
+            conn.commit()
+            self._conn = conn
+        except (OSError, sqlite3.Error):
+            self._failed = True
+        return self._conn
+
+    def get(self, key: str) -> Optional[str]:
+        """Liefert den Wert zu key (oder None) und markiert ihn als genutzt"""
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                self.misses += 1
+                return None
+            try:
+                row = conn.execute("SELECT value, created FROM entries WHERE key = ?", (key,)).fetchone()
+                now = time.time()
+                if row is not None and self.ttl is not None and now - row[1] > self.ttl:
+                    conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                    row = None
+                if row is None:
+                    conn.commit()
+                    self.misses += 1
+                    return None
+                conn.execute("UPDATE entries SET last_used = ? WHERE key = ?", (now, key))
+                conn.commit()
+                self.hits += 1
+                return row[0]
+            except sqlite3.Error:
+                self.misses += 1
+                return None
+
+    def set(self, key: str, value: str) -> None:
+        """Speichert einen Wert und verdrängt bei Bedarf alte Einträge"""
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return
+            now = time.time()
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries (key, value, size, created, last_used) VALUES (?, ?, ?, ?, ?)",
+                    (key, value, len(value.encode('utf-8', errors='ignore')), now, now)
+                )
+                self._evict(conn)
+                conn.commit()
+            except sqlite3.Error:
+                pass
+
+    def delete(self, key: str) -> None:
+        """Entfernt einen Eintrag"""
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return
+            try:
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                conn.commit()
+            except sqlite3.Error:
+                pass
+
+    def clear(self) -> None:
+        """Leert den Cache"""
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return
+            try:
+                conn.execute("DELETE FROM entries")
+                conn.commit()
+            except sqlite3.Error:
+                pass
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Entfernt abgelaufene und die am längsten nicht genutzten Einträge"""
+        if self.ttl is not None:
+            conn.execute("DELETE FROM entries WHERE created < ?", (time.time() - self.ttl,))
+        if self.max_entries is not None:
+            conn.execute(
+                "DELETE FROM entries WHERE key IN ("
+                " SELECT key FROM entries ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+        if self.max_bytes is not None:
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            if total > self.max_bytes:
+                for key, size in conn.execute(
+                        "SELECT key, size FROM entries ORDER BY last_used ASC").fetchall():
+                    if total <= self.max_bytes:
+                        break
+                    conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                    total -= size
+
+    def close(self) -> None:
+        """Schließt die Datenbank"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
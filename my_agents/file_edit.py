@@ -0,0 +1,232 @@
+"""Gezielte Datei-Änderungen: Search/Replace-Blöcke und Unified Diffs"""
+
+import re
+from typing import List, Tuple
+
+
+SEARCH_MARKER = '<<<<<<< SEARCH'
+DIVIDER_MARKER = '======='
+REPLACE_MARKER = '>>>>>>> REPLACE'
+
+# So weit darf ein Diff-Hunk von seiner angegebenen Position entfernt passen (Zeilen)
+HUNK_MAX_OFFSET = 200
+
+_HUNK_HEADER = re.compile(r'^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@')
+
+
+class EditConflict(ValueError):
+    """Eine Änderung passt nicht auf den aktuellen Dateiinhalt"""
+
+
+def _preview(text: str, max_chars: int = 80) -> str:
+    text = text.strip().splitlines()[0] if text.strip() else ''
+    return text if len(text) <= max_chars else text[:max_chars - 1] + '…'
+
+
+def _line_of(text: str, position: int) -> int:
+    return text.count('\n', 0, position) + 1
+
+
+def parse_search_replace(edits: str) -> List[Tuple[str, str]]:
+    """
+    Zerlegt Search/Replace-Blöcke:
+
+        <<<<<<< SEARCH
+        alter Text
+        =======
+        neuer Text
+        >>>>>>> REPLACE
+
+    Raises:
+        EditConflict: Block unvollständig
+    """
+    blocks = []
+    lines = edits.splitlines(keepends=True)
+    i = 0
+    while i < len(lines):
+        if lines[i].strip() != SEARCH_MARKER:
+            i += 1
+            continue
+        start = i
+        search, replace = [], []
+        i += 1
+        while i < len(lines) and lines[i].rstrip('\r\n') != DIVIDER_MARKER:
+            search.append(lines[i])
+            i += 1
+        i += 1
+        while i < len(lines) and lines[i].strip() != REPLACE_MARKER:
+            replace.append(lines[i])
+            i += 1
+        if i >= len(lines):
+            raise EditConflict(f"Block {len(blocks) + 1} (ab Zeile {start + 1} der Änderung) ist unvollständig - "
+                               f"erwartet: {SEARCH_MARKER} / {DIVIDER_MARKER} / {REPLACE_MARKER}")
+        blocks.append((''.join(search), ''.join(replace)))
+        i += 1
+    return blocks
+
+
+def _closest_line(text: str, search: str) -> str:
+    """Hinweis auf die ähnlichste Stelle, wenn der Suchtext nicht gefunden wurde"""
+    first = next((line.strip() for line in search.splitlines() if line.strip()), '')
+    if not first:
+        return ''
+    for lineno, line in enumerate(text.splitlines(), 1):
+        if line.strip() == first:
+            return f" Die erste Zeile steht in Zeile {lineno}, die folgenden Zeilen weichen ab."
+    return " Auch die erste Zeile des Suchtexts kommt nicht vor."
+
+
+def apply_search_replace(text: str, blocks: List[Tuple[str, str]]) -> str:
+    """
+    Wendet Search/Replace-Blöcke der Reihe nach an.
+
+    Jeder Suchtext muss genau einmal vorkommen. Weichen nur Leerzeichen am
+    Zeilenende ab, wird die Stelle trotzdem gefunden.
+
+    Raises:
+        EditConflict: Suchtext fehlt, ist leer oder mehrdeutig
+    """
+    for number, (search, replace) in enumerate(blocks, 1):
+        if not search.strip():
+            raise EditConflict(f"Block {number}: Suchtext ist leer - zum Anlegen/Ersetzen ganzer Dateien \"Write File\" nutzen")
+        count = text.count(search)
+        if count == 0:
+            # Toleranz für Leerzeichen am Zeilenende
+            pattern = r'[ \t]*\n'.join(re.escape(line.rstrip(' \t')) for line in search.split('\n'))
+            matches = list(re.finditer(pattern, text))
+            if len(matches) == 1:
+                match = matches[0]
+                text = text[:match.start()] + replace + text[match.end():]
+                continue
+            if not matches:
+                raise EditConflict(f"Block {number}: Suchtext nicht gefunden ('{_preview(search)}')."
+                                   + _closest_line(text, search))
+            count = len(matches)
+            positions = [match.start() for match in matches]
+        else:
+            positions = [m.start() for m in re.finditer(re.escape(search), text)]
+        if count > 1:
+            lines = ', '.join(str(_line_of(text, position)) for position in positions[:10])
+            raise EditConflict(f"Block {number}: Suchtext kommt {count}x vor (Zeilen {lines}) - "
+                               f"mehr Kontext angeben, damit er eindeutig ist")
+        text = text.replace(search, replace, 1)
+    return text
+
+
+def parse_unified_diff(diff: str) -> List[Tuple[int, List[str], List[str]]]:
+    """
+    Zerlegt einen Unified Diff (eine Datei) in Hunks.
+
+    Returns:
+        Liste von (Startzeile alt, alte Zeilen, neue Zeilen)
+
+    Raises:
+        EditConflict: Kein Hunk oder fehlerhafte Hunk-Zeile
+    """
+    hunks = []
+    current = None
+    for line in diff.splitlines():
+        header = _HUNK_HEADER.match(line)
+        if header:
+            current = (int(header.group(1)), [], [])
+            hunks.append(current)
+            continue
+        if current is None:
+            # Kopfzeilen (---/+++) vor dem ersten Hunk
+            continue
+        if line.startswith('\\'):
+            # "\ No newline at end of file"
+            continue
+        marker, content = (line[:1], line[1:]) if line else (' ', '')
+        if marker == ' ':
+            current[1].append(content)
+            current[2].append(content)
+        elif marker == '-':
+            current[1].append(content)
+        elif marker == '+':
+            current[2].append(content)
+        else:
+            raise EditConflict(f"Hunk {len(hunks)}: Zeile ohne ' ', '-' oder '+' am Anfang: '{_preview(line)}'")
+    if not hunks:
+        raise EditConflict("Kein Hunk gefunden - erwartet werden Zeilen wie '@@ -10,3 +10,4 @@'")
+    return hunks
+
+
+def _first_mismatch(lines: List[str], old: List[str], start: int) -> Tuple[int, str, str]:
+    for i, expected in enumerate(old):
+        found = lines[start + i] if start + i < len(lines) else '<Dateiende>'
+        if found.rstrip() != expected.rstrip():
+            return start + i + 1, expected, found
+    return 0, '', ''
+
+
+def apply_unified_diff(text: str, diff: str) -> str:
+    """
+    Wendet einen Unified Diff an.
+
+    Kontext- und zu entfernende Zeilen werden geprüft (Leerzeichen am
+    Zeilenende werden ignoriert). Passt ein Hunk nicht an der angegebenen
+    Zeile, wird wie bei `patch` in der Nähe gesucht.
+
+    Raises:
+        EditConflict: Ein Hunk passt nicht - mit erwarteter und gefundener Zeile
+    """
+    lines = text.split('\n')
+    offset = 0
+    for number, (old_start, old, new) in enumerate(parse_unified_diff(diff), 1):
+        # Reine Einfügungen (@@ -5,0 ...) stehen hinter der angegebenen Zeile
+        base = old_start - 1 if old else old_start
+        expected = max(0, base + offset)
+        stripped = [line.rstrip() for line in old]
+
+        def matches_at(position: int) -> bool:
+            return (position + len(old) <= len(lines)
+                    and all(lines[position + i].rstrip() == stripped[i] for i in range(len(old))))
+
+        position = None
+        for distance in range(HUNK_MAX_OFFSET + 1):
+            for candidate in ((expected,) if distance == 0 else (expected - distance, expected + distance)):
+                if 0 <= candidate <= len(lines) and matches_at(candidate):
+                    position = candidate
+                    break
+            if position is not None:
+                break
+        if position is None:
+            line_number, wanted, found = _first_mismatch(lines, old, min(expected, len(lines)))
+            raise EditConflict(f"Hunk {number} (@@ -{old_start}): passt nicht. "
+                               f"Zeile {line_number} erwartet '{_preview(wanted)}', gefunden '{_preview(found)}'")
+        lines[position:position + len(old)] = new
+        offset = position - base + len(new) - len(old)
+    return '\n'.join(lines)
+
+
+def apply_edits(text: str, edits: str) -> Tuple[str, int]:
+    """
+    Wendet Search/Replace-Blöcke oder einen Unified Diff an (automatisch erkannt).
+
+    Zeilenenden der Datei (\\n oder \\r\\n) bleiben erhalten.
+
+    Returns:
+        (neuer Inhalt, Anzahl angewendeter Blöcke/Hunks)
+
+    Raises:
+        EditConflict: Format unbekannt oder eine Änderung passt nicht
+    """
+    crlf = '\r\n' in text
+    if crlf:
+        text = text.replace('\r\n', '\n')
+    edits = edits.replace('\r\n', '\n')
+
+    if SEARCH_MARKER in edits:
+        blocks = parse_search_replace(edits)
+        result, count = apply_search_replace(text, blocks), len(blocks)
+    elif any(_HUNK_HEADER.match(line) for line in edits.splitlines()):
+        result = apply_unified_diff(text, edits)
+        count = sum(1 for line in edits.splitlines() if _HUNK_HEADER.match(line))
+    else:
+        raise EditConflict(f"Unbekanntes Format - erwartet werden Search/Replace-Blöcke "
+                           f"({SEARCH_MARKER} / {DIVIDER_MARKER} / {REPLACE_MARKER}) oder ein Unified Diff (@@ ... @@)")
+
+    if crlf:
+        result = result.replace('\n', '\r\n')
+    return result, count
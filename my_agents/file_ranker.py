@@ -0,0 +1,297 @@
+"""Bewertet Projekt-Dateien nach Relevanz (Entry-Points, Import-Graph, Aufgabe)"""
+
+import json
+import math
+import os
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set
+
+from my_agents.project_index import FileEntry, ProjectIndex
+
+
+# Gewichte der einzelnen Signale
+ENTRY_POINT_WEIGHT = 10.0    # console_scripts, package.json main/bin
+MAIN_GUARD_WEIGHT = 4.0      # if __name__ == "__main__"
+ENTRY_NAME_WEIGHT = 3.0      # main.*, app.*, __main__.py, ...
+IMPORT_WEIGHT = 2.0          # pro log(1 + Import-In-Degree)
+TASK_PATH_WEIGHT = 4.0       # Begriff aus der Aufgabe im Pfad
+TASK_CONTENT_WEIGHT = 0.5    # pro Vorkommen im Dateianfang (max. 5)
+DEPTH_PENALTY = 0.1          # pro Ordner-Ebene
+
+# Dateinamen (ohne Endung) die typischerweise Einstiegspunkte sind
+ENTRY_POINT_NAMES = {'__main__', 'main', 'app', 'cli', 'index', 'server', 'manage', 'wsgi', 'asgi', 'run'}
+
+# Grenzen für das Lesen der Dateianfänge
+RANK_MAX_FILES = 5000
+RANK_HEAD_BYTES = 64 * 1024
+
+# Füllwörter die in Aufgaben keine Datei auszeichnen
+TASK_STOPWORDS = {
+    'the', 'and', 'for', 'with', 'from', 'that', 'this', 'into', 'add', 'fix', 'use', 'all',
+    'und', 'der', 'die', 'das', 'den', 'dem', 'mit', 'für', 'ein', 'eine', 'einen', 'bitte',
+    'auf', 'aus', 'bei', 'von', 'zum', 'zur', 'ist', 'sind', 'soll', 'alle', 'neue', 'neuen',
+    'code', 'file', 'files', 'datei', 'dateien', 'projekt', 'project',
+    'implement', 'implementiere', 'erstelle', 'füge', 'hinzu', 'create', 'make', 'update',
+}
+
+JS_SUFFIXES = ('.js', '.jsx', '.ts', '.tsx')
+
+_PY_IMPORT = re.compile(r'^[ \t]*(?:from[ \t]+(\.*[\w.]*)[ \t]+import[ \t]+([\w., \t()*]+)|import[ \t]+([\w., \t]+))', re.M)
+_JS_IMPORT = re.compile(r'''(?:\bfrom\s*|\brequire\s*\(\s*|\bimport\s*\(?\s*)['"](\.{1,2}/[^'"]+)['"]''')
+_MAIN_GUARD = re.compile(r'''__name__\s*==\s*['"]__main__['"]''')
+_SCRIPT_TARGET = re.compile(r'''=\s*["']?([A-Za-z_][\w.]*)\s*:\s*[A-Za-z_][\w.]*''')
+_WORD = re.compile(r'[A-Za-zÄÖÜäöüß][A-Za-z0-9ÄÖÜäöüß]+')
+_CAMEL = re.compile(r'[A-Z]?[a-zäöüß0-9]+|[A-Z]+(?![a-z])')
+
+
+def task_terms(task: str) -> Set[str]:
+    """Extrahiert aussagekräftige Begriffe (klein geschrieben) aus dem Aufgabentext"""
+    terms = set()
+    for word in _WORD.findall(task or ''):
+        for part in {word} | set(_CAMEL.findall(word)):
+            part = part.lower()
+            if len(part) >= 3 and part not in TASK_STOPWORDS:
+                terms.add(part)
+    return terms
+
+
+def _path_tokens(path: str) -> Set[str]:
+    """Zerlegt einen Pfad in klein geschriebene Namensbestandteile"""
+    tokens = set()
+    for word in _WORD.findall(path):
+        tokens.add(word.lower())
+        tokens.update(part.lower() for part in _CAMEL.findall(word))
+    return tokens
+
+
+def _term_matches(term: str, tokens: Iterable[str]) -> bool:
+    """Exakter Treffer oder gemeinsamer Wortstamm (z.B. 'summarize' ~ 'summarizer')"""
+    for token in tokens:
+        if term == token:
+            return True
+        if len(term) >= 4 and len(token) >= 4 and (token.startswith(term) or term.startswith(token)):
+            return True
+    return False
+
+
+def _module_names(rel_path: str) -> List[str]:
+    """Modul-Namen unter denen eine Python-Datei importiert werden kann"""
+    parts = os.path.splitext(rel_path)[0].split(os.sep)
+    if parts[-1] == '__init__':
+        parts = parts[:-1]
+    # Alle Suffixe, damit auch src/- und lib/-Layouts aufgelöst werden
+    return ['.'.join(parts[i:]) for i in range(len(parts)) if parts[i:]]
+
+
+def _read_head(path: str) -> str:
+    try:
+        with open(path, 'rb') as f:
+            return f.read(RANK_HEAD_BYTES).decode('utf-8', errors='ignore')
+    except OSError:
+        return ''
+
+
+def _declared_entry_points(project_index: ProjectIndex, modules: Dict[str, str]) -> Set[str]:
+    """Entry-Points aus setup.py/setup.cfg/pyproject.toml (console_scripts) und package.json"""
+    entry_points = set()
+
+    for name in ('setup.py', 'setup.cfg', 'pyproject.toml'):
+        text = _read_head(os.path.join(project_index.work_dir, name))
+        for module in _SCRIPT_TARGET.findall(text):
+            if module in modules:
+                entry_points.add(modules[module])
+
+    try:
+        with open(os.path.join(project_index.work_dir, 'package.json'), encoding='utf-8') as f:
+            package = json.load(f)
+    except (OSError, ValueError):
+        package = {}
+    if isinstance(package, dict):
+        targets = [package.get('main'), package.get('module')]
+        bin_field = package.get('bin')
+        targets.extend(bin_field.values() if isinstance(bin_field, dict) else [bin_field])
+        for target in targets:
+            if isinstance(target, str):
+                entry = project_index.get(os.path.normpath(target))
+                if entry is not None:
+                    entry_points.add(entry.path)
+
+    return entry_points
+
+
+def _resolve_python_import(module: str, names: str, rel_path: str, modules: Dict[str, str]) -> List[str]:
+    """Löst ein Python-Import-Statement in Projekt-Dateien auf"""
+    if module.startswith('.'):
+        # Relativer Import: Punkte steigen vom Paket der Datei aus auf
+        level = len(module) - len(module.lstrip('.'))
+        package = os.path.dirname(rel_path).split(os.sep) if os.path.dirname(rel_path) else []
+        package = package[:len(package) - (level - 1)] if level > 1 else package
+        module = '.'.join(package + ([module.lstrip('.')] if module.lstrip('.') else []))
+
+    targets = []
+    if module in modules:
+        targets.append(modules[module])
+    # 'from paket import modul' importiert ggf. Untermodule
+    for name in re.split(r'[\s,()]+', names or ''):
+        name = name.split(' as ')[0].strip()
+        if name and name != '*':
+            submodule = f"{module}.{name}" if module else name
+            if submodule in modules:
+                targets.append(modules[submodule])
+    return targets
+
+
+def _resolve_js_import(spec: str, rel_path: str, project_index: ProjectIndex) -> Optional[str]:
+    """Löst einen relativen JS/TS-Import ('./foo', '../bar') in eine Projekt-Datei auf"""
+    base = os.path.normpath(os.path.join(os.path.dirname(rel_path), spec))
+    for candidate in [base] + [base + suffix for suffix in JS_SUFFIXES] + \
+            [os.path.join(base, 'index' + suffix) for suffix in JS_SUFFIXES]:
+        if project_index.get(candidate) is not None:
+            return candidate
+    return None
+
+
+def score_files(project_index: ProjectIndex, task: str = '',
+                categories: Iterable[str] = ('code_files',)) -> Dict[str, float]:
+    """
+    Bewertet Dateien nach ihrer Relevanz für eine Projekt-Übersicht.
+
+    Signale: deklarierte Entry-Points (console_scripts, package.json),
+    `__main__`-Guards, typische Einstiegs-Dateinamen, Import-In-Degree
+    (Python und relative JS/TS-Imports) sowie Begriffe aus der Aufgabe in
+    Pfad und Dateianfang. Tiefe Pfade werden leicht abgewertet.
+
+    Args:
+        project_index: Projekt-Index
+        task: Optional, Aufgabentext des Benutzers
+        categories: Zu bewertende Kategorien
+
+    Returns:
+        Dictionary Pfad → Score (höher = relevanter)
+    """
+    categories = set(categories)
+    candidates = [entry for entry in project_index if entry.category in categories]
+
+    modules: Dict[str, str] = {}
+    for entry in sorted(project_index, key=lambda e: (e.path.count(os.sep), e.path)):
+        if entry.suffix == '.py':
+            for module in _module_names(entry.path):
+                modules.setdefault(module, entry.path)
+
+    entry_points = _declared_entry_points(project_index, modules)
+    terms = task_terms(task)
+
+    in_degree: Counter = Counter()
+    heads: Dict[str, str] = {}
+    for entry in sorted(candidates, key=lambda e: e.path)[:RANK_MAX_FILES]:
+        if entry.suffix != '.py' and entry.suffix not in JS_SUFFIXES:
+            continue
+        head = _read_head(project_index.abs_path(entry))
+        heads[entry.path] = head
+        if entry.suffix == '.py':
+            targets = set()
+            for module, names, plain in _PY_IMPORT.findall(head):
+                if plain:
+                    for name in plain.split(','):
+                        name = name.split(' as ')[0].strip()
+                        if name in modules:
+                            targets.add(modules[name])
+                else:
+                    targets.update(_resolve_python_import(module, names, entry.path, modules))
+        else:
+            targets = {
+                target for target in (_resolve_js_import(spec, entry.path, project_index)
+                                      for spec in _JS_IMPORT.findall(head))
+                if target is not None
+            }
+        targets.discard(entry.path)
+        in_degree.update(targets)
+
+    scores = {}
+    for entry in candidates:
+        head = heads.get(entry.path, '')
+        stem = os.path.splitext(os.path.basename(entry.path))[0].lower()
+        score = 0.0
+        if entry.path in entry_points:
+            score += ENTRY_POINT_WEIGHT
+        if _MAIN_GUARD.search(head):
+            score += MAIN_GUARD_WEIGHT
+        if stem in ENTRY_POINT_NAMES:
+            score += ENTRY_NAME_WEIGHT
+        score += IMPORT_WEIGHT * math.log1p(in_degree[entry.path])
+        score += _task_bonus(terms, entry.path, head)
+        score -= DEPTH_PENALTY * entry.path.count(os.sep)
+        scores[entry.path] = score
+    return scores
+
+
+def _task_bonus(terms: List[str], path: str, head: str) -> float:
+    """Anteil der Aufgaben-Begriffe am Score (Pfad und Dateianfang)"""
+    if not terms:
+        return 0.0
+    tokens = _path_tokens(path)
+    lowered = head.lower()
+    bonus = 0.0
+    for term in terms:
+        if _term_matches(term, tokens):
+            bonus += TASK_PATH_WEIGHT
+        bonus += TASK_CONTENT_WEIGHT * min(lowered.count(term), 5)
+    return bonus
+
+
+def task_score_delta(project_index: ProjectIndex, task: str,
+                     categories: Iterable[str] = ('code_files',)) -> Dict[str, float]:
+    """
+    Liefert nur den Aufgaben-Anteil der Scores.
+
+    score_files(index, task) == score_files(index) + task_score_delta(index, task);
+    so lassen sich die aufgabenunabhängigen Scores einmal berechnen und
+    wiederverwenden. Import-Graph und Entry-Points werden dafür nicht
+    erneut ausgewertet.
+
+    Args:
+        project_index: Projekt-Index
+        task: Aufgabentext des Benutzers
+        categories: Zu bewertende Kategorien
+
+    Returns:
+        Dictionary Pfad → Zusatz-Score, nur Dateien mit Treffern
+    """
+    terms = task_terms(task)
+    if not terms:
+        return {}
+    categories = set(categories)
+    candidates = sorted((entry for entry in project_index if entry.category in categories),
+                        key=lambda e: e.path)
+    delta = {}
+    for i, entry in enumerate(candidates):
+        head = ''
+        if i < RANK_MAX_FILES and (entry.suffix == '.py' or entry.suffix in JS_SUFFIXES):
+            head = _read_head(project_index.abs_path(entry))
+        bonus = _task_bonus(terms, entry.path, head)
+        if bonus:
+            delta[entry.path] = bonus
+    return delta
+
+
+def rank_files(project_index: ProjectIndex, task: str = '',
+               categories: Iterable[str] = ('code_files',),
+               scores: Optional[Dict[str, float]] = None) -> List[FileEntry]:
+    """
+    Liefert die Dateien der Kategorien, absteigend nach Relevanz sortiert.
+
+    Args:
+        project_index: Projekt-Index
+        task: Optional, Aufgabentext des Benutzers
+        categories: Zu berücksichtigende Kategorien
+        scores: Optional, bereits berechnete Scores (siehe score_files)
+
+    Returns:
+        Sortierte Liste von FileEntries (bei Gleichstand nach Pfad)
+    """
+    categories = tuple(categories)
+    if scores is None:
+        scores = score_files(project_index, task, categories)
+    entries = [entry for entry in project_index if entry.category in categories]
+    return sorted(entries, key=lambda entry: (-scores.get(entry.path, 0.0), entry.path))
@@ -0,0 +1,205 @@
+"""Zeilenbereiche aus Dateien lesen - über mmap und eine gecachte Zeilen-Offset-Tabelle"""
+
+import mmap
+import os
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Optional, Tuple, Union
+
+
+# Anzahl gleichzeitig geöffneter Dateien im Lese-Cache (LRU)
+READ_CACHE_FILES = int(os.getenv('AGENTS_READ_CACHE_FILES', '256'))
+
+# Dateien mit NUL-Bytes am Anfang gelten als binär
+BINARY_SNIFF_BYTES = 8192
+
+# Unter Windows verhindert ein offenes mmap os.replace/os.unlink der Datei -
+# dort wird der Inhalt stattdessen in den Speicher gelesen
+USE_MMAP = os.name != 'nt'
+
+
+class BinaryFileError(ValueError):
+    """Die Datei ist binär und kann nicht zeilenweise gelesen werden"""
+
+
+class LineIndexedFile:
+    """
+    Eine per mmap geöffnete Datei mit Tabelle der Zeilenanfänge.
+
+    Die Tabelle wird einmal beim Öffnen aufgebaut; danach kostet jeder
+    Zeilenbereich nur zwei Array-Zugriffe und ein Slice des mmap.
+    Unter Windows (USE_MMAP) wird der Inhalt gelesen, damit die Datei
+    ersetzt oder gelöscht werden kann, solange sie im Cache liegt.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        stat = os.stat(path)
+        self.signature = (stat.st_size, stat.st_mtime_ns)
+        self._data: Optional[Union[mmap.mmap, bytes]] = None
+        data = b''
+        if stat.st_size:
+            with open(path, 'rb') as f:
+                self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if USE_MMAP else f.read()
+            data = self._data
+        if b'\0' in data[:BINARY_SNIFF_BYTES]:
+            self.close()
+            raise BinaryFileError(path)
+
+        # offsets[i] = Byte-Position von Zeile i+1; letzter Eintrag = Dateiende
+        offsets = array('Q', [0])
+        find = data.find
+        position = find(b'\n')
+        while position != -1:
+            offsets.append(position + 1)
+            position = find(b'\n', position + 1)
+        if offsets[-1] != len(data):
+            offsets.append(len(data))
+        self._offsets = offsets
+
+    @property
+    def line_count(self) -> int:
+        return len(self._offsets) - 1
+
+    def is_current(self) -> bool:
+        """Prüft ob die Datei seit dem Öffnen unverändert ist (Größe und mtime)"""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return False
+        return (stat.st_size, stat.st_mtime_ns) == self.signature
+
+    def read_lines(self, start_line: int, end_line: int) -> str:
+        """Zeilen start_line bis end_line (1-basiert, inklusive) als Text"""
+        start_line = max(1, start_line)
+        end_line = min(end_line, self.line_count)
+        if self._data is None or start_line > end_line:
+            return ''
+        data = self._data[self._offsets[start_line - 1]:self._offsets[end_line]]
+        return data.decode('utf-8', errors='replace')
+
+    def close(self) -> None:
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._data = None
+
+
+class FileReadCache:
+    """
+    LRU-Cache geöffneter Dateien (pro Prozess, also pro Lauf).
+
+    Einträge werden vor jeder Nutzung über Größe und mtime validiert und
+    nach Schreibzugriffen der Tools explizit verworfen (invalidate).
+    Thread-sicher.
+    """
+
+    def __init__(self, max_files: int = READ_CACHE_FILES):
+        self.max_files = max_files
+        self.hits = 0
+        self.misses = 0
+        self._files: 'OrderedDict[str, LineIndexedFile]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path: str) -> LineIndexedFile:
+        """
+        Liefert die geöffnete Datei (aus dem Cache oder neu geöffnet).
+
+        Raises:
+            OSError: Datei nicht lesbar
+            BinaryFileError: Datei ist binär
+        """
+        path = os.path.abspath(path)
+        with self._lock:
+            cached = self._files.get(path)
+            if cached is not None:
+                if cached.is_current():
+                    self._files.move_to_end(path)
+                    self.hits += 1
+                    return cached
+                cached.close()
+                del self._files[path]
+
+            self.misses += 1
+            opened = LineIndexedFile(path)
+            self._files[path] = opened
+            while len(self._files) > self.max_files:
+                _, evicted = self._files.popitem(last=False)
+                evicted.close()
+            return opened
+
+    def invalidate(self, path: str) -> None:
+        """Verwirft eine Datei (z.B. nach Write File oder Delete File)"""
+        with self._lock:
+            cached = self._files.pop(os.path.abspath(path), None)
+            if cached is not None:
+                cached.close()
+
+    def clear(self) -> None:
+        """Schließt alle Dateien (z.B. bevor das Overlay auf die Platte geschrieben wird)"""
+        with self._lock:
+            for cached in self._files.values():
+                cached.close()
+            self._files.clear()
+
+
+_read_cache = FileReadCache()
+
+
+def get_read_cache() -> FileReadCache:
+    """Der (pro Prozess geteilte) Lese-Cache"""
+    return _read_cache
+
+
+def read_file_range(path: str, start_line: int = 1, end_line: Optional[int] = None,
+                    max_chars: Optional[int] = None) -> Tuple[str, int, int]:
+    """
+    Liest einen Zeilenbereich einer Datei über den Lese-Cache.
+
+    Args:
+        path: Pfad zur Datei
+        start_line: Erste Zeile (1-basiert)
+        end_line: Letzte Zeile (inklusive), None = bis Dateiende
+        max_chars: Optional, der Bereich wird an einer Zeilengrenze auf
+            diese Länge gekürzt (mindestens eine Zeile)
+
+    Returns:
+        (Text, letzte gelieferte Zeile, Gesamtzahl Zeilen)
+
+    Raises:
+        OSError: Datei nicht lesbar
+        BinaryFileError: Datei ist binär
+    """
+    indexed = _read_cache.get(path)
+    total = indexed.line_count
+    start_line = max(1, start_line)
+    end_line = total if end_line is None else min(end_line, total)
+    return _cap_chars(indexed.read_lines(start_line, end_line), start_line, end_line, max_chars) + (total,)
+
+
+def read_text_range(text: str, start_line: int = 1, end_line: Optional[int] = None,
+                    max_chars: Optional[int] = None) -> Tuple[str, int, int]:
+    """Wie read_file_range, aber für einen Text im Speicher (z.B. aus dem Overlay)"""
+    # Wie die Offset-Tabelle: nur '\n' trennt Zeilen
+    lines = [line + '\n' for line in text.split('\n')]
+    if lines[-1] == '\n':
+        lines.pop()
+    else:
+        lines[-1] = lines[-1][:-1]
+    total = len(lines)
+    start_line = max(1, start_line)
+    end_line = total if end_line is None else min(end_line, total)
+    return _cap_chars(''.join(lines[start_line - 1:end_line]), start_line, end_line, max_chars) + (total,)
+
+
+def _cap_chars(text: str, start_line: int, end_line: int, max_chars: Optional[int]) -> Tuple[str, int]:
+    """Kürzt einen Zeilenbereich an einer Zeilengrenze auf max_chars (mindestens eine Zeile)"""
+    if max_chars is not None and len(text) > max_chars:
+        cut = text.rfind('\n', 0, max_chars)
+        if cut == -1:
+            # Schon die erste Zeile ist zu lang - sie wird trotzdem vollständig geliefert
+            cut = text.find('\n')
+            cut = len(text) - 1 if cut == -1 else cut
+        text = text[:cut + 1]
+        end_line = start_line + text.count('\n') - 1 + (0 if text.endswith('\n') else 1)
+    return text, end_line
@@ -0,0 +1,136 @@
+"""Paralleler Verzeichnis-Scan für sehr große Projekte"""
+
+import os
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator, List, NamedTuple, Optional, Tuple
+
+from my_agents.ignore_rules import IGNORE_FILES, IgnoreMatcher
+
+
+# Threads für den Scan (Verzeichnisse werden parallel gelesen)
+WALK_WORKERS = int(os.getenv('AGENTS_WALK_WORKERS', '0')) or min(16, (os.cpu_count() or 1) * 2)
+
+
+class WalkedFile(NamedTuple):
+    """Eine gefundene Datei (Pfad relativ zum Startverzeichnis)"""
+    path: str
+    name: str
+    size: int
+    mtime: float
+
+
+def walk_files(root: str,
+               matcher: Optional[IgnoreMatcher] = None,
+               file_filter: Optional[Callable[[str], bool]] = None,
+               workers: int = WALK_WORKERS,
+               start: str = '') -> Iterator[WalkedFile]:
+    """
+    Durchsucht ein Verzeichnis rekursiv mit os.scandir auf einem Thread-Pool.
+
+    Jedes Unterverzeichnis wird als eigener Job gelesen; die Stat-Daten der
+    DirEntry-Objekte werden direkt wiederverwendet. Ignorierte Ordner werden
+    samt Teilbaum übersprungen, .gitignore/.agentsignore in Unterordnern
+    erweitern die Regeln für ihren Teilbaum. Ergebnisse werden als Stream
+    geliefert, sobald ein Verzeichnis fertig gelesen ist - die Reihenfolge
+    ist daher nicht deterministisch.
+
+    Args:
+        root: Startverzeichnis
+        matcher: Ignore-Regeln (Standard: keine)
+        file_filter: Optional, Prädikat auf den Dateinamen (vor dem stat)
+        workers: Anzahl Threads (1 = sequentiell ohne Thread-Pool)
+        start: Optional, Unterordner relativ zu root, in dem der Scan beginnt
+               (Pfade bleiben relativ zu root)
+
+    Yields:
+        WalkedFile je Datei
+    """
+    matcher = matcher or IgnoreMatcher()
+
+    # Ignore-Dateien der Ordner zwischen root und start einbeziehen
+    start = os.path.normpath(start) if start and start != '.' else ''
+    parts = start.split(os.sep) if start else []
+    for i in range(1, len(parts)):
+        rel_dir = os.path.join(*parts[:i])
+        names = [name for name in IGNORE_FILES if os.path.isfile(os.path.join(root, rel_dir, name))]
+        matcher = matcher.extended_for_dir(root, rel_dir, names)
+
+    if workers <= 1:
+        pending = [(start, matcher)]
+        while pending:
+            files, subdirs = _scan_dir(root, *pending.pop(), file_filter)
+            pending.extend(subdirs)
+            yield from files
+        return
+
+    results: 'queue.Queue[Tuple[List[WalkedFile], List[_DirJob]]]' = queue.Queue()
+    executor = ThreadPoolExecutor(max_workers=workers)
+
+    def job(rel_dir: str, dir_matcher: IgnoreMatcher) -> None:
+        try:
+            result = _scan_dir(root, rel_dir, dir_matcher, file_filter)
+        except Exception:
+            result = ([], [])
+        # Genau ein Ergebnis pro Verzeichnis - sonst hängt der Konsument
+        results.put(result)
+
+    try:
+        executor.submit(job, start, matcher)
+        outstanding = 1
+        while outstanding:
+            files, subdirs = results.get()
+            outstanding -= 1
+            for subdir in subdirs:
+                executor.submit(job, *subdir)
+            outstanding += len(subdirs)
+            yield from files
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+# (relativer Ordner, Ignore-Regeln für dessen Teilbaum)
+_DirJob = Tuple[str, IgnoreMatcher]
+
+
+def _scan_dir(root: str, rel_dir: str, matcher: IgnoreMatcher,
+              file_filter: Optional[Callable[[str], bool]]) -> Tuple[List[WalkedFile], List[_DirJob]]:
+    """Liest ein einzelnes Verzeichnis: (Dateien, Unterverzeichnis-Jobs)"""
+    files = []
+    subdirs = []
+
+    try:
+        with os.scandir(os.path.join(root, rel_dir) if rel_dir else root) as it:
+            entries = list(it)
+    except OSError:
+        return files, subdirs
+
+    # Ignore-Dateien der Wurzel sind bereits im Matcher enthalten
+    if rel_dir:
+        matcher = matcher.extended_for_dir(root, rel_dir, {entry.name for entry in entries})
+
+    for entry in entries:
+        rel_path = os.path.join(rel_dir, entry.name) if rel_dir else entry.name
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                if not matcher.is_ignored(rel_path, is_dir=True):
+                    subdirs.append((rel_path, matcher))
+                continue
+            if not entry.is_file():
+                continue
+            if file_filter is not None and not file_filter(entry.name):
+                continue
+            if matcher.is_ignored(rel_path):
+                continue
+            stat = entry.stat()
+        except OSError:
+            # Ignoriere Dateien die nicht gelesen werden können
+            continue
+        files.append(WalkedFile(
+            path=rel_path,
+            name=entry.name,
+            size=stat.st_size,
+            mtime=stat.st_mtime,
+        ))
+
+    return files, subdirs
@@ -0,0 +1,472 @@
+"""Persistenter Trigramm-Index für schnelles Regex-Grep (nach dem Prinzip von Google Code Search)"""
+
+import fnmatch
+import os
+import re
+import sqlite3
+import threading
+from array import array
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+try:
+    import re._parser as _sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse as _sre_parse
+
+from my_agents.fs_walker import walk_files
+from my_agents.ignore_rules import get_project_matcher
+from my_agents.scan_cache import get_cache_dir, hash_content
+
+
+GREP_INDEX_FILE = 'grep.sqlite'
+
+# Bei Format-Änderungen erhöhen - alte Indizes werden dann neu aufgebaut
+GREP_INDEX_VERSION = 3
+
+# Größere Dateien (meist generiert) werden nicht indexiert
+GREP_MAX_FILE_BYTES = 2 * 1024 * 1024
+
+# Höchstens so viele (seltenste) Trigramme pro Anfrage schneiden
+GREP_MAX_QUERY_TRIGRAMS = 6
+
+# Dateien pro Segment beim Aufbau; ab so vielen Segmenten wird kompaktiert
+GREP_SEGMENT_FILES = 5000
+GREP_MAX_SEGMENTS = 32
+
+_LITERAL = _sre_parse.LITERAL
+_SUBPATTERN = _sre_parse.SUBPATTERN
+_REPEATS = tuple(getattr(_sre_parse, name) for name in ('MAX_REPEAT', 'MIN_REPEAT', 'POSSESSIVE_REPEAT')
+                 if hasattr(_sre_parse, name))
+
+
+_TRIGRAM = re.compile(b'...', re.DOTALL)
+
+
+def _trigrams(data: bytes) -> Set[bytes]:
+    """Alle Trigramme eines Inhalts (drei versetzte findall-Läufe in C statt einer Python-Schleife)"""
+    trigrams = set(_TRIGRAM.findall(data))
+    trigrams.update(_TRIGRAM.findall(data, 1))
+    trigrams.update(_TRIGRAM.findall(data, 2))
+    return trigrams
+
+
+def _required_literals(pattern: str) -> List[str]:
+    """
+    Literale Zeichenketten, die in jedem Treffer vorkommen müssen.
+
+    Wertet nur Sequenzen aus: Alternativen, optionale Teile und
+    Zeichenklassen unterbrechen ein Literal und werden nicht verlangt.
+    """
+    try:
+        parsed = _sre_parse.parse(pattern)
+    except Exception:
+        return []
+
+    literals: List[str] = []
+
+    def walk(items) -> None:
+        current = ''
+        for op, arg in items:
+            if op == _LITERAL:
+                current += chr(arg)
+                continue
+            if len(current) >= 3:
+                literals.append(current)
+            current = ''
+            if op == _SUBPATTERN:
+                walk(arg[-1])
+            elif op in _REPEATS and arg[0] >= 1:
+                walk(arg[2])
+        if len(current) >= 3:
+            literals.append(current)
+
+    walk(parsed)
+    return literals
+
+
+class GrepMatch(NamedTuple):
+    """Eine passende Zeile"""
+    path: str
+    line_number: int
+    line: str
+
+
+class GrepResult(NamedTuple):
+    """Eine Seite von Treffern"""
+    matches: List[GrepMatch]
+    has_more: bool
+    candidates: int     # Dateien nach Trigramm-Filter
+    indexed: int        # Dateien im Index
+
+
+class TrigramIndex:
+    """
+    Trigramm-Index über alle Textdateien des Arbeitsverzeichnisses
+    (jede Endung, ohne ignorierte Dateien, Binärdateien und Dateien über
+    GREP_MAX_FILE_BYTES).
+
+    Für jede Datei werden die enthaltenen Trigramme (ASCII case-insensitive)
+    erfasst. Eine Regex-Suche bestimmt zuerst die Literale, die jeder
+    Treffer enthalten muss, schneidet die Posting-Listen der seltensten
+    Trigramme und führt die Regex nur auf den verbleibenden Dateien aus.
+
+    Posting-Listen werden wie bei Zoekt/Lucene in Segmenten gespeichert
+    (ein Blob mit Datei-IDs pro Trigramm und Segment). Geänderte Dateien
+    erhalten eine neue ID in einem neuen Segment, die alte ID wird
+    ungültig; zu viele Segmente oder ungültige IDs lösen eine Kompaktierung
+    aus. Persistiert in .agents_cache/grep.sqlite. Thread-sicher.
+    """
+
+    def __init__(self, work_dir: str):
+        self.work_dir = str(work_dir)
+        self._dirty: Set[str] = set()
+        self._lock = threading.RLock()
+        self._conn = self._open()
+        self._pending: Dict[bytes, array] = {}
+        self._pending_files = 0
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(get_cache_dir(self.work_dir) / GREP_INDEX_FILE), check_same_thread=False)
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        row = conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        if row is None or row[0] != str(GREP_INDEX_VERSION):
+            for table in ('files', 'postings'):
+                conn.execute(f"DROP TABLE IF EXISTS {table}")
+            conn.execute("DELETE FROM meta")
+            conn.execute("INSERT INTO meta (key, value) VALUES ('version', ?)", (str(GREP_INDEX_VERSION),))
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            " id INTEGER PRIMARY KEY, path TEXT UNIQUE, size INTEGER, mtime REAL, hash TEXT)"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS postings ("
+            " tri BLOB, segment INTEGER, ids BLOB, PRIMARY KEY (tri, segment)) WITHOUT ROWID"
+        )
+        conn.commit()
+        return conn
+
+    def _meta_int(self, key: str) -> int:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return int(row[0]) if row else 0
+
+    def _set_meta_int(self, key: str, value: int) -> None:
+        self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def mark_dirty(self, rel_path: str) -> None:
+        """Markiert eine Datei zur Neu-Indexierung vor der nächsten Suche (z.B. nach Write File)"""
+        with self._lock:
+            self._dirty.add(os.path.normpath(rel_path))
+
+    def _remove(self, path: str) -> None:
+        """Entfernt eine Datei; ihre ID in den Posting-Listen wird damit ungültig"""
+        cursor = self._conn.execute("DELETE FROM files WHERE path = ?", (path,))
+        if cursor.rowcount:
+            self._set_meta_int('dead', self._meta_int('dead') + 1)
+
+    def _index_file(self, rel_path: str, size: int, mtime: float, data: bytes) -> None:
+        cursor = self._conn.execute(
+            "INSERT INTO files (path, size, mtime, hash) VALUES (?, ?, ?, ?)",
+            (rel_path, size, mtime, hash_content(data))
+        )
+        # Binärdateien werden nur registriert, nicht indexiert
+        if b'\0' in data[:8192]:
+            return
+        file_id = cursor.lastrowid
+        pending = self._pending
+        for trigram in _trigrams(data.lower()):
+            ids = pending.get(trigram)
+            if ids is None:
+                ids = pending[trigram] = array('I')
+            ids.append(file_id)
+        self._pending_files += 1
+        if self._pending_files >= GREP_SEGMENT_FILES:
+            self._flush()
+
+    def _flush(self) -> None:
+        """Schreibt die gesammelten Posting-Listen als neues Segment"""
+        if not self._pending:
+            return
+        segment = self._meta_int('next_segment')
+        self._conn.executemany(
+            "INSERT INTO postings (tri, segment, ids) VALUES (?, ?, ?)",
+            ((trigram, segment, ids.tobytes()) for trigram, ids in self._pending.items())
+        )
+        self._set_meta_int('next_segment', segment + 1)
+        self._pending = {}
+        self._pending_files = 0
+
+    def _segment_count(self) -> int:
+        return self._conn.execute("SELECT COUNT(DISTINCT segment) FROM postings").fetchone()[0]
+
+    def compact(self) -> None:
+        """Fasst alle Segmente zu einem zusammen und entfernt ungültige IDs"""
+        with self._lock:
+            self._flush()
+            alive = array('I', (file_id for (file_id,) in self._conn.execute("SELECT id FROM files")))
+            alive_set = set(alive)
+            self._conn.execute("DROP TABLE IF EXISTS postings_new")
+            self._conn.execute(
+                "CREATE TABLE postings_new ("
+                " tri BLOB, segment INTEGER, ids BLOB, PRIMARY KEY (tri, segment)) WITHOUT ROWID"
+            )
+
+            def merged():
+                current, ids = None, array('I')
+                for trigram, blob in self._conn.execute("SELECT tri, ids FROM postings ORDER BY tri, segment"):
+                    if trigram != current:
+                        if ids:
+                            yield current, 0, ids.tobytes()
+                        current, ids = trigram, array('I')
+                    segment_ids = array('I')
+                    segment_ids.frombytes(blob)
+                    ids.extend(file_id for file_id in segment_ids if file_id in alive_set)
+                if ids:
+                    yield current, 0, ids.tobytes()
+
+            rows = list(merged())
+            self._conn.executemany("INSERT INTO postings_new (tri, segment, ids) VALUES (?, ?, ?)", rows)
+            self._conn.execute("DROP TABLE postings")
+            self._conn.execute("ALTER TABLE postings_new RENAME TO postings")
+            self._set_meta_int('next_segment', 1)
+            self._set_meta_int('dead', 0)
+            self._conn.commit()
+
+    def _finish_update(self) -> None:
+        self._flush()
+        alive = self._conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+        if self._segment_count() > GREP_MAX_SEGMENTS or self._meta_int('dead') > max(100, alive // 3):
+            self.compact()
+        self._conn.commit()
+        self._dirty.clear()
+
+    def _reindex(self, rel_path: str, size: int, mtime: float, cached_hash: Optional[str]) -> bool:
+        """Liest eine Datei und indexiert sie neu, falls sich der Inhalt geändert hat"""
+        if size > GREP_MAX_FILE_BYTES:
+            self._remove(rel_path)
+            return False
+        try:
+            with open(os.path.join(self.work_dir, rel_path), 'rb') as f:
+                data = f.read()
+        except OSError:
+            self._remove(rel_path)
+            return False
+        if cached_hash is not None and cached_hash == hash_content(data):
+            # Nur mtime geändert (z.B. git checkout) - Inhalt identisch
+            self._conn.execute("UPDATE files SET size = ?, mtime = ? WHERE path = ?", (size, mtime, rel_path))
+            return False
+        self._remove(rel_path)
+        self._index_file(rel_path, size, mtime, data)
+        return True
+
+    def update(self) -> Tuple[int, int]:
+        """
+        Gleicht den Index mit dem Arbeitsverzeichnis ab (ein Scan aller
+        nicht ignorierten Dateien, gelesen werden nur geänderte).
+
+        Returns:
+            (neu indexierte Dateien, entfernte Dateien)
+        """
+        with self._lock:
+            walked = {entry.path: entry for entry in walk_files(self.work_dir, get_project_matcher(self.work_dir))}
+            known = {path: (size, mtime, content_hash) for path, size, mtime, content_hash in
+                     self._conn.execute("SELECT path, size, mtime, hash FROM files")}
+
+            removed = [path for path in known if path not in walked]
+            for path in removed:
+                self._remove(path)
+
+            indexed = 0
+            for entry in walked.values():
+                cached = known.get(entry.path)
+                if cached is not None and cached[:2] == (entry.size, entry.mtime) and entry.path not in self._dirty:
+                    continue
+                if self._reindex(entry.path, entry.size, entry.mtime, cached[2] if cached else None):
+                    indexed += 1
+
+            self._finish_update()
+            return indexed, len(removed)
+
+    def update_dirty(self) -> int:
+        """
+        Indexiert nur die als geändert markierten Dateien neu (ohne Verzeichnis-Scan).
+
+        Returns:
+            Anzahl neu indexierter Dateien
+        """
+        with self._lock:
+            matcher = get_project_matcher(self.work_dir)
+            indexed = 0
+            for rel_path in self._dirty:
+                if matcher.is_path_ignored(rel_path):
+                    self._remove(rel_path)
+                    continue
+                try:
+                    stat = os.stat(os.path.join(self.work_dir, rel_path))
+                except OSError:
+                    self._remove(rel_path)
+                    continue
+                if self._reindex(rel_path, stat.st_size, stat.st_mtime, None):
+                    indexed += 1
+            self._finish_update()
+            return indexed
+
+    def candidates(self, pattern: str, ignore_case: bool = False) -> Optional[List[str]]:
+        """
+        Dateien, die alle für das Muster nötigen Trigramme enthalten.
+
+        Der Index ist nur für ASCII case-insensitive; ohne Beachtung der
+        Groß-/Kleinschreibung werden daher nur ASCII-Literale verwendet.
+
+        Returns:
+            Sortierte Pfade, oder None wenn das Muster keine Einschränkung
+            erlaubt (dann müssen alle Dateien durchsucht werden)
+        """
+        trigrams = set()
+        for literal in _required_literals(pattern):
+            if ignore_case and not literal.isascii():
+                continue
+            trigrams |= _trigrams(literal.encode('utf-8').lower())
+        if not trigrams:
+            return None
+
+        with self._lock:
+            # Posting-Größen über length() bestimmen, ohne die Blobs zu laden
+            sizes = []
+            for trigram in trigrams:
+                size = self._conn.execute(
+                    "SELECT COALESCE(SUM(length(ids)), 0) FROM postings WHERE tri = ?", (trigram,)
+                ).fetchone()[0]
+                if not size:
+                    # Ein nötiges Trigramm kommt in keiner Datei vor
+                    return []
+                sizes.append((size, trigram))
+            sizes.sort()
+
+            file_ids: Optional[Set[int]] = None
+            for _, trigram in sizes[:GREP_MAX_QUERY_TRIGRAMS]:
+                ids = array('I')
+                for (blob,) in self._conn.execute("SELECT ids FROM postings WHERE tri = ?", (trigram,)):
+                    ids.frombytes(blob)
+                if file_ids is None:
+                    file_ids = set(ids)
+                else:
+                    file_ids.intersection_update(ids)
+                if not file_ids:
+                    return []
+
+            # Ungültige IDs (geänderte/gelöschte Dateien) fallen hier heraus
+            paths = []
+            id_list = list(file_ids)
+            for i in range(0, len(id_list), 900):
+                batch = id_list[i:i + 900]
+                paths.extend(path for (path,) in self._conn.execute(
+                    f"SELECT path FROM files WHERE id IN ({','.join('?' * len(batch))})", batch))
+            return sorted(paths)
+
+    def all_paths(self) -> List[str]:
+        with self._lock:
+            return [path for (path,) in self._conn.execute("SELECT path FROM files ORDER BY path")]
+
+    def grep(self, pattern: str, ignore_case: bool = False, path_glob: Optional[str] = None,
+             offset: int = 0, limit: int = 50, max_line_chars: int = 200) -> GrepResult:
+        """
+        Sucht Zeilen, die auf eine Regex passen.
+
+        Args:
+            pattern: Regulärer Ausdruck (Python-Syntax)
+            ignore_case: Groß-/Kleinschreibung ignorieren
+            path_glob: Optional, Filter auf den Pfad (z.B. '*.py' oder 'src/*')
+            offset: Anzahl zu überspringender Treffer (Paginierung)
+            limit: Maximale Anzahl Treffer dieser Seite
+            max_line_chars: Zeilen werden auf diese Länge gekürzt
+
+        Returns:
+            GrepResult mit den Treffern der Seite
+
+        Raises:
+            re.error: Ungültiger regulärer Ausdruck
+        """
+        regex = re.compile(pattern, re.IGNORECASE if ignore_case else 0)
+        paths = self.candidates(pattern, ignore_case)
+        if paths is None:
+            paths = self.all_paths()
+        candidate_count = len(paths)
+        if path_glob:
+            paths = [path for path in paths
+                     if fnmatch.fnmatch(path, path_glob) or fnmatch.fnmatch(os.path.basename(path), path_glob)]
+
+        matches: List[GrepMatch] = []
+        skipped = 0
+        for path in paths:
+            try:
+                with open(os.path.join(self.work_dir, path), encoding='utf-8', errors='ignore') as f:
+                    text = f.read()
+            except OSError:
+                continue
+            if '\0' in text[:8192] or not regex.search(text):
+                # Binärdateien sind nur registriert (Muster ohne Literal durchsuchen alle Pfade)
+                continue
+            for line_number, line in enumerate(text.splitlines(), 1):
+                if not regex.search(line):
+                    continue
+                if skipped < offset:
+                    skipped += 1
+                    continue
+                if len(matches) >= limit:
+                    return GrepResult(matches, True, candidate_count, self.file_count())
+                if len(line) > max_line_chars:
+                    line = line[:max_line_chars] + '…'
+                matches.append(GrepMatch(path, line_number, line))
+
+        return GrepResult(matches, False, candidate_count, self.file_count())
+
+    def file_count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+
+_indexes: Dict[str, TrigramIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def _index_key(work_dir: str) -> str:
+    # Wie die schreibenden Tools: Symlinks aufgelöst
+    return str(Path(work_dir).resolve())
+
+
+def get_grep_index(work_dir: str, refresh: bool = False) -> TrigramIndex:
+    """
+    Liefert den (pro Prozess geteilten) Trigramm-Index eines Projekts.
+
+    Mit dem Dateisystem abgeglichen wird nur beim ersten Zugriff im Prozess
+    und bei refresh=True. Danach werden vor jeder Suche nur die als geändert
+    gemeldeten Dateien (mark_grep_dirty) neu indexiert - eine Suche scannt
+    nie das ganze Verzeichnis.
+
+    Args:
+        work_dir: Arbeitsverzeichnis
+        refresh: Abgleich erzwingen
+    """
+    key = _index_key(work_dir)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        created = index is None
+        if created:
+            index = _indexes[key] = TrigramIndex(key)
+    if created or refresh:
+        index.update()
+    elif index._dirty:
+        index.update_dirty()
+    return index
+
+
+def mark_grep_dirty(work_dir: str, rel_path: str) -> None:
+    """Meldet eine geschriebene/gelöschte Datei an einen bereits geladenen Trigramm-Index"""
+    index = _indexes.get(_index_key(work_dir))
+    if index is not None:
+        index.mark_dirty(rel_path)
@@ -0,0 +1,222 @@
+"""Gemeinsame Ignore-Regeln: Standard-Ordner, .gitignore und .agentsignore"""
+
+import os
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, List, NamedTuple, Optional, Pattern, Sequence
+
+
+# Ordner die immer ignoriert werden (gemeinsam für alle Scanner und Tools)
+DEFAULT_IGNORE_DIRS = {
+    'node_modules', '.git', '__pycache__', '.venv', 'venv',
+    'dist', 'build', '.cache', '.pytest_cache', 'env',
+    '.next', 'coverage', '.nyc_output', '.agents_cache'
+}
+
+# Dateimuster die immer ignoriert werden (generierte Bundles)
+DEFAULT_IGNORE_PATTERNS = ['*.min.js', '*.min.css', '*.map']
+
+# Ignore-Dateien, die in jedem Verzeichnis ausgewertet werden
+IGNORE_FILES = ('.gitignore', '.agentsignore')
+
+
+class IgnoreRule(NamedTuple):
+    """Ein kompiliertes Muster aus einer Ignore-Datei"""
+    regex: Pattern
+    negate: bool      # '!muster' nimmt Dateien wieder auf
+    dir_only: bool    # 'muster/' trifft nur Ordner
+    basename: bool    # Muster ohne '/' trifft den Namen auf jeder Ebene
+
+
+def _translate_glob(pattern: str) -> str:
+    """Übersetzt ein gitignore-Glob (ohne führendes/abschließendes '/') in eine Regex"""
+    regex = ''
+    i = 0
+    n = len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == '*':
+            if pattern[i:i + 2] == '**':
+                at_start = i == 0 or pattern[i - 1] == '/'
+                at_end = i + 2 == n or pattern[i + 2] == '/'
+                if at_start and at_end:
+                    if i + 2 == n:
+                        regex += '.*'             # 'a/**' → alles darunter
+                    else:
+                        regex += '(?:.*/)?'       # '**/' → beliebig viele Ordner
+                        i += 1
+                    i += 2
+                    continue
+            regex += '[^/]*'
+        elif c == '?':
+            regex += '[^/]'
+        elif c == '[':
+            end = pattern.find(']', i + 2)
+            if end == -1:
+                regex += re.escape(c)
+            else:
+                content = pattern[i + 1:end]
+                if content.startswith('!'):
+                    content = '^' + content[1:]
+                regex += '[' + content.replace('\\', '\\\\') + ']'
+                i = end
+        elif c == '\\' and i + 1 < n:
+            i += 1
+            regex += re.escape(pattern[i])
+        else:
+            regex += re.escape(c)
+        i += 1
+    return regex
+
+
+def compile_rule(line: str, base: str = '') -> Optional[IgnoreRule]:
+    """
+    Kompiliert eine Zeile einer Ignore-Datei.
+
+    Args:
+        line: Zeile im gitignore-Format
+        base: Verzeichnis der Ignore-Datei relativ zum Projekt ('' = Wurzel)
+
+    Returns:
+        IgnoreRule oder None für Leerzeilen und Kommentare
+    """
+    line = line.rstrip('\n').rstrip('\r')
+    if not line.endswith('\\ '):
+        line = line.rstrip(' ')
+    if not line or line.startswith('#'):
+        return None
+
+    negate = line.startswith('!')
+    if negate:
+        line = line[1:]
+    elif line.startswith('\\'):
+        line = line[1:]
+
+    dir_only = line.endswith('/')
+    line = line.strip('/') if dir_only else line
+    if not line:
+        return None
+
+    # Muster mit '/' sind relativ zum Ort der Ignore-Datei verankert
+    anchored = '/' in line
+    line = line.lstrip('/')
+
+    if anchored:
+        prefix = re.escape(base + '/') if base else ''
+        regex = re.compile(prefix + _translate_glob(line) + r'\Z', re.DOTALL)
+    else:
+        regex = re.compile(_translate_glob(line) + r'\Z', re.DOTALL)
+
+    return IgnoreRule(regex, negate, dir_only, not anchored)
+
+
+class IgnoreMatcher:
+    """
+    Vorkompilierte Ignore-Regeln mit gitignore-Semantik.
+
+    Die letzte passende Regel gewinnt; Regeln aus tiefer liegenden
+    Ignore-Dateien werden angehängt und haben daher Vorrang. Ohne
+    Negationen werden alle Muster zu wenigen kombinierten Regexes
+    zusammengefasst, sodass pro Pfad nur ein bis zwei Matches nötig sind.
+    """
+
+    def __init__(self, rules: Sequence[IgnoreRule] = ()):
+        self.rules = tuple(rules)
+        self._ordered = any(rule.negate for rule in self.rules)
+        if not self._ordered:
+            self._name_any = self._combine(r for r in self.rules if r.basename and not r.dir_only)
+            self._name_dir = self._combine(r for r in self.rules if r.basename and r.dir_only)
+            self._path_any = self._combine(r for r in self.rules if not r.basename and not r.dir_only)
+            self._path_dir = self._combine(r for r in self.rules if not r.basename and r.dir_only)
+
+    @staticmethod
+    def _combine(rules: Iterable[IgnoreRule]) -> Optional[Pattern]:
+        patterns = [rule.regex.pattern for rule in rules]
+        if not patterns:
+            return None
+        return re.compile('|'.join(f'(?:{p})' for p in patterns), re.DOTALL)
+
+    @classmethod
+    def for_project(cls, work_dir: str) -> 'IgnoreMatcher':
+        """
+        Kompiliert Standard-Regeln, .git/info/exclude sowie .gitignore und
+        .agentsignore im Wurzelverzeichnis des Projekts.
+        """
+        lines = [f'{name}/' for name in sorted(DEFAULT_IGNORE_DIRS)] + DEFAULT_IGNORE_PATTERNS
+        rules = [compile_rule(line) for line in lines]
+
+        for ignore_file in (Path(work_dir) / '.git' / 'info' / 'exclude',) + tuple(
+                Path(work_dir) / name for name in IGNORE_FILES):
+            rules.extend(compile_rule(line) for line in _read_lines(ignore_file))
+
+        return cls([rule for rule in rules if rule is not None])
+
+    def extended(self, base: str, lines: Iterable[str]) -> 'IgnoreMatcher':
+        """Neuer Matcher mit zusätzlichen Regeln aus einer Ignore-Datei in `base`"""
+        base = base.replace(os.sep, '/')
+        new_rules = [rule for rule in (compile_rule(line, base) for line in lines) if rule is not None]
+        if not new_rules:
+            return self
+        return IgnoreMatcher(self.rules + tuple(new_rules))
+
+    def extended_for_dir(self, root: str, rel_dir: str, names: Iterable[str]) -> 'IgnoreMatcher':
+        """Erweitert den Matcher um die Ignore-Dateien eines Unterverzeichnisses"""
+        matcher = self
+        for name in IGNORE_FILES:
+            if name in names:
+                matcher = matcher.extended(rel_dir, _read_lines(Path(root) / rel_dir / name))
+        return matcher
+
+    def is_ignored(self, rel_path: str, is_dir: bool = False) -> bool:
+        """
+        Prüft einen einzelnen Pfad (ohne die Eltern-Ordner zu prüfen).
+
+        Args:
+            rel_path: Pfad relativ zum Projekt
+            is_dir: True für Ordner
+        """
+        if os.sep != '/':
+            rel_path = rel_path.replace(os.sep, '/')
+        name = rel_path.rsplit('/', 1)[-1]
+
+        if not self._ordered:
+            if self._name_any is not None and self._name_any.match(name):
+                return True
+            if self._path_any is not None and self._path_any.match(rel_path):
+                return True
+            if is_dir:
+                if self._name_dir is not None and self._name_dir.match(name):
+                    return True
+                if self._path_dir is not None and self._path_dir.match(rel_path):
+                    return True
+            return False
+
+        for rule in reversed(self.rules):
+            if rule.dir_only and not is_dir:
+                continue
+            if rule.regex.match(name if rule.basename else rel_path):
+                return not rule.negate
+        return False
+
+    def is_path_ignored(self, rel_path: str, is_dir: bool = False) -> bool:
+        """Prüft einen Pfad inklusive aller Eltern-Ordner"""
+        parts = rel_path.replace(os.sep, '/').strip('/').split('/')
+        for i in range(1, len(parts)):
+            if self.is_ignored('/'.join(parts[:i]), is_dir=True):
+                return True
+        return self.is_ignored('/'.join(parts), is_dir=is_dir)
+
+
+def _read_lines(path: Path) -> List[str]:
+    """Liest eine Ignore-Datei (fehlende Dateien ergeben keine Regeln)"""
+    try:
+        return path.read_text(encoding='utf-8', errors='ignore').splitlines()
+    except OSError:
+        return []
+
+
+@lru_cache(maxsize=None)
+def get_project_matcher(work_dir: str) -> IgnoreMatcher:
+    """Kompiliert die Ignore-Regeln eines Projekts einmal pro Lauf"""
+    return IgnoreMatcher.for_project(os.path.abspath(work_dir))
@@ -0,0 +1,193 @@
+"""Persistenter Cache für LLM-Antworten: gleiche Anfrage (Modell, Nachrichten, Parameter) = gleiche Antwort"""
+
+import json
+import os
+from typing import Any, Optional
+
+import httpx
+
+from my_agents.disk_cache import LRUDiskCache, make_key
+from my_agents.scan_cache import get_cache_dir
+
+
+LLM_CACHE_MODES = ('off', 'read-write', 'read-only')
+
+# off = kein Cache, read-write = lesen und speichern, read-only = nur lesen (z.B. in CI)
+LLM_CACHE_MODE = os.getenv('AGENTS_LLM_CACHE', 'off')
+
+# Einträge verfallen nach dieser Zeit (Sekunden, Standard 7 Tage)
+LLM_CACHE_TTL = float(os.getenv('AGENTS_LLM_CACHE_TTL', str(7 * 24 * 3600)))
+
+# Maximale Größe der Cache-Datei, darüber werden die ältesten Einträge verdrängt
+LLM_CACHE_BYTES = int(os.getenv('AGENTS_LLM_CACHE_MB', '256')) * 1024 * 1024
+
+LLM_CACHE_FILE = 'llm.sqlite'
+
+# Bei Änderungen am Schlüssel-Format erhöhen
+LLM_CACHE_VERSION = 1
+
+# Request-Felder ohne Einfluss auf die Antwort
+IGNORED_FIELDS = ('stream_options', 'user', 'metadata', 'store')
+
+# Nur diese Endpunkte werden gecacht
+CACHED_ENDPOINTS = ('/chat/completions', '/responses')
+
+# Header, die nach dem Dekodieren der Antwort nicht mehr stimmen
+_STALE_HEADERS = ('content-encoding', 'content-length', 'transfer-encoding')
+
+
+def normalize_content(value: Any) -> Any:
+    """Vereinheitlicht Zeilenenden und Leerraum am Ende in Texten (auch in Listen/Dicts)"""
+    if isinstance(value, str):
+        return '\n'.join(line.rstrip() for line in value.replace('\r\n', '\n').split('\n')).rstrip()
+    if isinstance(value, list):
+        return [normalize_content(item) for item in value]
+    if isinstance(value, dict):
+        # Cache-Markierungen u.ä. ändern die Antwort nicht
+        return {key: normalize_content(item) for key, item in value.items()
+                if item is not None and key != 'cache_breakpoint'}
+    return value
+
+
+def request_key(endpoint: str, body: dict) -> Optional[str]:
+    """
+    Content-adressierter Schlüssel einer Anfrage.
+
+    Besteht aus Modell, normalisierten Nachrichten und allen übrigen
+    Parametern (temperature, tools, stop, ...). Streaming-Anfragen
+    werden nicht gecacht (None).
+    """
+    if body.get('stream'):
+        return None
+    canonical = {key: value for key, value in body.items() if key not in IGNORED_FIELDS}
+    for field in ('messages', 'input', 'instructions'):
+        if field in canonical:
+            canonical[field] = normalize_content(canonical[field])
+    return make_key(str(LLM_CACHE_VERSION), endpoint, json.dumps(canonical, sort_keys=True, ensure_ascii=False))
+
+
+class LLMResponseCache:
+    """
+    Antworten der LLM-API im Projekt-Cache (.agents_cache/llm.sqlite).
+
+    Die Datei wird erst beim ersten Zugriff geöffnet - im aktuellen
+    Verzeichnis, das die CLI als Arbeitsverzeichnis nutzt.
+    """
+
+    def __init__(self, mode: str = LLM_CACHE_MODE, ttl: float = LLM_CACHE_TTL,
+                 max_bytes: int = LLM_CACHE_BYTES):
+        if mode not in LLM_CACHE_MODES:
+            print(f"⚠️  Unbekannter LLM-Cache-Modus: {mode} - erlaubt: {', '.join(LLM_CACHE_MODES)}")
+            mode = 'off'
+        self.mode = mode
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.stores = 0
+        self._cache: Optional[LRUDiskCache] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != 'off'
+
+    @property
+    def writable(self) -> bool:
+        return self.mode == 'read-write'
+
+    def _disk(self) -> LRUDiskCache:
+        if self._cache is None:
+            self._cache = LRUDiskCache(get_cache_dir(os.getcwd()) / LLM_CACHE_FILE,
+                                       max_bytes=self.max_bytes, ttl=self.ttl)
+        return self._cache
+
+    @property
+    def hits(self) -> int:
+        return self._cache.hits if self._cache is not None else 0
+
+    @property
+    def misses(self) -> int:
+        return self._cache.misses if self._cache is not None else 0
+
+    def get(self, key: str) -> Optional[str]:
+        return self._disk().get(key) if self.enabled else None
+
+    def set(self, key: str, response_body: str) -> None:
+        if self.writable:
+            self._disk().set(key, response_body)
+            self.stores += 1
+
+    def format_stats(self) -> Optional[str]:
+        """Trefferquote für das Ende des Laufs (None wenn der Cache aus ist)"""
+        if not self.enabled:
+            return None
+        lookups = self.hits + self.misses
+        rate = f" ({self.hits / lookups:.0%})" if lookups else ""
+        return (f"🗄️  LLM-Cache ({self.mode}): {self.hits} Treffer{rate}, {self.misses} Fehlzugriffe, "
+                f"{self.stores} gespeichert")
+
+
+def _is_completion(content: bytes) -> bool:
+    """OpenRouter meldet manche Fehler mit Status 200 - nur echte Antworten speichern"""
+    try:
+        body = json.loads(content)
+    except (ValueError, UnicodeDecodeError):
+        return False
+    return isinstance(body, dict) and 'error' not in body and ('choices' in body or 'output' in body)
+
+
+class CachingTransport(httpx.BaseTransport):
+    """
+    httpx-Transport vor dem eigentlichen Verbindungs-Pool.
+
+    Beantwortet bekannte Completion-Anfragen aus dem LLMResponseCache und
+    speichert neue erfolgreiche Antworten. Alles andere wird unverändert
+    durchgereicht.
+    """
+
+    def __init__(self, transport: httpx.BaseTransport, cache: LLMResponseCache):
+        self.transport = transport
+        self.cache = cache
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        key = self._key(request)
+        if key is None:
+            return self.transport.handle_request(request)
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            return httpx.Response(200, headers={'content-type': 'application/json'},
+                                  content=cached.encode('utf-8'), request=request)
+
+        response = self.transport.handle_request(request)
+        if response.status_code != 200:
+            return response
+        try:
+            content = response.read()
+        finally:
+            response.close()
+        if _is_completion(content):
+            self.cache.set(key, content.decode('utf-8', errors='replace'))
+        headers = [(name, value) for name, value in response.headers.items()
+                   if name.lower() not in _STALE_HEADERS]
+        return httpx.Response(response.status_code, headers=headers, content=content, request=request)
+
+    def _key(self, request: httpx.Request) -> Optional[str]:
+        if request.method != 'POST' or not request.url.path.endswith(CACHED_ENDPOINTS):
+            return None
+        try:
+            body = json.loads(request.read())
+        except (ValueError, UnicodeDecodeError):
+            return None
+        if not isinstance(body, dict):
+            return None
+        return request_key(f"{request.url.host}{request.url.path}", body)
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+_llm_cache = LLMResponseCache()
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """Der (pro Prozess geteilte) LLM-Antwort-Cache"""
+    return _llm_cache
@@ -1,14 +1,84 @@
 """Zentrale LLM-Konfiguration für alle Crews"""
 
+import json
 import os
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
 from crewai import LLM
 
-def get_llm(model_name: str) -> LLM:
+from my_agents.llm_cache import CachingTransport, get_llm_cache
+
+
+# Basis-URL der OpenRouter-API (über OPENROUTER_BASE_URL z.B. auf einen lokalen Stub umlenkbar)
+OPENROUTER_BASE_URL = os.getenv('OPENROUTER_BASE_URL', 'https://openrouter.ai/api/v1')
+
+# AGENTS_LLM_POOL=0 schaltet Registry und gemeinsamen Verbindungs-Pool ab
+LLM_POOL_ENABLED = os.getenv('AGENTS_LLM_POOL', '1') != '0'
+
+# Grenzen des gemeinsamen HTTP-Pools (alle LLMs teilen ihn)
+LLM_MAX_CONNECTIONS = int(os.getenv('AGENTS_LLM_MAX_CONNECTIONS', '20'))
+LLM_MAX_KEEPALIVE = int(os.getenv('AGENTS_LLM_MAX_KEEPALIVE', '10'))
+LLM_KEEPALIVE_EXPIRY = float(os.getenv('AGENTS_LLM_KEEPALIVE_EXPIRY', '90'))
+
+
+_http_client: Optional[httpx.Client] = None
+_llms: Dict[Tuple[str, str, str], LLM] = {}
+_registry_lock = threading.Lock()
+
+
+def get_http_client() -> httpx.Client:
     """
-    Erstelle eine LLM-Instanz mit OpenRouter-Konfiguration.
+    Der gemeinsame HTTP-Client aller LLMs (pro Prozess).
+
+    Verbindungen zu openrouter.ai bleiben offen (keep-alive) und werden
+    von allen Agents wiederverwendet - TCP- und TLS-Handshake fallen nur
+    einmal pro Verbindung an, nicht pro LLM-Instanz. Ist der LLM-Cache
+    aktiv, beantwortet er bekannte Anfragen, bevor sie den Pool erreichen.
+    """
+    global _http_client
+    with _registry_lock:
+        if _http_client is None:
+            from openai import DefaultHttpxClient
+            transport: httpx.BaseTransport = httpx.HTTPTransport(limits=httpx.Limits(
+                max_connections=LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=LLM_MAX_KEEPALIVE,
+                keepalive_expiry=LLM_KEEPALIVE_EXPIRY,
+            ))
+            # Optionaler Antwort-Cache vor dem Pool (AGENTS_LLM_CACHE)
+            llm_cache = get_llm_cache()
+            if llm_cache.enabled:
+                transport = CachingTransport(transport, llm_cache)
+            _http_client = DefaultHttpxClient(transport=transport)
+        return _http_client
+
+
+def _attach_http_client(llm: LLM) -> None:
+    """Ersetzt den eigenen HTTP-Client eines OpenAI-kompatiblen LLMs durch den gemeinsamen"""
+    if not hasattr(llm, '_build_sync_client'):
+        # LiteLLM-Fallback - verwaltet seine Verbindungen selbst
+        return
+    try:
+        params = llm._get_client_params()
+    except ValueError:
+        # Kein API-Key - der Client wird erst beim ersten Aufruf gebaut (dann ohne Pool)
+        return
+    from openai import OpenAI
+    params['http_client'] = get_http_client()
+    llm._client = OpenAI(**params)
+
+
+def get_llm(model_name: str, **settings: Any) -> LLM:
+    """
+    Liefert die LLM-Instanz für ein Modell mit OpenRouter-Konfiguration.
+    
+    Pro Modell und Einstellungen gibt es nur eine Instanz; alle Instanzen
+    teilen einen HTTP-Verbindungs-Pool (siehe get_http_client).
     
     Args:
         model_name: Der Modellname (z.B. "deepseek/deepseek-v3.2")
+        **settings: Optional, weitere LLM-Parameter (z.B. temperature)
     
     Returns:
         Konfigurierte LLM-Instanz
@@ -17,13 +87,41 @@ def get_llm(model_name: str) -> LLM:
     if not model_name.startswith("openrouter/"):
         model_name = f"openrouter/{model_name}"
     
+    if not LLM_POOL_ENABLED and not get_llm_cache().enabled:
+        return _create_llm(model_name, settings)
+    
+    key = (model_name, OPENROUTER_BASE_URL, json.dumps(settings, sort_keys=True, default=str))
+    with _registry_lock:
+        llm = _llms.get(key)
+    if llm is not None:
+        return llm
+    
+    llm = _create_llm(model_name, settings)
+    _attach_http_client(llm)
+    with _registry_lock:
+        # Bei gleichzeitigem Aufruf gewinnt die erste Instanz
+        return _llms.setdefault(key, llm)
+
+
+def _create_llm(model_name: str, settings: Dict[str, Any]) -> LLM:
     return LLM(
         model=model_name,
         api_key=os.getenv("OPENROUTER_API_KEY"),
-        base_url="https://openrouter.ai/api/v1"
+        base_url=OPENROUTER_BASE_URL,
+        **settings
     )
 
 
+def clear_llm_registry() -> None:
+    """Verwirft alle LLM-Instanzen und schließt den Verbindungs-Pool"""
+    global _http_client
+    with _registry_lock:
+        _llms.clear()
+        if _http_client is not None:
+            _http_client.close()
+            _http_client = None
+
+
 # Vorkonfigurierte LLMs für verschiedene Rollen
 def get_orchestrator_llm() -> LLM:
     """LLM für Orchestrator/Manager (gpt-5-nano)"""
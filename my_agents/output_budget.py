@@ -0,0 +1,125 @@
+"""Token-Budgets für Tool-Ausgaben: zu große Ergebnisse werden seitenweise über ein Handle abgerufen"""
+
+import functools
+import itertools
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, List, Optional
+
+from my_agents.token_counter import TokenCounter, get_token_counter
+
+
+# Standard-Budget pro Tool-Aufruf (Tokens); pro Tool über das Feld output_budget änderbar
+TOOL_OUTPUT_TOKENS = int(os.getenv('AGENTS_TOOL_OUTPUT_TOKENS', '4000'))
+
+# So viele zu große Ergebnisse bleiben für "Fetch Result" abrufbar (LRU)
+SPILLED_RESULTS = 64
+
+
+class SpilledResult:
+    """Ein in Seiten zerlegtes Tool-Ergebnis"""
+
+    def __init__(self, handle: str, tool_name: str, pages: List[str], tokens: int, lines: int):
+        self.handle = handle
+        self.tool_name = tool_name
+        self.pages = pages
+        self.tokens = tokens
+        self.lines = lines
+
+
+def split_pages(text: str, budget: int, counter: TokenCounter) -> List[str]:
+    """Zerlegt einen Text an Zeilengrenzen in Seiten mit höchstens budget Tokens"""
+    pages = []
+    while text:
+        tokens = counter.count(text)
+        if tokens <= budget:
+            pages.append(text)
+            break
+        # Proportional schätzen, an einer Zeilengrenze schneiden und nachprüfen
+        chars = max(1, int(len(text) * budget / tokens * 0.95))
+        while True:
+            cut = text.rfind('\n', 0, chars)
+            end = cut + 1 if cut > chars // 2 else chars
+            if counter.count(text[:end]) <= budget or chars <= 1:
+                break
+            chars = max(1, int(chars * 0.9))
+        pages.append(text[:end])
+        text = text[end:]
+    return pages
+
+
+class ResultStore:
+    """Zu große Tool-Ergebnisse dieses Laufs (pro Prozess, LRU). Thread-sicher."""
+
+    def __init__(self, max_results: int = SPILLED_RESULTS):
+        self.max_results = max_results
+        self._results: 'OrderedDict[str, SpilledResult]' = OrderedDict()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def spill(self, tool_name: str, text: str, budget: int, counter: Optional[TokenCounter] = None) -> SpilledResult:
+        counter = counter or get_token_counter()
+        pages = split_pages(text, budget, counter)
+        with self._lock:
+            handle = f"r{next(self._ids)}"
+            result = SpilledResult(handle, tool_name, pages, counter.count(text), text.count('\n') + 1)
+            self._results[handle] = result
+            while len(self._results) > self.max_results:
+                self._results.popitem(last=False)
+            return result
+
+    def get(self, handle: str) -> Optional[SpilledResult]:
+        with self._lock:
+            result = self._results.get(handle.strip())
+            if result is not None:
+                self._results.move_to_end(result.handle)
+            return result
+
+
+_store = ResultStore()
+
+
+def get_result_store() -> ResultStore:
+    """Der (pro Prozess geteilte) Speicher für zu große Ergebnisse"""
+    return _store
+
+
+def format_page(result: SpilledResult, page: int) -> str:
+    """Eine Seite mit Kopfzeile und Hinweis auf die nächste Seite"""
+    output = f"📄 Ergebnis {result.handle} von \"{result.tool_name}\" - Seite {page}/{len(result.pages)}\n"
+    output += result.pages[page - 1].rstrip('\n')
+    if page < len(result.pages):
+        output += (f"\n\n➡️  Weiter mit \"Fetch Result\": handle='{result.handle}', page={page + 1}")
+    return output
+
+
+def apply_output_budget(tool_name: str, output: str, budget: int) -> str:
+    """
+    Gibt output unverändert zurück, wenn es ins Budget passt - sonst eine
+    Zusammenfassung mit der ersten Seite und einem Handle für die weiteren.
+    """
+    if budget <= 0 or len(output) <= budget:
+        # Weniger Zeichen als Budget-Tokens passt immer - kein Zählen nötig
+        return output
+    counter = get_token_counter()
+    if counter.count(output) <= budget:
+        return output
+
+    # Platz für Kopf- und Fußzeile lassen
+    result = _store.spill(tool_name, output, max(100, budget - 100), counter)
+    summary = (f"⚠️  Ergebnis zu groß (~{result.tokens:,} Tokens, {result.lines:,} Zeilen) - "
+               f"aufgeteilt in {len(result.pages)} Seiten. Grenze die Anfrage besser ein oder "
+               f"hole weitere Seiten mit \"Fetch Result\".\n")
+    return summary + format_page(result, 1)
+
+
+def with_output_budget(run: Callable[..., str]) -> Callable[..., str]:
+    """Dekorator für Tool._run: wendet das output_budget des Tools auf das Ergebnis an"""
+    @functools.wraps(run)
+    def wrapper(self, *args, **kwargs) -> str:
+        output = run(self, *args, **kwargs)
+        if not isinstance(output, str):
+            return output
+        return apply_output_budget(self.name, output, getattr(self, 'output_budget', TOOL_OUTPUT_TOKENS))
+    return wrapper
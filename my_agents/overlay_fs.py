@@ -0,0 +1,196 @@
+"""Copy-on-Write-Overlay: Schreib- und Löschzugriffe der Tools bis zum Ende des Laufs im Speicher halten"""
+
+import difflib
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from my_agents.atomic_write import write_files_atomic
+
+
+class OverlayFS:
+    """
+    Änderungen am Arbeitsverzeichnis, die noch nicht auf der Platte sind.
+
+    Pro Pfad (relativ zum Arbeitsverzeichnis) wird nur der letzte Stand
+    gehalten: der neue Inhalt oder None für gelöscht. Lesezugriffe sehen
+    zuerst das Overlay, dann die Platte. flush() schreibt alles in einem
+    atomaren Batch; discard() verwirft die Änderungen. Thread-sicher.
+    """
+
+    def __init__(self, work_dir: str):
+        self.work_dir = str(Path(work_dir).resolve())
+        self._changes: Dict[str, Optional[str]] = {}
+        self._lock = threading.Lock()
+
+    def _disk_path(self, rel_path: str) -> str:
+        return os.path.join(self.work_dir, rel_path)
+
+    def _normalize(self, rel_path: str) -> str:
+        return os.path.normpath(rel_path)
+
+    def has(self, rel_path: str) -> bool:
+        """Prüft ob das Overlay einen Stand für den Pfad hat (geschrieben oder gelöscht)"""
+        with self._lock:
+            return self._normalize(rel_path) in self._changes
+
+    def exists(self, rel_path: str) -> bool:
+        """Existiert die Datei aus Sicht der Agents?"""
+        rel_path = self._normalize(rel_path)
+        with self._lock:
+            if rel_path in self._changes:
+                return self._changes[rel_path] is not None
+        return os.path.isfile(self._disk_path(rel_path))
+
+    def is_dir(self, rel_dir: str) -> bool:
+        """Existiert der Ordner auf der Platte oder durch geschriebene Dateien im Overlay?"""
+        rel_dir = self._normalize(rel_dir)
+        if os.path.isdir(self._disk_path(rel_dir)):
+            return True
+        prefix = rel_dir + os.sep
+        with self._lock:
+            return any(path.startswith(prefix) and content is not None for path, content in self._changes.items())
+
+    def read_text(self, rel_path: str) -> str:
+        """
+        Inhalt einer Datei (Overlay vor Platte).
+
+        Raises:
+            FileNotFoundError: Datei existiert nicht oder wurde gelöscht
+        """
+        rel_path = self._normalize(rel_path)
+        with self._lock:
+            if rel_path in self._changes:
+                content = self._changes[rel_path]
+                if content is None:
+                    raise FileNotFoundError(rel_path)
+                return content
+        with open(self._disk_path(rel_path), encoding='utf-8', newline='') as f:
+            return f.read()
+
+    def write_text(self, rel_path: str, content: str) -> None:
+        with self._lock:
+            self._changes[self._normalize(rel_path)] = content
+
+    def delete(self, rel_path: str) -> None:
+        """
+        Markiert eine Datei als gelöscht.
+
+        Raises:
+            FileNotFoundError: Datei existiert nicht
+        """
+        if not self.exists(rel_path):
+            raise FileNotFoundError(rel_path)
+        rel_path = self._normalize(rel_path)
+        with self._lock:
+            if os.path.isfile(self._disk_path(rel_path)):
+                self._changes[rel_path] = None
+            else:
+                # Nur im Overlay angelegt - einfach vergessen
+                self._changes.pop(rel_path, None)
+
+    def merge_listing(self, paths: Iterable[str], rel_dir: str = '.') -> List[str]:
+        """Ergänzt eine Dateiliste von der Platte um neue und ohne gelöschte Overlay-Dateien"""
+        rel_dir = self._normalize(rel_dir)
+        prefix = '' if rel_dir == '.' else rel_dir + os.sep
+        merged = set(paths)
+        with self._lock:
+            for path, content in self._changes.items():
+                if not path.startswith(prefix):
+                    continue
+                if content is None:
+                    merged.discard(path)
+                else:
+                    merged.add(path)
+        return sorted(merged)
+
+    def _disk_text(self, rel_path: str) -> Optional[str]:
+        try:
+            with open(self._disk_path(rel_path), encoding='utf-8', newline='') as f:
+                return f.read()
+        except (OSError, UnicodeDecodeError):
+            return None
+
+    def pending_changes(self) -> List[Tuple[str, Optional[str], Optional[str]]]:
+        """
+        Tatsächliche Änderungen gegenüber der Platte.
+
+        Returns:
+            Sortierte Liste von (Pfad, alter Inhalt, neuer Inhalt);
+            None = Datei existiert nicht bzw. wird gelöscht.
+            Unverändert geschriebene Dateien fehlen.
+        """
+        with self._lock:
+            changes = sorted(self._changes.items())
+        pending = []
+        for rel_path, content in changes:
+            old = self._disk_text(rel_path)
+            if content is None and not os.path.exists(self._disk_path(rel_path)):
+                continue
+            if content is not None and old == content:
+                continue
+            pending.append((rel_path, old, content))
+        return pending
+
+    def diff(self) -> str:
+        """Unified Diff aller Änderungen (wie git diff)"""
+        parts = []
+        for rel_path, old, new in self.pending_changes():
+            posix_path = rel_path.replace(os.sep, '/')
+            parts.extend(difflib.unified_diff(
+                (old or '').splitlines(keepends=True),
+                (new or '').splitlines(keepends=True),
+                fromfile=f"a/{posix_path}" if old is not None else '/dev/null',
+                tofile=f"b/{posix_path}" if new is not None else '/dev/null',
+            ))
+            if parts and not parts[-1].endswith('\n'):
+                parts[-1] += '\n\\ No newline at end of file\n'
+        return ''.join(parts)
+
+    def flush(self) -> Tuple[List[str], List[str]]:
+        """
+        Schreibt alle Änderungen auf die Platte und leert das Overlay.
+
+        Schreiben und Löschen erfolgen als ein atomarer Batch (siehe
+        write_files_atomic) - schlägt der Flush fehl, ist nichts geändert.
+
+        Returns:
+            (geschriebene Pfade, gelöschte Pfade)
+        """
+        pending = self.pending_changes()
+        writes = [(rel_path, new) for rel_path, _, new in pending if new is not None]
+        deletes = [rel_path for rel_path, _, new in pending if new is None]
+
+        if writes or deletes:
+            write_files_atomic(self.work_dir, writes, deletes)
+
+        self.discard()
+        return [rel_path for rel_path, _ in writes], deletes
+
+    def discard(self) -> None:
+        with self._lock:
+            self._changes.clear()
+
+
+_overlays: Dict[str, OverlayFS] = {}
+_overlays_lock = threading.Lock()
+
+
+def activate_overlay(work_dir: str) -> OverlayFS:
+    """Leitet Schreib-/Lesezugriffe der Tools für work_dir über ein (neues) Overlay"""
+    overlay = OverlayFS(work_dir)
+    with _overlays_lock:
+        _overlays[overlay.work_dir] = overlay
+    return overlay
+
+
+def deactivate_overlay(work_dir: str) -> None:
+    """Die Tools greifen wieder direkt auf die Platte zu (nicht geflushte Änderungen gehen verloren)"""
+    with _overlays_lock:
+        _overlays.pop(str(Path(work_dir).resolve()), None)
+
+
+def get_overlay(work_dir: str) -> Optional[OverlayFS]:
+    """Aktives Overlay für work_dir oder None (dann schreiben die Tools direkt)"""
+    return _overlays.get(str(Path(work_dir).resolve()))
@@ -0,0 +1,142 @@
+"""Gemeinsamer Projekt-Index: Ein einziger Scan für Estimator, Summarizer und Crews"""
+
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from my_agents.fs_walker import walk_files
+from my_agents.ignore_rules import get_project_matcher
+
+
+# Relevante Dateiendungen
+RELEVANT_EXTENSIONS = {
+    '.py', '.js', '.ts', '.jsx', '.tsx', '.java', '.cpp', '.c',
+    '.h', '.hpp', '.cs', '.go', '.rs', '.rb', '.php', '.swift',
+    '.md', '.txt', '.json', '.yaml', '.yml', '.xml', '.html',
+    '.css', '.scss', '.sql', '.sh', '.bat', '.ps1'
+}
+
+# Endungen für die Kategorisierung
+CODE_EXTENSIONS = {'.py', '.js', '.ts', '.jsx', '.tsx', '.java', '.cpp', '.c', '.go', '.rs', '.rb', '.php'}
+CONFIG_EXTENSIONS = {'.json', '.yaml', '.yml', '.xml', '.toml', '.ini', '.env'}
+DOC_EXTENSIONS = {'.md', '.txt', '.rst'}
+
+CATEGORIES = ('code_files', 'config_files', 'docs', 'tests', 'other')
+
+
+def categorize_file(filename: str, suffix: str) -> str:
+    """
+    Ordnet eine Datei einer Kategorie zu.
+
+    Args:
+        filename: Dateiname (ohne Pfad)
+        suffix: Dateiendung in Kleinbuchstaben
+
+    Returns:
+        'code_files', 'tests', 'config_files', 'docs' oder 'other'
+    """
+    if suffix in CODE_EXTENSIONS:
+        name = filename.lower()
+        if 'test' in name or 'spec' in name:
+            return 'tests'
+        return 'code_files'
+    if suffix in CONFIG_EXTENSIONS:
+        return 'config_files'
+    if suffix in DOC_EXTENSIONS:
+        return 'docs'
+    return 'other'
+
+
+def _is_relevant(filename: str) -> bool:
+    """Prüft die Dateiendung (vor dem stat-Aufruf)"""
+    return os.path.splitext(filename)[1].lower() in RELEVANT_EXTENSIONS
+
+
+@dataclass
+class FileEntry:
+    """Eine Datei im Projekt-Index"""
+    path: str       # Pfad relativ zum Arbeitsverzeichnis
+    category: str
+    size: int       # Bytes
+    mtime: float
+    content_hash: Optional[str] = None  # gesetzt vom ScanCache
+    tokens: Optional[int] = None
+
+    @property
+    def suffix(self) -> str:
+        """Dateiendung in Kleinbuchstaben"""
+        return os.path.splitext(self.path)[1].lower()
+
+
+class ProjectIndex:
+    """
+    Index aller relevanten Projekt-Dateien, erstellt in einem einzigen Durchlauf.
+
+    Wird einmal pro Lauf gebaut und an Estimator, Summarizer und Crews
+    weitergereicht, statt dass jeder Konsument das Verzeichnis erneut scannt.
+    """
+
+    def __init__(self, work_dir: str, files: List[FileEntry]):
+        self.work_dir = str(work_dir)
+        self.root = Path(work_dir)
+        self.files = files
+        self._by_path = {entry.path: entry for entry in files}
+
+    @classmethod
+    def build(cls, work_dir: str) -> 'ProjectIndex':
+        """
+        Scannt das Arbeitsverzeichnis genau einmal (parallel, siehe fs_walker).
+
+        Ignoriert Standard-Ordner sowie alles aus .gitignore und .agentsignore.
+
+        Args:
+            work_dir: Arbeitsverzeichnis
+
+        Returns:
+            ProjectIndex mit Pfad, Kategorie, Größe und mtime je Datei
+        """
+        files = [
+            FileEntry(
+                path=walked.path,
+                category=categorize_file(walked.name, os.path.splitext(walked.name)[1].lower()),
+                size=walked.size,
+                mtime=walked.mtime,
+            )
+            for walked in walk_files(work_dir, get_project_matcher(work_dir), _is_relevant)
+        ]
+
+        # Parallele Scans liefern keine feste Reihenfolge
+        files.sort(key=lambda entry: entry.path)
+
+        return cls(work_dir, files)
+
+    def __iter__(self) -> Iterator[FileEntry]:
+        return iter(self.files)
+
+    def __len__(self) -> int:
+        return len(self.files)
+
+    def get(self, rel_path: str) -> Optional[FileEntry]:
+        """Liefert den Eintrag zu einem relativen Pfad (oder None)"""
+        return self._by_path.get(rel_path)
+
+    def abs_path(self, entry: FileEntry) -> Path:
+        """Absoluter Pfad eines Eintrags"""
+        return self.root / entry.path
+
+    def by_category(self, category: str) -> List[FileEntry]:
+        """Alle Einträge einer Kategorie in Scan-Reihenfolge"""
+        return [entry for entry in self.files if entry.category == category]
+
+    def structure(self) -> Dict[str, List[str]]:
+        """Dateistruktur als Dictionary {Kategorie: [relative Pfade]}"""
+        structure = {category: [] for category in CATEGORIES}
+        for entry in self.files:
+            structure[entry.category].append(entry.path)
+        return structure
+
+    @property
+    def total_size(self) -> int:
+        """Summe aller Dateigrößen in Bytes"""
+        return sum(entry.size for entry in self.files)
@@ -2,70 +2,72 @@
 
 import os
 from pathlib import Path
-from typing import Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 from crewai import LLM
+from my_agents.code_outline import get_outline_cache, outline_file
+from my_agents.disk_cache import LRUDiskCache, make_key
+from my_agents.file_ranker import rank_files, score_files, task_score_delta, task_terms
+from my_agents.project_index import FileEntry, ProjectIndex
+from my_agents.prompt_packer import Excerpt, pack_excerpts
+from my_agents.scan_cache import ScanCache, get_cache_dir, hash_content
+from my_agents.token_counter import get_token_counter
 
 
-def scan_project_files(work_dir: str) -> Dict[str, List[str]]:
+# Maximale Anzahl gespeicherter Zusammenfassungen pro Projekt (LRU) -
+# inklusive der Teil-Zusammenfassungen großer Projekte (bis MAP_MAX_CHUNKS pro Modell)
+SUMMARY_CACHE_SIZE = int(os.getenv('AGENTS_SUMMARY_CACHE_SIZE', '256'))
+
+# Token-Budget für den Zusammenfassungs-Prompt (mittlere Projekte)
+SUMMARY_PROMPT_TOKENS = int(os.getenv('AGENTS_SUMMARY_PROMPT_TOKENS', '24000'))
+EXCERPT_HEAD_CHARS = 2500       # Datei-Anfang als eigener, wertvollster Auszug
+EXCERPT_MAX_CHARS = 12000       # Maximal gelesene Zeichen pro Datei
+OVERVIEW_MAX_LISTED = 200       # Kandidaten pro Kategorie in der Dateiliste
+OVERVIEW_MAX_EXCERPTS = 40      # Code-Dateien die als Auszug in Frage kommen
+OVERVIEW_MAX_OUTLINES = 300     # Code-Dateien die als Outline in Frage kommen
+TASK_MAX_LISTED = 15            # Aufgaben-relevante Dateien hinter der Zusammenfassung
+OVERVIEW_SECTIONS = (
+    ('code_files', 'Code-Dateien'),
+    ('tests', 'Test-Dateien'),
+    ('config_files', 'Konfiguration'),
+    ('docs', 'Dokumentation'),
+)
+
+# Map-Reduce für große Projekte
+CHUNK_MAX_TOKENS = 60_000       # Ordner darüber werden weiter aufgeteilt
+MAP_MAX_CHUNKS = 48             # Obergrenze für Map-Calls pro Lauf
+CHUNK_PROMPT_TOKENS = 10_000    # Token-Budget der Datei-Auszüge pro Chunk-Prompt
+CHUNK_MERGE_FANIN = 8           # Kleine Nachbar-Ordner pro Chunk (im Mittel, höchstens CHUNK_MAX_TOKENS)
+REDUCE_FANIN = 12               # Teil-Zusammenfassungen pro Reduce-Call
+MAP_WORKERS = int(os.getenv('AGENTS_SUMMARY_WORKERS', '4'))
+
+SUMMARY_SECTIONS = """Erstelle eine Zusammenfassung mit folgenden Abschnitten:
+
+1. **PROJEKT-TYP**: (Web-App, CLI-Tool, Library, API, etc.)
+2. **TECHNOLOGIE-STACK**: (Sprachen, Frameworks, wichtigste Dependencies)
+3. **ARCHITEKTUR**: (Ordner-Struktur, Haupt-Komponenten, Design-Pattern)
+4. **KERN-FEATURES**: (Die 3-5 wichtigsten Features/Funktionen)
+5. **ENTRY-POINTS**: (Wo startet die Anwendung? Haupt-Dateien?)
+6. **ABHÄNGIGKEITEN**: (Externe Libraries, APIs, Datenbanken)
+7. **TESTING**: (Test-Framework, Coverage, wichtige Test-Dateien)
+8. **BESONDERHEITEN**: (Spezielle Konfiguration, Deployment, etc.)
+
+WICHTIG: Halte die Zusammenfassung KOMPAKT (max 2000 Tokens). Fokus auf das Wichtigste!
+"""
+
+
+def scan_project_files(project_index: ProjectIndex) -> Dict[str, List[str]]:
     """
-    Scannt alle relevanten Dateien im Projekt.
+    Liefert alle relevanten Dateien im Projekt, nach Kategorie gruppiert.
     
     Args:
-        work_dir: Arbeitsverzeichnis
+        project_index: Projekt-Index (siehe ProjectIndex.build)
         
     Returns:
         Dictionary mit Dateistruktur
     """
-    work_path = Path(work_dir)
-    
-    # Ignoriere bestimmte Ordner
-    ignore_dirs = {
-        'node_modules', '.git', '__pycache__', '.venv', 'venv', 
-        'dist', 'build', '.cache', '.pytest_cache', 'env',
-        '.next', 'coverage', '.nyc_output'
-    }
-    
-    # Relevante Dateiendungen
-    relevant_extensions = {
-        '.py', '.js', '.ts', '.jsx', '.tsx', '.java', '.cpp', '.c', 
-        '.h', '.hpp', '.cs', '.go', '.rs', '.rb', '.php', '.swift',
-        '.md', '.txt', '.json', '.yaml', '.yml', '.xml', '.html', 
-        '.css', '.scss', '.sql', '.sh', '.bat', '.ps1'
-    }
-    
-    project_structure = {
-        'code_files': [],
-        'config_files': [],
-        'docs': [],
-        'tests': [],
-        'other': []
-    }
-    
-    for root, dirs, files in os.walk(work_path):
-        # Filtere ignorierte Ordner
-        dirs[:] = [d for d in dirs if d not in ignore_dirs]
-        
-        for file in files:
-            file_path = Path(root) / file
-            rel_path = str(file_path.relative_to(work_path))
-            
-            if file_path.suffix.lower() not in relevant_extensions:
-                continue
-            
-            # Kategorisiere Dateien
-            if file_path.suffix in ['.py', '.js', '.ts', '.jsx', '.tsx', '.java', '.cpp', '.c', '.go', '.rs', '.rb', '.php']:
-                if 'test' in file.lower() or 'spec' in file.lower():
-                    project_structure['tests'].append(rel_path)
-                else:
-                    project_structure['code_files'].append(rel_path)
-            elif file_path.suffix in ['.json', '.yaml', '.yml', '.xml', '.toml', '.ini', '.env']:
-                project_structure['config_files'].append(rel_path)
-            elif file_path.suffix in ['.md', '.txt', '.rst']:
-                project_structure['docs'].append(rel_path)
-            else:
-                project_structure['other'].append(rel_path)
-    
-    return project_structure
+    return project_index.structure()
 
 
 def read_file_safe(file_path: Path, max_size: int = 50000) -> str:
@@ -88,101 +90,498 @@ def read_file_safe(file_path: Path, max_size: int = 50000) -> str:
         return f"[Fehler beim Lesen der Datei]"
 
 
-def summarize_project_with_gemini(work_dir: str, llm: LLM) -> str:
+def _readme_excerpt(work_path: Path, max_size: int) -> str:
+    """README-Auszug als Markdown-Abschnitt (leer wenn kein README existiert)"""
+    for readme in ['README.md', 'readme.md', 'README.txt']:
+        readme_path = work_path / readme
+        if readme_path.exists():
+            return f"## {readme}\n```\n{read_file_safe(readme_path, max_size)}\n```\n\n"
+    return ""
+
+
+def _package_excerpt(work_path: Path, max_size: int) -> str:
+    """Auszug der Package-Datei als Markdown-Abschnitt"""
+    for pkg_file in ['package.json', 'setup.py', 'pyproject.toml', 'Cargo.toml']:
+        pkg_path = work_path / pkg_file
+        if pkg_path.exists():
+            return f"## {pkg_file}\n```\n{read_file_safe(pkg_path, max_size)}\n```\n\n"
+    return ""
+
+
+def get_summary_cache(project_index: ProjectIndex) -> LRUDiskCache:
+    """Cache der Projekt-Zusammenfassungen unter .agents_cache/summaries.sqlite"""
+    return LRUDiskCache(get_cache_dir(project_index.work_dir) / 'summaries.sqlite',
+                        max_entries=SUMMARY_CACHE_SIZE)
+
+
+def get_model_name(llm: LLM) -> str:
+    """Modellname einer LLM-Instanz (Teil der Cache-Schlüssel)"""
+    return str(getattr(llm, 'model', type(llm).__name__))
+
+
+def _call_llm(llm: LLM, prompt: str) -> str:
+    """Sendet einen einzelnen Prompt und extrahiert den Antwort-Text"""
+    messages = [{"role": "user", "content": prompt}]
+    response = llm.call(messages)
+    
+    # Extrahiere Text aus Response
+    if hasattr(response, 'content'):
+        return response.content
+    elif isinstance(response, str):
+        return response
+    else:
+        return str(response)
+
+
+def _cached_call(cache: LRUDiskCache, llm: LLM, prompt: str, refresh: bool,
+                 cache_key: Optional[str] = None) -> Tuple[str, bool]:
+    """LLM-Call mit Cache (Schlüssel: Modell + Prompt oder cache_key). Returns: (Text, aus Cache?)"""
+    cache_key = cache_key or make_key(get_model_name(llm), prompt)
+    if not refresh:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached, True
+    result = _call_llm(llm, prompt)
+    cache.set(cache_key, result)
+    return result, False
+
+
+def _file_candidates(project_index: ProjectIndex, ranked: List[FileEntry],
+                     value_of: Callable[[FileEntry], float], outline_cache: LRUDiskCache,
+                     order: float) -> List[Excerpt]:
+    """
+    Prompt-Kandidaten für Dateien in Rang-Reihenfolge.
+    
+    Unterstützte Sprachen liefern eine Outline (Klassen, Funktionen,
+    Signaturen - ein Bruchteil der Tokens des Quelltexts) für bis zu
+    OVERVIEW_MAX_OUTLINES Dateien; die relevantesten Dateien zusätzlich
+    Anfang und Fortsetzung des Quelltexts mit geringerem Nutzen.
+    """
+    candidates = []
+    for i, entry in enumerate(ranked[:OVERVIEW_MAX_OUTLINES]):
+        value = value_of(entry)
+        path = project_index.abs_path(entry)
+        outline = outline_file(path, outline_cache)
+        if outline:
+            candidates.append(Excerpt(f"outline:{entry.path}", f"## {entry.path} (Outline)\n```\n{outline}",
+                                      value=value, order=order + i, truncatable=True))
+            value *= 0.5
+        if i >= OVERVIEW_MAX_EXCERPTS:
+            continue
+        content = read_file_safe(path, EXCERPT_MAX_CHARS)
+        candidates.append(Excerpt(f"head:{entry.path}", f"## {entry.path}\n```\n{content[:EXCERPT_HEAD_CHARS]}",
+                                  value=value, order=order + i + 0.3, truncatable=True))
+        candidates.append(Excerpt(f"rest:{entry.path}", content[EXCERPT_HEAD_CHARS:], value=0.3 * value,
+                                  order=order + i + 0.6, truncatable=True, requires=f"head:{entry.path}"))
+    return candidates
+
+
+def _render_excerpts(excerpts: Iterable[Excerpt]) -> str:
+    """Setzt gewählte Auszüge zusammen (Code in Fences, Fortsetzungen an ihren Anfang)"""
+    text = ""
+    for excerpt in excerpts:
+        if excerpt.key.startswith('rest:'):
+            text = text[:-len("\n```\n\n")] + excerpt.text + "\n```\n\n"
+        elif excerpt.key.startswith(('head:', 'outline:')):
+            text += excerpt.text + "\n```\n\n"
+        else:
+            text += excerpt.text
+    return text
+
+
+def _build_overview(project_index: ProjectIndex, budget: int, scores: Dict[str, float]) -> str:
+    """
+    Projekt-Übersicht (Dateiliste + Auszüge) innerhalb eines Token-Budgets.
+    
+    Kandidaten sind Listen-Einträge, README, Package-Datei sowie Outlines,
+    Anfang und Fortsetzung der relevantesten Code-Dateien; der Nutzen sinkt
+    mit dem Rang. Die Auswahl übernimmt pack_excerpts.
+    
+    Die Übersicht hängt nicht von der Aufgabe ab - sie ist Teil des
+    Cache-Schlüssels der Zusammenfassung.
+    """
+    work_path = project_index.root
+    
+    # Projekt-Struktur aus dem Index, Code-Dateien nach Relevanz sortiert
+    structure = scan_project_files(project_index)
+    ranked = rank_files(project_index, scores=scores)
+    structure['code_files'] = [entry.path for entry in ranked]
+    
+    candidates = []
+    for section, (category, _) in enumerate(OVERVIEW_SECTIONS):
+        for i, path in enumerate(structure[category][:OVERVIEW_MAX_LISTED]):
+            candidates.append(Excerpt(f"list:{category}:{path}", f"- {path}\n",
+                                      value=0.5 / (1 + i / 10), order=section + i / OVERVIEW_MAX_LISTED))
+    
+    readme = _readme_excerpt(work_path, 20000)
+    if readme:
+        candidates.append(Excerpt('readme', readme, value=15, order=10, truncatable=True))
+    
+    outline_cache = get_outline_cache(project_index.work_dir)
+    candidates.extend(_file_candidates(
+        project_index, ranked, lambda entry: 3 + max(0.0, scores.get(entry.path, 0.0)), outline_cache, order=20
+    ))
+    
+    package = _package_excerpt(work_path, 4000)
+    if package:
+        candidates.append(Excerpt('package', package, value=5, order=1000, truncatable=True))
+    
+    # Reserve für Überschriften und Code-Fences
+    headings = "".join(f"**{label} ({len(structure[category])}):**\n... und 0 weitere\n\n"
+                       for category, label in OVERVIEW_SECTIONS)
+    reserve = get_token_counter().count(headings) + 8 * OVERVIEW_MAX_OUTLINES + 50
+    chosen = pack_excerpts(candidates, max(0, budget - reserve))
+    
+    overview = "# PROJEKT-STRUKTUR\n\n"
+    for category, label in OVERVIEW_SECTIONS:
+        listed = [excerpt.text for excerpt in chosen if excerpt.key.startswith(f"list:{category}:")]
+        overview += f"**{label} ({len(structure[category])}):**\n" + "".join(listed)
+        if len(structure[category]) > len(listed):
+            overview += f"... und {len(structure[category]) - len(listed)} weitere\n"
+        overview += "\n"
+    
+    # Lese wichtigste Dateien
+    overview += "\n# DATEI-INHALTE (Auswahl)\n\n"
+    overview += _render_excerpts(excerpt for excerpt in chosen if not excerpt.key.startswith('list:'))
+    
+    return overview
+
+
+def _task_relevant_files(project_index: ProjectIndex, task: str, base_scores: Dict[str, float],
+                         limit: int = TASK_MAX_LISTED) -> str:
+    """
+    Abschnitt mit den Code-Dateien, die zu Begriffen der Aufgabe passen.
+    
+    Wird außerhalb des LLM-Calls an die Zusammenfassung angehängt, damit
+    eine neue Aufgabe den Cache nicht verfehlt. Leer ohne passende Dateien.
+    """
+    if not task_terms(task):
+        return ""
+    delta = task_score_delta(project_index, task)
+    scores = {path: score + delta.get(path, 0.0) for path, score in base_scores.items()}
+    relevant = [entry.path for entry in rank_files(project_index, task, scores=scores)
+                if entry.path in delta][:limit]
+    if not relevant:
+        return ""
+    return "\n\n# RELEVANTE DATEIEN FÜR DIE AUFGABE\n\n" + "".join(f"- {path}\n" for path in relevant)
+
+
+def summarize_project_with_gemini(project_index: ProjectIndex, llm: LLM, refresh: bool = False,
+                                  task: str = '') -> str:
     """
     Erstellt eine strukturierte Zusammenfassung des Projekts mit Gemini.
     
+    Code-Dateien werden nach Relevanz sortiert (Entry-Points, Import-Graph,
+    siehe file_ranker). Dateiliste und Auszüge werden per Token-Budget
+    ausgewählt (AGENTS_SUMMARY_PROMPT_TOKENS), die Prompt-Größe ist damit
+    unabhängig von der Projektgröße begrenzt.
+    
+    Die Zusammenfassung wird unter einem Fingerprint aus Prompt (Übersicht)
+    und Modellname gecacht; solange sich die Übersicht nicht ändert, ist
+    kein LLM-Call nötig - auch nicht bei einer neuen Aufgabe. Zur Aufgabe
+    passende Dateien werden erst danach angehängt.
+    
     Args:
-        work_dir: Arbeitsverzeichnis
+        project_index: Projekt-Index
         llm: LLM-Instanz (Gemini)
+        refresh: Cache ignorieren und neu erstellen (auch AGENTS_REFRESH_SUMMARY=1)
+        task: Optional, Aufgabentext - passende Dateien werden angehängt
         
     Returns:
         Kompakte Projekt-Zusammenfassung
     """
-    work_path = Path(work_dir)
+    budget = SUMMARY_PROMPT_TOKENS
+    preamble = "Du bist ein Projekt-Analyst. Analysiere dieses Projekt und erstelle eine KOMPAKTE, STRUKTURIERTE Zusammenfassung."
+    # Aufgabenunabhängige Scores einmal berechnen, für die Aufgabe nur den Zusatz
+    scores = score_files(project_index)
+    overview = _build_overview(project_index, budget - get_token_counter().count(preamble + SUMMARY_SECTIONS),
+                               scores)
     
-    # Scanne Projekt-Struktur
-    structure = scan_project_files(work_dir)
+    # Erstelle Zusammenfassungs-Prompt
+    prompt = f"""{preamble}
+
+{overview}
+
+{SUMMARY_SECTIONS}"""
     
-    # Erstelle strukturierte Übersicht
-    overview = "# PROJEKT-STRUKTUR\n\n"
-    overview += f"**Code-Dateien ({len(structure['code_files'])}):**\n"
-    for f in structure['code_files'][:20]:  # Erste 20
-        overview += f"- {f}\n"
-    if len(structure['code_files']) > 20:
-        overview += f"... und {len(structure['code_files']) - 20} weitere\n"
-    
-    overview += f"\n**Test-Dateien ({len(structure['tests'])}):**\n"
-    for f in structure['tests'][:10]:
-        overview += f"- {f}\n"
-    if len(structure['tests']) > 10:
-        overview += f"... und {len(structure['tests']) - 10} weitere\n"
-    
-    overview += f"\n**Konfiguration ({len(structure['config_files'])}):**\n"
-    for f in structure['config_files'][:10]:
-        overview += f"- {f}\n"
-    
-    overview += f"\n**Dokumentation ({len(structure['docs'])}):**\n"
-    for f in structure['docs'][:5]:
-        overview += f"- {f}\n"
+    refresh = refresh or os.getenv('AGENTS_REFRESH_SUMMARY', '0') == '1'
+    cache = get_summary_cache(project_index)
+    task_files = _task_relevant_files(project_index, task, scores)
     
-    # Lese wichtigste Dateien
-    overview += "\n\n# DATEI-INHALTE (Auswahl)\n\n"
+    try:
+        # Nutze LLM für Zusammenfassung
+        summary, from_cache = _cached_call(cache, llm, prompt, refresh)
+        if from_cache:
+            print("📦 Zusammenfassung aus Cache geladen (Projekt unverändert)")
+        return summary + task_files
+        
+    except Exception as e:
+        # Fallback: Gebe strukturierte Übersicht zurück
+        return f"# PROJEKT-ÜBERSICHT\n\n{overview}{task_files}\n\n[Automatische Zusammenfassung fehlgeschlagen: {str(e)}]"
+
+
+@dataclass
+class ProjectChunk:
+    """Ein Teil des Projekts (ein oder mehrere Ordner) für die Map-Phase"""
+    name: str
+    entries: List[FileEntry]
+
+    @property
+    def tokens(self) -> int:
+        return sum(_entry_tokens(entry) for entry in self.entries)
+
+
+def _entry_tokens(entry: FileEntry) -> int:
+    """Token-Anzahl aus dem Scan-Cache, sonst Schätzung über die Dateigröße"""
+    return entry.tokens if entry.tokens is not None else entry.size // 4
+
+
+def _is_group_start(name: str, fanin: int) -> bool:
+    """Gruppengrenze vor einem Teil - hängt nur vom Namen ab (im Mittel alle fanin Teile)"""
+    return int(make_key('group', name)[:8], 16) % fanin == 0
+
+
+def _split_directory(name: str, entries: List[FileEntry], depth: int, max_tokens: int) -> List[ProjectChunk]:
+    """Teilt einen Ordner rekursiv, bis jeder Chunk höchstens max_tokens groß ist"""
+    if sum(_entry_tokens(entry) for entry in entries) <= max_tokens:
+        return [ProjectChunk(name, entries)]
     
-    # README
-    for readme in ['README.md', 'readme.md', 'README.txt']:
-        readme_path = work_path / readme
-        if readme_path.exists():
-            overview += f"## {readme}\n```\n{read_file_safe(readme_path, 10000)}\n```\n\n"
-            break
+    direct_files = []
+    subdirs: Dict[str, List[FileEntry]] = {}
+    for entry in entries:
+        parts = entry.path.split(os.sep)
+        if len(parts) <= depth + 1:
+            direct_files.append(entry)
+        else:
+            subdirs.setdefault(parts[depth], []).append(entry)
     
-    # Haupt-Code-Dateien (erste 5)
-    for code_file in structure['code_files'][:5]:
-        file_path = work_path / code_file
-        if file_path.exists():
-            overview += f"## {code_file}\n```\n{read_file_safe(file_path, 5000)}\n```\n\n"
+    if not subdirs:
+        # Nur Dateien ohne Unterordner - nicht weiter teilbar
+        return [ProjectChunk(name, entries)]
     
-    # Package-Info
-    for pkg_file in ['package.json', 'setup.py', 'pyproject.toml', 'Cargo.toml']:
-        pkg_path = work_path / pkg_file
-        if pkg_path.exists():
-            overview += f"## {pkg_file}\n```\n{read_file_safe(pkg_path, 3000)}\n```\n\n"
-            break
+    chunks = [ProjectChunk(name, direct_files)] if direct_files else []
+    for subdir in sorted(subdirs):
+        sub_name = os.path.join(name, subdir) if name != '.' else subdir
+        chunks.extend(_split_directory(sub_name, subdirs[subdir], depth + 1, max_tokens))
     
-    # Erstelle Zusammenfassungs-Prompt
-    prompt = f"""Du bist ein Projekt-Analyst. Analysiere dieses Projekt und erstelle eine KOMPAKTE, STRUKTURIERTE Zusammenfassung.
+    # Kleine Geschwister-Chunks zusammenfassen (weniger LLM-Calls). Neue Gruppen
+    # beginnen an Ordnernamen statt an Größen: ändert sich ein Ordner, bleiben
+    # die Gruppen der anderen (und deren Teil-Zusammenfassungen im Cache) gleich
+    merged: List[ProjectChunk] = []
+    for chunk in chunks:
+        if merged and not _is_group_start(chunk.name, CHUNK_MERGE_FANIN) \
+                and merged[-1].tokens + chunk.tokens <= max_tokens:
+            merged[-1] = ProjectChunk(f"{merged[-1].name}, {chunk.name}", merged[-1].entries + chunk.entries)
+        else:
+            merged.append(chunk)
+    return merged
 
-{overview}
 
-Erstelle eine Zusammenfassung mit folgenden Abschnitten:
+def chunk_project_by_directory(project_index: ProjectIndex,
+                               max_chunk_tokens: int = CHUNK_MAX_TOKENS,
+                               max_chunks: int = MAP_MAX_CHUNKS) -> List[ProjectChunk]:
+    """
+    Teilt das Projekt entlang der Ordnerstruktur in Chunks.
+    
+    Ein Ordner wird nur geteilt, wenn er größer als max_chunk_tokens ist;
+    kleine Nachbar-Ordner werden in Gruppen zusammengelegt, deren Grenzen
+    von den Ordnernamen abhängen, nicht von der Größe der Nachbarn. Ergeben sich mehr als max_chunks Chunks, wird
+    die Chunk-Größe verdoppelt, bis die Anzahl passt - die Zahl der
+    Map-Calls bleibt so begrenzt.
+    
+    Args:
+        project_index: Projekt-Index
+        max_chunk_tokens: Ziel-Größe pro Chunk in Tokens
+        max_chunks: Maximale Anzahl Chunks
+        
+    Returns:
+        Liste von ProjectChunks
+    """
+    while True:
+        chunks = _split_directory('.', list(project_index), 0, max_chunk_tokens)
+        if len(chunks) <= max_chunks:
+            return chunks
+        max_chunk_tokens *= 2
 
-1. **PROJEKT-TYP**: (Web-App, CLI-Tool, Library, API, etc.)
-2. **TECHNOLOGIE-STACK**: (Sprachen, Frameworks, wichtigste Dependencies)
-3. **ARCHITEKTUR**: (Ordner-Struktur, Haupt-Komponenten, Design-Pattern)
-4. **KERN-FEATURES**: (Die 3-5 wichtigsten Features/Funktionen)
-5. **ENTRY-POINTS**: (Wo startet die Anwendung? Haupt-Dateien?)
-6. **ABHÄNGIGKEITEN**: (Externe Libraries, APIs, Datenbanken)
-7. **TESTING**: (Test-Framework, Coverage, wichtige Test-Dateien)
-8. **BESONDERHEITEN**: (Spezielle Konfiguration, Deployment, etc.)
 
-WICHTIG: Halte die Zusammenfassung KOMPAKT (max 2000 Tokens). Fokus auf das Wichtigste!
+def _partial_key(model: str, chunk: ProjectChunk) -> str:
+    """Cache-Schlüssel einer Teil-Zusammenfassung: Modell, Chunk und Content-Hashes"""
+    return make_key(model, 'partial', chunk.name, *(
+        f"{entry.path}:{entry.content_hash or f'{entry.size}:{entry.mtime}'}"
+        for entry in chunk.entries
+    ))
+
+
+def _build_chunk_prompt(project_index: ProjectIndex, chunk: ProjectChunk,
+                        scores: Dict[str, float], outline_cache: LRUDiskCache) -> str:
+    """Prompt für die Zusammenfassung eines Chunks (Dateiliste + Auszüge)"""
+    listing = "".join(f"- {entry.path}\n" for entry in chunk.entries[:50])
+    if len(chunk.entries) > 50:
+        listing += f"... und {len(chunk.entries) - 50} weitere\n"
+    
+    # Code zuerst (nach Relevanz), dann Doku und Konfiguration
+    order = {'code_files': 0, 'docs': 1, 'config_files': 2, 'tests': 3, 'other': 4}
+    category_value = {'code_files': 3, 'docs': 2, 'config_files': 1, 'tests': 1, 'other': 0.5}
+    ranked = sorted(chunk.entries, key=lambda entry: (
+        order.get(entry.category, 5), -scores.get(entry.path, 0.0), entry.path))
+    
+    candidates = _file_candidates(
+        project_index, ranked,
+        lambda entry: category_value.get(entry.category, 0.5) + max(0.0, scores.get(entry.path, 0.0)),
+        outline_cache, order=0
+    )
+    excerpts = _render_excerpts(pack_excerpts(candidates, CHUNK_PROMPT_TOKENS))
+    
+    return f"""Du bist ein Projekt-Analyst. Dies ist EIN TEIL eines großen Projekts: {chunk.name}
+
+**Dateien ({len(chunk.entries)}):**
+{listing}
+# DATEI-AUSZÜGE
+
+{excerpts}
+Fasse diesen Teil KOMPAKT zusammen (max 300 Wörter):
+- Zweck dieses Teils
+- Wichtigste Module, Klassen und Funktionen
+- Abhängigkeiten zu anderen Teilen und externen Libraries
+- Entry-Points und Tests (falls vorhanden)
 """
+
+
+def _group_parts(parts: List[Tuple[str, str]], fanin: int = REDUCE_FANIN) -> List[List[Tuple[str, str]]]:
+    """
+    Teilt (Name, Text)-Paare für eine Reduce-Stufe in Gruppen.
     
-    try:
-        # Nutze LLM für Zusammenfassung
-        messages = [{"role": "user", "content": prompt}]
-        response = llm.call(messages)
-        
-        # Extrahiere Text aus Response
-        if hasattr(response, 'content'):
-            summary = response.content
-        elif isinstance(response, str):
-            summary = response
-        else:
-            summary = str(response)
+    Die Grenzen werden aus den Namen abgeleitet statt aus Positionen: kommt
+    ein Ordner hinzu oder fällt weg, ändert sich nur seine eigene Gruppe.
+    Gruppen sind höchstens 2 * fanin groß.
+    """
+    groups: List[List[Tuple[str, str]]] = []
+    for name, text in parts:
+        if not groups or _is_group_start(name, fanin) or len(groups[-1]) >= 2 * fanin:
+            groups.append([])
+        groups[-1].append((name, text))
+    if len(groups) > len(parts) // 2:
+        # Ungünstige Namen - Stufe würde kaum verdichten
+        groups = [parts[i:i + fanin] for i in range(0, len(parts), fanin)]
+    return groups
+
+
+def _reduce_summaries(cache: LRUDiskCache, llm: LLM, parts: List[Tuple[str, str]],
+                      header: str, refresh: bool) -> str:
+    """
+    Fasst Teil-Zusammenfassungen hierarchisch zusammen (ca. REDUCE_FANIN pro Call).
+    
+    Jede Gruppe wird unter den Hashes ihrer Eingaben gecacht - unveränderte
+    Gruppen brauchen keinen LLM-Call, auch wenn sich andere Teile ändern.
+    """
+    model = get_model_name(llm)
+    level = 0
+    while len(parts) > REDUCE_FANIN:
+        level += 1
+        reduced = []
+        for group in _group_parts(parts):
+            name = f"{level}:{group[0][0]}"
+            if len(group) == 1:
+                reduced.append((name, group[0][1]))
+                continue
+            texts = [text for _, text in group]
+            prompt = ("Fasse diese Teil-Zusammenfassungen eines Projekts zu EINER kompakten "
+                      "Zusammenfassung zusammen (max 500 Wörter). Behalte Modul-Namen, "
+                      "Entry-Points und Abhängigkeiten bei.\n\n" + "\n\n---\n\n".join(texts))
+            key = make_key(model, 'reduce', *(hash_content(text.encode('utf-8')) for text in texts))
+            reduced.append((name, _cached_call(cache, llm, prompt, refresh, key)[0]))
+        parts = reduced
+    
+    prompt = f"""Du bist ein Projekt-Analyst. Das Projekt ist zu groß für einen einzelnen Prompt und wurde
+in Teilen zusammengefasst. Erstelle daraus eine KOMPAKTE, STRUKTURIERTE Gesamt-Zusammenfassung.
+
+{header}
+
+# TEIL-ZUSAMMENFASSUNGEN
+
+{chr(10).join(text for _, text in parts)}
+
+{SUMMARY_SECTIONS}"""
+    return _cached_call(cache, llm, prompt, refresh)[0]
+
+
+def summarize_large_project(project_index: ProjectIndex, llm: LLM, refresh: bool = False,
+                            max_workers: Optional[int] = None) -> str:
+    """
+    Map-Reduce-Zusammenfassung für große Projekte.
+    
+    Map: Ordner-Chunks werden parallel (begrenzter Thread-Pool) mit dem
+    günstigen Summarizer-LLM zusammengefasst. Reduce: Die Teil-Ergebnisse
+    werden - bei vielen Chunks in mehreren Stufen - zu einer kompakten
+    Projekt-Zusammenfassung verdichtet.
+    
+    Inkrementell: Teil-Zusammenfassungen werden unter den Content-Hashes
+    ihrer Dateien gespeichert, Reduce-Ergebnisse unter den Hashes ihrer
+    Eingaben. Ändert sich ein Ordner, werden nur sein Chunk und die
+    Reduce-Gruppen auf dem Weg zur Gesamt-Zusammenfassung neu erstellt;
+    ohne Änderungen ist kein LLM-Call nötig.
+    
+    Args:
+        project_index: Projekt-Index
+        llm: LLM-Instanz (Gemini)
+        refresh: Cache ignorieren (auch AGENTS_REFRESH_SUMMARY=1)
+        max_workers: Parallele Map-Calls (Standard: AGENTS_SUMMARY_WORKERS oder 4)
         
-        return summary
+    Returns:
+        Kompakte Projekt-Zusammenfassung
         
+    Raises:
+        RuntimeError: Wenn kein einziger Chunk zusammengefasst werden konnte
+    """
+    refresh = refresh or os.getenv('AGENTS_REFRESH_SUMMARY', '0') == '1'
+    cache = get_summary_cache(project_index)
+    
+    # Content-Hashes für alle Dateien (liest nur geänderte Dateien neu ein)
+    with ScanCache(project_index.work_dir) as scan_cache:
+        scan_cache.refresh(project_index)
+    chunks = chunk_project_by_directory(project_index)
+    
+    model = get_model_name(llm)
+    cached_parts: Dict[str, str] = {}
+    if not refresh:
+        for chunk in chunks:
+            summary = cache.get(_partial_key(model, chunk))
+            if summary is not None:
+                cached_parts[chunk.name] = summary
+    
+    def summarize_chunk(chunk: ProjectChunk) -> Optional[Tuple[str, str]]:
+        summary = cached_parts.get(chunk.name)
+        if summary is None:
+            try:
+                summary = _call_llm(llm, _build_chunk_prompt(project_index, chunk, scores, outline_cache))
+            except Exception:
+                return None
+            cache.set(_partial_key(model, chunk), summary)
+        return chunk.name, f"## {chunk.name} ({len(chunk.entries)} Dateien)\n{summary}"
+    
+    changed = len(chunks) - len(cached_parts)
+    # Relevanz ohne Aufgabe, damit Teil-Zusammenfassungen aufgabenunabhängig bleiben
+    scores = score_files(project_index) if changed else {}
+    outline_cache = get_outline_cache(project_index.work_dir)
+    if changed:
+        print(f"🗂️  Fasse {changed} von {len(chunks)} Projekt-Teilen zusammen "
+              f"({len(cached_parts)} unverändert aus Cache)...")
+    with ThreadPoolExecutor(max_workers=max_workers or MAP_WORKERS) as pool:
+        results = list(pool.map(summarize_chunk, chunks))
+    
+    parts = [result for result in results if result is not None]
+    if not parts:
+        raise RuntimeError("Keiner der Projekt-Teile konnte zusammengefasst werden")
+    
+    structure = scan_project_files(project_index)
+    header = "# PROJEKT-STRUKTUR\n\n" + "".join(
+        f"- {category}: {len(files)} Dateien\n" for category, files in structure.items()
+    )
+    header += "\n" + _readme_excerpt(project_index.root, 5000) + _package_excerpt(project_index.root, 3000)
+    
+    try:
+        return _reduce_summaries(cache, llm, parts, header, refresh)
     except Exception as e:
-        # Fallback: Gebe strukturierte Übersicht zurück
-        return f"# PROJEKT-ÜBERSICHT\n\n{overview}\n\n[Automatische Zusammenfassung fehlgeschlagen: {str(e)}]"
+        # Fallback: Teil-Zusammenfassungen direkt verwenden
+        return "# PROJEKT-ÜBERSICHT (Teil-Zusammenfassungen)\n\n" + "\n\n".join(text for _, text in parts) + \
+            f"\n\n[Gesamt-Zusammenfassung fehlgeschlagen: {str(e)}]"
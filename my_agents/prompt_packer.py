@@ -0,0 +1,82 @@
+"""Füllt ein Token-Budget optimal mit bewerteten Prompt-Auszügen"""
+
+from dataclasses import dataclass, replace
+from typing import Iterable, List, Optional
+
+from my_agents.token_counter import TokenCounter, get_token_counter
+
+
+# Kürzere Reste lohnen sich nicht als gekürzter Auszug
+MIN_TRUNCATED_TOKENS = 200
+
+TRUNCATION_MARKER = "\n... [gekürzt]"
+
+
+@dataclass
+class Excerpt:
+    """Ein Kandidat für den Prompt"""
+    key: str
+    text: str
+    value: float                     # Nutzen (höher = wichtiger)
+    order: float = 0.0               # Position im fertigen Prompt
+    truncatable: bool = False        # Darf auf das Rest-Budget gekürzt werden
+    requires: Optional[str] = None   # Nur zusammen mit diesem Auszug (z.B. Fortsetzung)
+    tokens: int = 0                  # Wird vom Packer gesetzt
+
+
+def _truncate(excerpt: Excerpt, budget: int, counter: TokenCounter) -> Optional[Excerpt]:
+    """Kürzt einen Auszug (an Zeilengrenzen) auf höchstens budget Tokens"""
+    text = excerpt.text
+    tokens = excerpt.tokens
+    while tokens > budget and text:
+        # Proportional kürzen, mit etwas Reserve für die Schätzung
+        chars = int(len(text) * budget / tokens * 0.95)
+        cut = text.rfind('\n', 0, chars)
+        text = text[:cut if cut > chars // 2 else chars]
+        tokens = counter.count(text + TRUNCATION_MARKER)
+    if not text or tokens < min(MIN_TRUNCATED_TOKENS, budget):
+        return None
+    return replace(excerpt, text=text + TRUNCATION_MARKER, tokens=tokens)
+
+
+def pack_excerpts(candidates: Iterable[Excerpt], budget: int,
+                  counter: Optional[TokenCounter] = None) -> List[Excerpt]:
+    """
+    Wählt Auszüge mit maximalem Gesamtnutzen innerhalb eines Token-Budgets.
+
+    Greedy nach Dichte (Nutzen pro Token) - für teilbare Auszüge das
+    optimale Verfahren (fraktionales Knapsack). Passt ein kürzbarer Auszug
+    nicht mehr vollständig, wird er auf das Rest-Budget gekürzt. Auszüge
+    mit `requires` werden nur aufgenommen, wenn ihr Vorgänger gewählt ist.
+
+    Args:
+        candidates: Kandidaten
+        budget: Maximale Anzahl Tokens aller gewählten Auszüge
+        counter: Token-Zähler (Standard: get_token_counter())
+
+    Returns:
+        Gewählte (ggf. gekürzte) Auszüge, sortiert nach `order`
+    """
+    counter = counter or get_token_counter()
+    candidates = [replace(c, tokens=max(1, counter.count(c.text))) for c in candidates if c.text]
+    candidates.sort(key=lambda c: (-c.value / c.tokens, c.order))
+
+    selected = {}
+    remaining = budget
+    for excerpt in candidates:
+        if remaining <= 0:
+            break
+        if excerpt.value <= 0:
+            continue
+        if excerpt.requires is not None and excerpt.requires not in selected:
+            continue
+        if excerpt.tokens > remaining:
+            if not excerpt.truncatable:
+                continue
+            excerpt = _truncate(excerpt, remaining, counter)
+            if excerpt is None:
+                continue
+        selected[excerpt.key] = excerpt
+        remaining -= excerpt.tokens
+
+    return sorted(selected.values(), key=lambda c: c.order)
@@ -0,0 +1,237 @@
+"""Persistenter, inkrementeller Scan-Cache unter <work_dir>/.agents_cache/"""
+
+import hashlib
+import os
+import shutil
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+from my_agents.project_index import FileEntry, ProjectIndex
+from my_agents.token_counter import TokenCounter, get_token_counter
+
+
+CACHE_DIR_NAME = '.agents_cache'
+SCAN_CACHE_FILE = 'scan.sqlite'
+
+# Bei Format-Änderungen erhöhen - alte Caches werden dann verworfen
+SCAN_CACHE_VERSION = 2
+
+# Threads zum parallelen Lesen, Hashen und Zählen
+SCAN_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+
+def get_cache_dir(work_dir: str) -> Path:
+    """
+    Liefert das Cache-Verzeichnis eines Projekts und legt es bei Bedarf an.
+
+    Das Verzeichnis enthält eine eigene .gitignore, damit es nie committet wird.
+    """
+    cache_dir = Path(work_dir) / CACHE_DIR_NAME
+    if not cache_dir.exists():
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        (cache_dir / '.gitignore').write_text('*\n', encoding='utf-8')
+    return cache_dir
+
+
+def clear_cache(work_dir: str) -> bool:
+    """
+    Löscht den kompletten Cache eines Projekts.
+
+    Returns:
+        True wenn ein Cache gelöscht wurde
+    """
+    cache_dir = Path(work_dir) / CACHE_DIR_NAME
+    if not cache_dir.exists():
+        return False
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    return True
+
+
+def hash_content(data: bytes) -> str:
+    """Content-Hash einer Datei (blake2b, 128 Bit)"""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class ScanCache:
+    """
+    Speichert pro Datei Größe, mtime, Content-Hash und Token-Anzahl in SQLite.
+
+    Dateien deren Größe und mtime unverändert sind, werden bei späteren Läufen
+    nicht erneut gelesen. Token-Anzahlen werden pro (Content-Hash, Zähler)
+    memoisiert, sodass identische Inhalte nur einmal gezählt werden.
+    Deaktivierbar mit AGENTS_SCAN_CACHE=0.
+
+    Verwendung:
+        with ScanCache(work_dir) as cache:
+            cache.refresh(project_index)
+    """
+
+    def __init__(self, work_dir: str, token_counter: Optional[TokenCounter] = None):
+        self.work_dir = str(work_dir)
+        self.enabled = os.getenv('AGENTS_SCAN_CACHE', '1') != '0'
+        self.token_counter = token_counter or get_token_counter()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._token_memo: Dict[str, int] = {}
+
+    def __enter__(self) -> 'ScanCache':
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def open(self) -> None:
+        """Öffnet die Datenbank; verwirft sie bei abweichender Format-Version"""
+        if not self.enabled or self._conn is not None:
+            return
+        try:
+            db_path = get_cache_dir(self.work_dir) / SCAN_CACHE_FILE
+            self._conn = sqlite3.connect(str(db_path))
+            self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+            if row is None or row[0] != str(SCAN_CACHE_VERSION):
+                self._conn.execute("DROP TABLE IF EXISTS files")
+                self._conn.execute("DROP TABLE IF EXISTS token_counts")
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)",
+                    (str(SCAN_CACHE_VERSION),)
+                )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS files ("
+                " path TEXT PRIMARY KEY, size INTEGER, mtime REAL, hash TEXT)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS token_counts ("
+                " hash TEXT, counter TEXT, tokens INTEGER, PRIMARY KEY (hash, counter))"
+            )
+            self._conn.commit()
+            self._token_memo = dict(self._conn.execute(
+                "SELECT hash, tokens FROM token_counts WHERE counter = ?",
+                (self.token_counter.name,)
+            ))
+        except (OSError, sqlite3.Error):
+            # Ohne Cache weiterarbeiten (z.B. schreibgeschütztes Verzeichnis)
+            self._conn = None
+
+    def close(self) -> None:
+        """Schreibt ausstehende Änderungen und schließt die Datenbank"""
+        if self._conn is None:
+            return
+        try:
+            self._conn.commit()
+        except sqlite3.Error:
+            pass
+        self._conn.close()
+        self._conn = None
+
+    def invalidate(self) -> None:
+        """Leert den Scan-Cache"""
+        if self._conn is not None:
+            self._conn.execute("DELETE FROM files")
+            self._conn.execute("DELETE FROM token_counts")
+            self._conn.commit()
+        self._token_memo = {}
+
+    def load(self, project_index: ProjectIndex) -> int:
+        """
+        Übernimmt Hash und Token-Anzahl aus dem Cache für unveränderte Dateien.
+
+        Liest keine Dateiinhalte.
+
+        Returns:
+            Anzahl Cache-Treffer
+        """
+        if self._conn is None:
+            return 0
+
+        hits = 0
+        for path, size, mtime, content_hash in self._conn.execute(
+                "SELECT path, size, mtime, hash FROM files"):
+            entry = project_index.get(path)
+            if entry is not None and entry.size == size and entry.mtime == mtime:
+                entry.content_hash = content_hash
+                entry.tokens = self._token_memo.get(content_hash)
+                hits += 1
+        return hits
+
+    def _scan_file(self, path: Path) -> Optional[Tuple[str, int, bool]]:
+        """Liest, hasht und zählt eine Datei (läuft im Thread-Pool)"""
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        content_hash = hash_content(data)
+        tokens = self._token_memo.get(content_hash)
+        if tokens is not None:
+            return content_hash, tokens, False
+        return content_hash, self.token_counter.count_bytes(data), True
+
+    def refresh(self, project_index: ProjectIndex,
+                entries: Optional[Iterable[FileEntry]] = None) -> int:
+        """
+        Liest nur geänderte oder neue Dateien und aktualisiert den Cache.
+
+        Args:
+            project_index: Projekt-Index
+            entries: Zu aktualisierende Einträge (Standard: alle im Index)
+
+        Returns:
+            Anzahl neu gelesener Dateien
+        """
+        self.load(project_index)
+
+        pending = [
+            entry for entry in (project_index if entries is None else entries)
+            if entry.tokens is None
+        ]
+        paths = [project_index.abs_path(entry) for entry in pending]
+        with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as pool:
+            results = list(pool.map(self._scan_file, paths))
+
+        changed = []
+        counted = []
+        for entry, result in zip(pending, results):
+            if result is None:
+                # Ignoriere Dateien die nicht gelesen werden können
+                continue
+            entry.content_hash, entry.tokens, is_new = result
+            changed.append((entry.path, entry.size, entry.mtime, entry.content_hash))
+            if is_new:
+                self._token_memo[entry.content_hash] = entry.tokens
+                counted.append((entry.content_hash, self.token_counter.name, entry.tokens))
+
+        if self._conn is not None:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO files (path, size, mtime, hash) VALUES (?, ?, ?, ?)",
+                changed
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO token_counts (hash, counter, tokens) VALUES (?, ?, ?)",
+                counted
+            )
+            self._conn.commit()
+        self.prune(project_index)
+
+        return len(changed)
+
+    def prune(self, project_index: ProjectIndex) -> int:
+        """
+        Entfernt Einträge für Dateien, die nicht mehr im Index stehen
+        (gelöscht, umbenannt oder inzwischen ignoriert).
+
+        Returns:
+            Anzahl entfernter Einträge
+        """
+        if self._conn is None:
+            return 0
+        stale = [
+            (path,) for (path,) in self._conn.execute("SELECT path FROM files")
+            if project_index.get(path) is None
+        ]
+        if stale:
+            self._conn.executemany("DELETE FROM files WHERE path = ?", stale)
+            self._conn.commit()
+        return len(stale)
@@ -0,0 +1,477 @@
+"""Tests der Agents ausführen: Auswahl über den Import-Graphen, Ergebnisse gecacht, pytest parallel"""
+
+import ast
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from my_agents.disk_cache import LRUDiskCache, make_key
+from my_agents.fs_walker import walk_files
+from my_agents.ignore_rules import get_project_matcher
+from my_agents.overlay_fs import OverlayFS, get_overlay
+from my_agents.scan_cache import get_cache_dir, hash_content
+
+
+TEST_CACHE_FILE = 'tests.sqlite'
+TEST_CACHE_ENTRIES = 50000
+
+# Bei Format-Änderungen erhöhen - alte Ergebnisse werden dann ignoriert
+TEST_CACHE_VERSION = 2
+
+# Parallele pytest-Prozesse (Testdateien werden aufgeteilt)
+TEST_WORKERS = int(os.getenv('AGENTS_TEST_WORKERS', '0')) or min(4, os.cpu_count() or 1)
+
+# Zeitlimit pro pytest-Prozess in Sekunden
+TEST_TIMEOUT = int(os.getenv('AGENTS_TEST_TIMEOUT', '300'))
+
+# Änderungen an diesen Dateien betreffen alle Tests
+PYTEST_CONFIG_FILES = ('pytest.ini', 'pyproject.toml', 'setup.cfg', 'tox.ini')
+
+# Größere Nicht-Python-Dateien gehen über Größe und mtime statt Inhalt in den Schlüssel ein
+DATA_HASH_MAX_BYTES = 1024 * 1024
+
+
+def is_test_file(rel_path: str) -> bool:
+    """pytest-Namenskonvention: test_*.py oder *_test.py"""
+    name = os.path.basename(rel_path)
+    return name.endswith('.py') and (name.startswith('test_') or name.endswith('_test.py'))
+
+
+def parse_imports(source: str) -> List[Tuple[int, str, List[str]]]:
+    """
+    Alle Imports eines Moduls (auch in Funktionen).
+
+    Returns:
+        (Level, Modul, importierte Namen) - Level > 0 bei relativen Imports
+    """
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return []
+    imports = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            imports.extend((0, alias.name, []) for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            imports.append((node.level, node.module or '', [alias.name for alias in node.names]))
+    return imports
+
+
+def _module_parts(rel_path: str) -> List[str]:
+    """'pkg/sub/mod.py' -> ['pkg', 'sub', 'mod'], 'pkg/__init__.py' -> ['pkg']"""
+    parts = rel_path[:-3].replace(os.sep, '/').split('/')
+    if parts[-1] == '__init__':
+        parts.pop()
+    return parts
+
+
+class ImportGraph:
+    """
+    Import-Abhängigkeiten der Python-Dateien eines Projekts.
+
+    Module werden über ihren Pfad ab dem Arbeitsverzeichnis aufgelöst, bei
+    fehlendem Treffer auch über kürzere Pfad-Endungen (src-Layouts,
+    sys.path-Manipulation in Tests). Im Zweifel hängt eine Datei von
+    mehreren Kandidaten ab - lieber einen Test zu viel als zu wenig.
+    """
+
+    def __init__(self, hashes: Dict[str, str], imports: Dict[str, List[Tuple[int, str, List[str]]]]):
+        self.hashes = hashes
+        # Modulname -> (Anzahl weggelassener Pfad-Teile, Dateien)
+        self._modules: Dict[str, Tuple[int, Set[str]]] = {}
+        for rel_path in hashes:
+            parts = _module_parts(rel_path)
+            for skipped in range(len(parts)):
+                name = '.'.join(parts[skipped:])
+                known = self._modules.get(name)
+                if known is None or skipped < known[0]:
+                    self._modules[name] = (skipped, {rel_path})
+                elif skipped == known[0]:
+                    known[1].add(rel_path)
+        self.edges: Dict[str, Set[str]] = {rel_path: self._resolve(rel_path, file_imports)
+                                           for rel_path, file_imports in imports.items()}
+
+    def _lookup(self, name: str) -> Set[str]:
+        found = self._modules.get(name)
+        return found[1] if found else set()
+
+    def _resolve(self, rel_path: str, imports: List[Tuple[int, str, List[str]]]) -> Set[str]:
+        deps: Set[str] = set()
+        for level, module, names in imports:
+            if level:
+                # Relativer Import: Paket der Datei, level-1 Ebenen höher
+                package = _module_parts(rel_path)
+                if not rel_path.endswith('__init__.py'):
+                    package = package[:-1]
+                package = package[:len(package) - (level - 1)] if level > 1 else package
+                module = '.'.join(package + ([module] if module else []))
+            if not module:
+                continue
+            # Auch die übergeordneten Pakete werden beim Import ausgeführt
+            parts = module.split('.')
+            for end in range(1, len(parts) + 1):
+                deps |= self._lookup('.'.join(parts[:end]))
+            for name in names:
+                deps |= self._lookup(f"{module}.{name}")
+        deps.discard(rel_path)
+        return deps
+
+    def dependencies(self, rel_path: str) -> Set[str]:
+        """Transitive Abhängigkeiten einer Datei (inklusive der Datei selbst)"""
+        seen = {rel_path}
+        stack = [rel_path]
+        while stack:
+            for dep in self.edges.get(stack.pop(), ()):
+                if dep not in seen:
+                    seen.add(dep)
+                    stack.append(dep)
+        return seen
+
+
+def _read_source(work_dir: str, rel_path: str, overlay: Optional[OverlayFS]) -> Optional[str]:
+    try:
+        if overlay is not None:
+            return overlay.read_text(rel_path)
+        with open(os.path.join(work_dir, rel_path), encoding='utf-8', errors='replace', newline='') as f:
+            return f.read()
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+# Content-Hash -> Imports (pro Prozess, spart bei wiederholten Testläufen den Disk-Cache)
+_imports_memo: Dict[str, List[Tuple[int, str, List[str]]]] = {}
+
+
+def build_import_graph(work_dir: str, overlay: Optional[OverlayFS] = None,
+                       cache: Optional[LRUDiskCache] = None) -> ImportGraph:
+    """
+    Baut den Import-Graphen aller (nicht ignorierten) Python-Dateien.
+
+    Die Imports einer Datei werden über ihren Content-Hash gecacht; ein
+    aktives Overlay (noch nicht geschriebene Änderungen) wird berücksichtigt.
+    """
+    paths = [walked.path for walked in walk_files(work_dir, get_project_matcher(work_dir),
+                                                  file_filter=lambda name: name.endswith('.py'))]
+    if overlay is not None:
+        paths = [path for path in overlay.merge_listing(paths) if path.endswith('.py')]
+
+    hashes: Dict[str, str] = {}
+    imports: Dict[str, List[Tuple[int, str, List[str]]]] = {}
+    for rel_path in paths:
+        source = _read_source(work_dir, rel_path, overlay)
+        if source is None:
+            continue
+        digest = hash_content(source.encode('utf-8', errors='replace'))
+        hashes[rel_path] = digest
+        if digest in _imports_memo:
+            imports[rel_path] = _imports_memo[digest]
+            continue
+        key = make_key('imports', str(TEST_CACHE_VERSION), digest)
+        cached = cache.get(key) if cache is not None else None
+        if cached is not None:
+            imports[rel_path] = [tuple(item) for item in json.loads(cached)]
+        else:
+            imports[rel_path] = parse_imports(source)
+            if cache is not None:
+                cache.set(key, json.dumps(imports[rel_path]))
+        _imports_memo[digest] = imports[rel_path]
+    return ImportGraph(hashes, imports)
+
+
+# (Pfad, Größe, mtime) -> Content-Hash (pro Prozess)
+_data_hash_memo: Dict[Tuple[str, int, float], str] = {}
+
+
+def _data_file_hashes(work_dir: str, overlay: Optional[OverlayFS] = None) -> Dict[str, str]:
+    """
+    Fingerprints aller (nicht ignorierten) Nicht-Python-Dateien - Testdaten,
+    Fixtures, Vorlagen. Tests lesen sie zur Laufzeit, der Import-Graph kennt
+    sie nicht.
+    """
+    walked = {entry.path: entry for entry in walk_files(work_dir, get_project_matcher(work_dir),
+                                                       file_filter=lambda name: not name.endswith('.py'))}
+    paths = overlay.merge_listing(walked) if overlay is not None else sorted(walked)
+
+    hashes = {}
+    for rel_path in paths:
+        if rel_path.endswith('.py'):
+            continue
+        if overlay is not None and overlay.has(rel_path):
+            hashes[rel_path] = hash_content(overlay.read_text(rel_path).encode('utf-8', errors='replace'))
+            continue
+        entry = walked.get(rel_path)
+        if entry is None:
+            continue
+        if entry.size > DATA_HASH_MAX_BYTES:
+            hashes[rel_path] = f"{entry.size}:{entry.mtime}"
+            continue
+        memo_key = (rel_path, entry.size, entry.mtime)
+        digest = _data_hash_memo.get(memo_key)
+        if digest is None:
+            try:
+                with open(os.path.join(work_dir, rel_path), 'rb') as f:
+                    digest = hash_content(f.read())
+            except OSError:
+                continue
+            _data_hash_memo[memo_key] = digest
+        hashes[rel_path] = digest
+    return hashes
+
+
+def _in_dir(rel_path: str, rel_dir: str) -> bool:
+    return not rel_dir or rel_path.startswith(rel_dir + os.sep)
+
+
+class FileTestResult(NamedTuple):
+    """Ergebnis einer Testdatei"""
+    path: str
+    passed: int
+    failed: int
+    skipped: int
+    failures: List[Tuple[str, str]]   # (Test-ID, Meldung)
+    seconds: float
+    cached: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.failed == 0
+
+
+class RunTestsSummary(NamedTuple):
+    """Ergebnis eines Aufrufs von run_tests"""
+    total_test_files: int
+    results: List[FileTestResult]
+    seconds: float
+
+
+def _short_message(message: str, max_lines: int = 3, max_chars: int = 300) -> str:
+    lines = [line.rstrip() for line in message.strip().splitlines() if line.strip()]
+    # Bei Tracebacks sind die "E   "-Zeilen von pytest die aussagekräftigen
+    error_lines = [line[1:].strip() for line in lines if line.startswith('E ')]
+    text = '\n'.join((error_lines or lines)[:max_lines])
+    return text if len(text) <= max_chars else text[:max_chars - 1] + '…'
+
+
+def _parse_junit(xml_path: str, test_files: Iterable[str]) -> Dict[str, FileTestResult]:
+    counts: Dict[str, List] = {path: [0, 0, 0, []] for path in test_files}
+    root = ET.parse(xml_path).getroot()
+    for case in root.iter('testcase'):
+        rel_path = os.path.normpath(case.get('file') or '')
+        entry = counts.get(rel_path)
+        if entry is None:
+            continue
+        problem = case.find('failure')
+        if problem is None:
+            problem = case.find('error')
+        if problem is not None:
+            entry[1] += 1
+            name = case.get('name', '')
+            test_id = rel_path if not case.get('classname') else f"{rel_path}::{name}"
+            entry[3].append((test_id, _short_message(problem.get('message', '') + '\n' + (problem.text or ''))))
+        elif case.find('skipped') is not None:
+            entry[2] += 1
+        else:
+            entry[0] += 1
+    return {path: FileTestResult(path, passed, failed, skipped, failures, 0.0)
+            for path, (passed, failed, skipped, failures) in counts.items()}
+
+
+def _run_pytest(cwd: str, test_files: List[str], timeout: int) -> Dict[str, FileTestResult]:
+    """Ein pytest-Prozess für einige Testdateien"""
+    start = time.perf_counter()
+    fd, xml_path = tempfile.mkstemp(prefix='agents-junit-', suffix='.xml')
+    os.close(fd)
+    try:
+        command = [sys.executable, '-m', 'pytest', '-q', '-p', 'no:cacheprovider', '--rootdir', '.',
+                   '--continue-on-collection-errors', '-o', 'junit_family=xunit1',
+                   f'--junitxml={xml_path}', *test_files]
+        env = dict(os.environ, PYTHONDONTWRITEBYTECODE='1')
+        try:
+            completed = subprocess.run(command, cwd=cwd, env=env, capture_output=True,
+                                       text=True, errors='replace', timeout=timeout)
+        except subprocess.TimeoutExpired:
+            seconds = time.perf_counter() - start
+            return {path: FileTestResult(path, 0, 1, 0, [(path, f"Zeitlimit von {timeout}s überschritten")], seconds)
+                    for path in test_files}
+        seconds = time.perf_counter() - start
+        try:
+            results = _parse_junit(xml_path, test_files)
+        except ET.ParseError:
+            # Kein Bericht - pytest fehlt oder ist abgestürzt
+            output = (completed.stderr or completed.stdout or '').strip()
+            raise RuntimeError(_short_message(output, max_lines=5) or f"pytest beendet mit Code {completed.returncode}")
+        return {path: result._replace(seconds=seconds / len(test_files)) for path, result in results.items()}
+    finally:
+        try:
+            os.unlink(xml_path)
+        except OSError:
+            pass
+
+
+def _shadow_tree(work_dir: str, overlay: OverlayFS, target: str) -> None:
+    """
+    Spiegelt das Arbeitsverzeichnis samt Overlay-Änderungen nach target.
+
+    Unveränderte Dateien werden hart verlinkt (sonst kopiert) - so sehen
+    die Tests den Stand der Agents, ohne dass etwas auf der Platte landet.
+    """
+    paths = [walked.path for walked in walk_files(work_dir, get_project_matcher(work_dir))]
+    for rel_path in overlay.merge_listing(paths):
+        destination = os.path.join(target, rel_path)
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        if overlay.has(rel_path):
+            with open(destination, 'w', encoding='utf-8', newline='') as f:
+                f.write(overlay.read_text(rel_path))
+            continue
+        source = os.path.join(work_dir, rel_path)
+        try:
+            os.link(source, destination)
+        except OSError:
+            shutil.copy2(source, destination)
+
+
+def get_test_cache(work_dir: str) -> LRUDiskCache:
+    """Cache für Testergebnisse und Imports (.agents_cache/tests.sqlite)"""
+    return LRUDiskCache(get_cache_dir(work_dir) / TEST_CACHE_FILE, max_entries=TEST_CACHE_ENTRIES)
+
+
+def run_tests(work_dir: str, changed_files: Optional[List[str]] = None,
+              tests: Optional[List[str]] = None, use_cache: bool = True,
+              workers: int = TEST_WORKERS, timeout: int = TEST_TIMEOUT) -> RunTestsSummary:
+    """
+    Führt die betroffenen Tests eines Projekts aus.
+
+    1. Import-Graph aller Python-Dateien bauen (Overlay-Stand, falls aktiv)
+    2. Testdateien wählen: alle (bzw. unter tests), bei changed_files nur
+       die, die eine der Dateien direkt oder indirekt importieren
+    3. Pro Testdatei einen Schlüssel aus den Hashes der Testdatei, ihrer
+       Abhängigkeiten, der conftest.py-Dateien, der pytest-Konfiguration
+       und aller Nicht-Python-Dateien im Ordner der Testdatei (samt
+       Unterordnern; Testdaten) bilden - bekannte Schlüssel liefern das
+       gespeicherte Ergebnis
+    4. Den Rest auf workers pytest-Prozesse verteilen
+
+    Args:
+        work_dir: Arbeitsverzeichnis
+        changed_files: Optional, geänderte Dateien relativ zu work_dir
+        tests: Optional, Testdateien oder Ordner relativ zu work_dir
+        use_cache: False = gespeicherte Ergebnisse ignorieren
+        workers: Anzahl paralleler pytest-Prozesse
+        timeout: Zeitlimit pro Prozess in Sekunden
+
+    Raises:
+        RuntimeError: pytest konnte nicht ausgeführt werden
+    """
+    start = time.perf_counter()
+    overlay = get_overlay(work_dir)
+    if overlay is not None and not overlay.pending_changes():
+        overlay = None
+    cache = get_test_cache(work_dir)
+    graph = build_import_graph(work_dir, overlay, cache)
+
+    test_files = sorted(path for path in graph.hashes if is_test_file(path))
+    if tests:
+        prefixes = [os.path.normpath(path) for path in tests]
+        test_files = [path for path in test_files
+                      if any(path == prefix or path.startswith(prefix + os.sep) or prefix == '.'
+                             for prefix in prefixes)]
+    total = len(test_files)
+
+    config_hashes = []
+    for name in PYTEST_CONFIG_FILES:
+        source = _read_source(work_dir, name, overlay)
+        if source is not None:
+            config_hashes.append(f"{name}:{hash_content(source.encode('utf-8', errors='replace'))}")
+
+    dependencies = {}
+    for path in test_files:
+        deps = graph.dependencies(path)
+        # conftest.py der Ordner über der Testdatei (samt deren Imports)
+        parts = os.path.dirname(path).split(os.sep) if os.path.dirname(path) else []
+        for depth in range(len(parts) + 1):
+            conftest = os.path.join(*parts[:depth], 'conftest.py') if depth else 'conftest.py'
+            if conftest in graph.hashes:
+                deps |= graph.dependencies(conftest)
+        dependencies[path] = deps
+
+    data_hashes = _data_file_hashes(work_dir, overlay) if test_files else {}
+    data_files = {path: {data for data in data_hashes if _in_dir(data, os.path.dirname(path))}
+                  for path in test_files}
+
+    if changed_files:
+        changed = {os.path.normpath(path) for path in changed_files}
+        if not changed & set(PYTEST_CONFIG_FILES):
+            test_files = [path for path in test_files if (dependencies[path] | data_files[path]) & changed]
+
+    keys = {path: make_key('result', str(TEST_CACHE_VERSION), sys.version, *config_hashes,
+                           *sorted(f"{dep}:{graph.hashes[dep]}" for dep in dependencies[path]),
+                           *sorted(f"{data}:{data_hashes[data]}" for data in data_files[path]))
+            for path in test_files}
+
+    results: Dict[str, FileTestResult] = {}
+    pending = []
+    for path in test_files:
+        cached = cache.get(keys[path]) if use_cache else None
+        if cached is not None:
+            data = json.loads(cached)
+            results[path] = FileTestResult(path, data['passed'], data['failed'], data['skipped'],
+                                           [tuple(item) for item in data['failures']], 0.0, cached=True)
+        else:
+            pending.append(path)
+
+    if pending:
+        with tempfile.TemporaryDirectory(prefix='agents-tests-') as shadow:
+            cwd = work_dir
+            if overlay is not None:
+                _shadow_tree(work_dir, overlay, shadow)
+                cwd = shadow
+            workers = max(1, min(workers, len(pending)))
+            chunks = [pending[index::workers] for index in range(workers)]
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for chunk_results in pool.map(lambda chunk: _run_pytest(cwd, chunk, timeout), chunks):
+                    results.update(chunk_results)
+
+        for path in pending:
+            result = results[path]
+            timed_out = any('Zeitlimit' in message for _, message in result.failures)
+            if not timed_out:
+                cache.set(keys[path], json.dumps({'passed': result.passed, 'failed': result.failed,
+                                                  'skipped': result.skipped, 'failures': result.failures}))
+
+    return RunTestsSummary(total, [results[path] for path in test_files], time.perf_counter() - start)
+
+
+def format_summary(summary: RunTestsSummary, max_failures: int = 20) -> str:
+    """Kompakte Zusammenfassung statt des pytest-Logs"""
+    results = summary.results
+    if not results:
+        if summary.total_test_files == 0:
+            return "🧪 Keine Testdateien gefunden (test_*.py oder *_test.py)"
+        return f"🧪 Keine der {summary.total_test_files} Testdateien ist von den Änderungen betroffen"
+
+    executed = sum(1 for result in results if not result.cached)
+    passed = sum(result.passed for result in results)
+    failed = sum(result.failed for result in results)
+    skipped = sum(result.skipped for result in results)
+    output = (f"🧪 {len(results)} von {summary.total_test_files} Testdateien "
+              f"({executed} ausgeführt, {len(results) - executed} aus Cache) - "
+              f"{passed} bestanden, {failed} fehlgeschlagen, {skipped} übersprungen "
+              f"({summary.seconds:.1f}s)")
+    if not failed:
+        return output + "\n✅ Alle Tests bestanden"
+
+    failures = [(test_id, message, result.cached) for result in results for test_id, message in result.failures]
+    lines = [output, ""]
+    for test_id, message, cached in failures[:max_failures]:
+        lines.append(f"❌ {test_id}{' (aus Cache)' if cached else ''}")
+        lines.extend(f"   {line}" for line in message.splitlines())
+    if len(failures) > max_failures:
+        lines.append(f"\n⚠️  {len(failures) - max_failures} weitere Fehlschläge nicht angezeigt")
+    return '\n'.join(lines)
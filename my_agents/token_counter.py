@@ -0,0 +1,159 @@
+"""Austauschbare, offline nutzbare Token-Zähler"""
+
+import hashlib
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Optional
+
+
+# Download-Adresse der tiktoken-Encodings (bestimmt den Dateinamen im lokalen Cache)
+TIKTOKEN_ENCODING_URL = 'https://openaipublic.blob.core.windows.net/encodings/{}.tiktoken'
+DEFAULT_TIKTOKEN_ENCODING = 'o200k_base'
+
+
+class TokenCounter(ABC):
+    """
+    Basisklasse für Token-Zähler.
+
+    `name` identifiziert den Zähler im Scan-Cache: Token-Anzahlen werden
+    pro (Content-Hash, Zähler-Name) gespeichert.
+    """
+    name: str = 'base'
+
+    @abstractmethod
+    def count(self, text: str) -> int:
+        """Zählt die Tokens eines Texts"""
+
+    def count_bytes(self, data: bytes) -> int:
+        """Zählt Tokens eines rohen Dateiinhalts (UTF-8)"""
+        return self.count(data.decode('utf-8', errors='ignore'))
+
+
+class HeuristicTokenCounter(TokenCounter):
+    """Klassische Heuristik: 1 Token ≈ 4 Zeichen"""
+    name = 'heuristic'
+
+    def count(self, text: str) -> int:
+        return len(text) // 4
+
+
+def _class_table(classify) -> bytes:
+    """Übersetzungstabelle Byte → Klassen-Byte für bytes.translate"""
+    return bytes(ord(classify(chr(i))) if i < 128 else ord('x') for i in range(256))
+
+
+class CharClassTokenCounter(TokenCounter):
+    """
+    Offline-Näherung an BPE-Tokenizer ohne Vokabular.
+
+    Zählt wie die Vor-Zerlegung der GPT-Tokenizer Läufe von Wörtern
+    (camelCase getrennt), Zahlen, Satzzeichen und Whitespace sowie
+    Nicht-ASCII-Bytes. Minifizierter Code, JSON und nicht-englischer Text
+    werden so deutlich genauer gezählt als mit Zeichen / 4.
+
+    Arbeitet nur mit bytes.translate/bytes.count (C-Geschwindigkeit),
+    daher nur wenige Male langsamer als die Heuristik.
+    """
+    name = 'charclass-v2'
+
+    _LETTERS = _class_table(lambda c: 'a' if c.islower() and c.isalpha() else 'U' if c.isupper() else 'x')
+    _DIGITS = _class_table(lambda c: 'd' if c.isdigit() else 'x')
+    # 'b' = Leerzeichen/Tab, 'n' = Zeilenumbruch
+    _SPACES = _class_table(lambda c: 'n' if c in '\r\n' else 'b' if c in ' \t\x0b\x0c' else 'x')
+    _PUNCT = _class_table(lambda c: 'x' if c.isalnum() or c in ' \t\r\n\x0b\x0c' else 'p')
+    _ASCII = bytes(range(128))
+
+    def count(self, text: str) -> int:
+        return self.count_bytes(text.encode('utf-8'))
+
+    def count_bytes(self, data: bytes) -> int:
+        # Eigene Klasse für den Anfang, damit auch Läufe am Dateianfang einen Übergang haben
+        spaces = b'x' + data.translate(self._SPACES)
+        # Ein einzelnes Leerzeichen verschmilzt mit dem folgenden Wort bzw. Satzzeichen;
+        # nur längere Läufe (Einrückung) und Zeilenumbrüche sind eigene Tokens
+        runs = spaces.count(b'xb') + spaces.count(b'xn')
+        single_spaces = spaces.count(b'xb') - spaces.count(b'xbb') - spaces.count(b'xbn')
+        space_runs = runs - single_spaces
+
+        # Führender Leerschritt, damit auch Wörter am Dateianfang einen Übergang haben
+        data = b' ' + data
+
+        letters = data.translate(self._LETTERS)
+        words = letters.count(b'xa') + letters.count(b'xU') + letters.count(b'aU')
+
+        digits = data.translate(self._DIGITS)
+        digit_runs = digits.count(b'xd')
+        # Zahlen werden in Gruppen zu bis zu 3 Ziffern tokenisiert
+        numbers = (digits.count(b'd') + 2 * digit_runs) // 3
+
+        punct = data.translate(self._PUNCT)
+        # Satzzeichen-Läufe wie '"},' oder '=>' ≈ 1 Token pro 2 Zeichen
+        symbols = (punct.count(b'p') + punct.count(b'xp')) // 2
+
+        # Nicht-ASCII ≈ 1 Token pro 3 UTF-8 Bytes (CJK ≈ 1 Token pro Zeichen)
+        non_ascii = len(data.translate(None, self._ASCII)) // 3
+
+        return words + numbers + space_runs + symbols + non_ascii
+
+
+class TiktokenCounter(TokenCounter):
+    """Exakte Zählung mit tiktoken (optional, Encoding muss lokal verfügbar sein)"""
+
+    def __init__(self, encoding_name: str = DEFAULT_TIKTOKEN_ENCODING):
+        import tiktoken
+        self._encoding = tiktoken.get_encoding(encoding_name)
+        self.name = f'tiktoken-{encoding_name}'
+
+    def count(self, text: str) -> int:
+        return len(self._encoding.encode(text, disallowed_special=()))
+
+
+def tiktoken_encoding_cached(encoding_name: str = DEFAULT_TIKTOKEN_ENCODING) -> bool:
+    """
+    Prüft ohne Netzwerkzugriff, ob tiktoken installiert ist und das Encoding
+    im lokalen Cache liegt (TIKTOKEN_CACHE_DIR, DATA_GYM_CACHE_DIR oder
+    <tmp>/data-gym-cache - wie tiktoken.load.read_file_cached).
+    """
+    try:
+        import tiktoken  # noqa: F401
+    except ImportError:
+        return False
+    cache_dir = os.getenv('TIKTOKEN_CACHE_DIR') or os.getenv('DATA_GYM_CACHE_DIR') \
+        or os.path.join(tempfile.gettempdir(), 'data-gym-cache')
+    cache_key = hashlib.sha1(TIKTOKEN_ENCODING_URL.format(encoding_name).encode()).hexdigest()
+    return os.path.exists(os.path.join(cache_dir, cache_key))
+
+
+@lru_cache(maxsize=None)
+def get_token_counter(name: Optional[str] = None) -> TokenCounter:
+    """
+    Liefert den konfigurierten Token-Zähler.
+
+    Args:
+        name: 'auto', 'tiktoken', 'charclass' oder 'heuristic'
+              (Standard: AGENTS_TOKENIZER oder 'auto')
+
+    'auto' nutzt tiktoken nur wenn es installiert ist und das Encoding bereits
+    lokal vorliegt, sonst sofort die Zeichenklassen-Näherung - ohne
+    Netzwerkzugriff. 'tiktoken' lädt das Encoding bei Bedarf herunter.
+    """
+    name = name or os.getenv('AGENTS_TOKENIZER', 'auto')
+
+    if name == 'heuristic':
+        return HeuristicTokenCounter()
+    if name == 'charclass':
+        return CharClassTokenCounter()
+    if name == 'tiktoken':
+        return TiktokenCounter()
+    if name == 'auto':
+        if tiktoken_encoding_cached():
+            try:
+                return TiktokenCounter()
+            except Exception:
+                # Encoding nicht lesbar - lieber Näherung als Abbruch
+                pass
+        return CharClassTokenCounter()
+
+    raise ValueError(f"Unbekannter Token-Zähler: {name} (erlaubt: auto, tiktoken, charclass, heuristic)")
@@ -0,0 +1,204 @@
+"""Memoisierung lesender Tools über alle Agents eines Crew-Laufs"""
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from crewai.tools import BaseTool
+from pydantic import Field
+
+
+# AGENTS_TOOL_MEMO=0 schaltet die Memoisierung ab
+TOOL_MEMO_ENABLED = os.getenv('AGENTS_TOOL_MEMO', '1') != '0'
+
+# Maximale Anzahl gemerkter Ergebnisse (LRU)
+TOOL_MEMO_ENTRIES = int(os.getenv('AGENTS_TOOL_MEMO_ENTRIES', '1024'))
+
+
+class MemoEntry(NamedTuple):
+    """Ein gemerktes Tool-Ergebnis"""
+    serial: int              # Eindeutig pro Berechnung - ändert sich nach Invalidierung
+    result: str
+    scope_path: Optional[str]  # Abhängiger Pfad relativ zu work_dir, None = ganzes Projekt
+
+
+class ToolResultCache:
+    """
+    Ergebnisse lesender Tools, geteilt von allen Agents (pro Prozess).
+
+    Schlüssel: (work_dir, Tool-Name, Argumente). Schreib- und Löschzugriffe
+    der Tools invalidieren alle Einträge, deren Pfad die geänderte Datei
+    enthält (Datei selbst oder ein übergeordneter Ordner) sowie alle
+    projektweiten Einträge (Suche, Grep). Thread-sicher.
+    """
+
+    def __init__(self, max_entries: int = TOOL_MEMO_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[Tuple[str, str, str], MemoEntry]' = OrderedDict()
+        self._serial = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[str, str, str]) -> Optional[MemoEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: Tuple[str, str, str], result: str, scope_path: Optional[str]) -> MemoEntry:
+        with self._lock:
+            self._serial += 1
+            entry = MemoEntry(self._serial, result, scope_path)
+            self._entries[key] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return entry
+
+    def invalidate(self, work_dir: str, rel_path: str) -> int:
+        """
+        Verwirft alle Einträge, die von rel_path abhängen.
+
+        Returns:
+            Anzahl verworfener Einträge
+        """
+        work_dir = _work_dir_key(work_dir)
+        rel_path = os.path.normpath(rel_path)
+        with self._lock:
+            stale = [key for key, entry in self._entries.items()
+                     if key[0] == work_dir and _affects(entry.scope_path, rel_path)]
+            for key in stale:
+                del self._entries[key]
+            return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def _work_dir_key(work_dir: str) -> str:
+    """Einheitlicher Schlüssel für work_dir - Symlinks aufgelöst wie in den schreibenden Tools"""
+    return str(Path(work_dir).resolve())
+
+
+def _affects(scope_path: Optional[str], changed: str) -> bool:
+    """Hängt ein Ergebnis für scope_path von der geänderten Datei ab?"""
+    if scope_path is None or scope_path == '.':
+        return True
+    return changed == scope_path or changed.startswith(scope_path + os.sep)
+
+
+_cache = ToolResultCache()
+
+
+def get_tool_cache() -> ToolResultCache:
+    """Der (pro Prozess geteilte) Ergebnis-Cache"""
+    return _cache
+
+
+def invalidate_tool_results(work_dir: str, rel_path: str) -> None:
+    """Meldet eine geschriebene/gelöschte Datei (von den schreibenden Tools aufgerufen)"""
+    _cache.invalidate(work_dir, rel_path)
+
+
+_last_call = threading.local()
+
+
+def last_call_cached() -> bool:
+    """Kam das Ergebnis des letzten memoisierten Aufrufs in diesem Thread aus dem Cache? (setzt zurück)"""
+    cached = getattr(_last_call, 'cached', False)
+    _last_call.cached = False
+    return cached
+
+
+def _never_cache(_args: Any = None, _result: Any = None) -> bool:
+    # CrewAIs eigener Tool-Cache kennt keine Invalidierung - wir memoisieren selbst
+    return False
+
+
+class MemoScope:
+    """
+    Was ein Agent bereits gesehen hat.
+
+    Fragt ein Agent ein unverändertes Ergebnis erneut an, bekommt er nur
+    einen kurzen Verweis. Fragt er direkt danach noch einmal, erhält er das
+    vollständige Ergebnis (z.B. wenn es aus seinem Kontext gefallen ist).
+    """
+
+    def __init__(self):
+        self._seen: Dict[Tuple[str, str, str], int] = {}
+        self._referenced: Dict[Tuple[str, str, str], int] = {}
+        self._lock = threading.Lock()
+
+    def call(self, tool: BaseTool, kwargs: Dict[str, Any]) -> str:
+        work_dir = _work_dir_key(getattr(tool, 'work_dir', '.'))
+        arguments = json.dumps(kwargs, sort_keys=True, default=str, ensure_ascii=False)
+        key = (work_dir, tool.name, arguments)
+
+        entry = _cache.get(key)
+        _last_call.cached = entry is not None
+        if entry is None:
+            result = tool._run(**kwargs)
+            if not isinstance(result, str) or result.startswith('❌'):
+                # Fehler nicht merken - der nächste Versuch soll neu ausführen
+                return result
+            entry = _cache.put(key, result, _scope_path(tool, kwargs))
+
+        with self._lock:
+            if self._seen.get(key) == entry.serial and self._referenced.get(key) != entry.serial:
+                self._referenced[key] = entry.serial
+                return (f"♻️  Unverändert seit deinem letzten Aufruf von \"{tool.name}\" ({_describe(kwargs)}) - "
+                        f"siehe dein vorheriges Ergebnis. Erneut aufrufen, um es vollständig zu erhalten.")
+            self._seen[key] = entry.serial
+            self._referenced.pop(key, None)
+        return entry.result
+
+
+def _scope_path(tool: BaseTool, kwargs: Dict[str, Any]) -> Optional[str]:
+    """Pfad, von dem das Ergebnis abhängt (über memo_path_arg des Tools)"""
+    arg = getattr(tool, 'memo_path_arg', None)
+    if arg is None:
+        return None
+    return os.path.normpath(str(kwargs.get(arg) or '.'))
+
+
+def _describe(kwargs: Dict[str, Any]) -> str:
+    text = ', '.join(f"{name}={value!r}" for name, value in kwargs.items() if value is not None)
+    return text if len(text) <= 120 else text[:119] + '…'
+
+
+class MemoizedTool(BaseTool):
+    """Hülle um ein lesendes Tool: gleiche Schnittstelle, Ergebnisse über ToolResultCache"""
+    tool: BaseTool = Field(description="Das eigentliche Tool")
+    scope: Any = Field(description="MemoScope des Agents")
+    cache_function: Any = _never_cache
+
+    def _run(self, **kwargs: Any) -> str:
+        return self.scope.call(self.tool, kwargs)
+
+
+def memoize_tools(tools: List[BaseTool]) -> List[BaseTool]:
+    """
+    Tool-Liste für einen Agent: lesende Tools (mit memo_path_arg-Attribut)
+    werden über den geteilten Cache memoisiert, alle anderen unverändert
+    übernommen. Jeder Aufruf erzeugt einen eigenen MemoScope - daher pro
+    Agent einmal aufrufen.
+    """
+    if not TOOL_MEMO_ENABLED:
+        return list(tools)
+    scope = MemoScope()
+    wrapped = []
+    for tool in tools:
+        if hasattr(type(tool), 'memo_path_arg'):
+            wrapped.append(MemoizedTool(name=tool.name, description=tool.description,
+                                        args_schema=tool.args_schema, tool=tool, scope=scope))
+        else:
+            wrapped.append(tool)
+    return wrapped
@@ -0,0 +1,250 @@
+"""Messung der Tool-Aufrufe eines Laufs: Laufzeit, Bytes, Cache-Treffer pro Agent und Task"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple
+
+from crewai.tools import BaseTool
+from pydantic import Field
+
+from my_agents.scan_cache import get_cache_dir
+from my_agents.tool_memo import last_call_cached
+
+
+# AGENTS_TOOL_METRICS=0 schaltet die Messung ab
+TOOL_METRICS_ENABLED = os.getenv('AGENTS_TOOL_METRICS', '1') != '0'
+
+# Unterordner von .agents_cache/ für die JSON-Berichte
+REPORTS_DIR_NAME = 'reports'
+
+# Agent-Tools ohne Task-Bezug (Aufrufe über Delegation)
+DELEGATED_TASK = 'delegiert'
+
+
+class ToolCallRecord(NamedTuple):
+    """Ein einzelner Tool-Aufruf"""
+    agent: str
+    task: str
+    tool: str
+    seconds: float
+    input_bytes: int
+    output_bytes: int
+    cache_hit: bool
+    error: bool
+
+
+class ToolStats:
+    """Summen für eine Gruppe von Aufrufen (z.B. Agent + Tool)"""
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.input_bytes = 0
+        self.output_bytes = 0
+        self.cache_hits = 0
+        self.errors = 0
+
+    def add(self, record: ToolCallRecord) -> None:
+        self.calls += 1
+        self.seconds += record.seconds
+        self.input_bytes += record.input_bytes
+        self.output_bytes += record.output_bytes
+        self.cache_hits += record.cache_hit
+        self.errors += record.error
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'calls': self.calls,
+            'seconds': round(self.seconds, 4),
+            'avg_ms': round(self.seconds * 1000 / self.calls, 2) if self.calls else 0.0,
+            'input_bytes': self.input_bytes,
+            'output_bytes': self.output_bytes,
+            'cache_hits': self.cache_hits,
+            'errors': self.errors,
+        }
+
+
+class ToolMetrics:
+    """Alle Tool-Aufrufe dieses Laufs (pro Prozess). Thread-sicher."""
+
+    def __init__(self):
+        self.started_at = datetime.now()
+        self._records: List[ToolCallRecord] = []
+        self._lock = threading.Lock()
+
+    def record(self, record: ToolCallRecord) -> None:
+        with self._lock:
+            self._records.append(record)
+
+    def records(self) -> List[ToolCallRecord]:
+        with self._lock:
+            return list(self._records)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._records.clear()
+            self.started_at = datetime.now()
+
+    def by_agent_and_tool(self) -> 'OrderedDict[tuple, ToolStats]':
+        """Summen pro (Agent, Tool), absteigend nach Gesamtzeit"""
+        groups: Dict[tuple, ToolStats] = {}
+        for record in self.records():
+            groups.setdefault((record.agent, record.tool), ToolStats()).add(record)
+        return OrderedDict(sorted(groups.items(), key=lambda item: item[1].seconds, reverse=True))
+
+    def format_table(self) -> str:
+        """Übersicht als Text-Tabelle (für das Ende von cli.main)"""
+        groups = self.by_agent_and_tool()
+        if not groups:
+            return "   (keine Tool-Aufrufe)"
+        header = ('Agent', 'Tool', 'Aufrufe', 'Zeit s', 'Ø ms', 'In KB', 'Out KB', 'Cache', 'Fehler')
+        rows = [header]
+        total = ToolStats()
+        for (agent, tool), stats in groups.items():
+            rows.append(_table_row(agent, tool, stats))
+        for record in self.records():
+            total.add(record)
+        rows.append(_table_row('Gesamt', '', total))
+
+        widths = [max(len(row[column]) for row in rows) for column in range(len(header))]
+        lines = []
+        for index, row in enumerate(rows):
+            # Namen linksbündig, Zahlen rechtsbündig
+            cells = [cell.ljust(widths[i]) if i < 2 else cell.rjust(widths[i]) for i, cell in enumerate(row)]
+            lines.append('   ' + '  '.join(cells).rstrip())
+            if index == 0 or index == len(rows) - 2:
+                lines.append('   ' + '  '.join('─' * width for width in widths))
+        return '\n'.join(lines)
+
+    def write_report(self, work_dir: str) -> Path:
+        """
+        Schreibt den Bericht als JSON nach .agents_cache/reports/tool_calls-<Zeitstempel>.json
+
+        Returns:
+            Pfad des Berichts
+        """
+        reports_dir = get_cache_dir(work_dir) / REPORTS_DIR_NAME
+        reports_dir.mkdir(exist_ok=True)
+        records = self.records()
+        total = ToolStats()
+        for record in records:
+            total.add(record)
+        report = {
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'finished_at': datetime.now().isoformat(timespec='seconds'),
+            'work_dir': os.path.abspath(work_dir),
+            'total': total.to_dict(),
+            'by_agent_and_tool': [dict(agent=agent, tool=tool, **stats.to_dict())
+                                  for (agent, tool), stats in self.by_agent_and_tool().items()],
+            'calls': [record._asdict() for record in records],
+        }
+        path = reports_dir / f"tool_calls-{self.started_at.strftime('%Y%m%d-%H%M%S')}.json"
+        path.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding='utf-8')
+        return path
+
+
+def _table_row(agent: str, tool: str, stats: ToolStats) -> tuple:
+    return (agent, tool, str(stats.calls), f"{stats.seconds:.2f}",
+            f"{stats.seconds * 1000 / stats.calls:.1f}" if stats.calls else '-',
+            f"{stats.input_bytes / 1024:.1f}", f"{stats.output_bytes / 1024:.1f}",
+            str(stats.cache_hits), str(stats.errors))
+
+
+_metrics = ToolMetrics()
+
+
+def get_tool_metrics() -> ToolMetrics:
+    """Die (pro Prozess geteilte) Messung"""
+    return _metrics
+
+
+class InstrumentedTool(BaseTool):
+    """Hülle um ein Tool: gleiche Schnittstelle, jeder Aufruf wird in ToolMetrics erfasst"""
+    tool: BaseTool = Field(description="Das eigentliche Tool")
+    agent_label: str = Field(description="Rolle des aufrufenden Agents")
+    task_label: str = Field(description="Name der Task")
+
+    def _run(self, **kwargs: Any) -> Any:
+        input_bytes = len(json.dumps(kwargs, default=str, ensure_ascii=False).encode('utf-8'))
+        last_call_cached()
+        start = time.perf_counter()
+        try:
+            result = self.tool._run(**kwargs)
+        except Exception:
+            self._record(time.perf_counter() - start, input_bytes, 0, error=True)
+            raise
+        seconds = time.perf_counter() - start
+        output = result if isinstance(result, str) else str(result)
+        self._record(seconds, input_bytes, len(output.encode('utf-8')), error=output.startswith('❌'))
+        return result
+
+    def _record(self, seconds: float, input_bytes: int, output_bytes: int, error: bool) -> None:
+        _metrics.record(ToolCallRecord(self.agent_label, self.task_label, self.tool.name, seconds,
+                                       input_bytes, output_bytes, last_call_cached(), error))
+
+
+def _instrument(tools: List[BaseTool], agent_label: str, task_label: str) -> List[BaseTool]:
+    wrapped = []
+    for tool in tools:
+        inner = tool.tool if isinstance(tool, InstrumentedTool) else tool
+        wrapped.append(InstrumentedTool(name=inner.name, description=inner.description,
+                                        args_schema=inner.args_schema, cache_function=inner.cache_function,
+                                        tool=inner, agent_label=agent_label, task_label=task_label))
+    return wrapped
+
+
+def _task_label(task: Any) -> str:
+    if getattr(task, 'name', None):
+        return task.name
+    first_line = (task.description or '').strip().split('\n')[0]
+    return first_line if len(first_line) <= 50 else first_line[:49] + '…'
+
+
+def _record_crewai_cache_hit(_source: Any, event: Any) -> None:
+    # Treffer aus CrewAIs eigenem Cache erreichen unsere Hülle nicht - hier nachtragen
+    if getattr(event, 'from_cache', False):
+        _metrics.record(ToolCallRecord(event.agent_role or '?', event.task_name or DELEGATED_TASK,
+                                       event.tool_name, 0.0, 0, len(str(event.output).encode('utf-8')),
+                                       True, False))
+
+
+_listener_registered = False
+
+
+def instrument_crew(crew: Any) -> Any:
+    """
+    Misst alle Tool-Aufrufe einer Crew.
+
+    Jede Task bekommt die Tools ihres Agents (bzw. ihre eigenen) mit
+    Agent- und Task-Namen umhüllt. Die Tools der Agents selbst werden
+    für Aufrufe über Delegation (ohne eigene Task) als "delegiert" erfasst.
+    Mehrfaches Aufrufen umhüllt nicht doppelt.
+
+    Returns:
+        Die Crew (verändert)
+    """
+    global _listener_registered
+    if not TOOL_METRICS_ENABLED:
+        return crew
+
+    for task in crew.tasks:
+        agent = task.agent
+        tools = task.tools or (agent.tools if agent is not None else None)
+        if tools:
+            agent_label = agent.role if agent is not None else '?'
+            task.tools = _instrument(tools, agent_label, _task_label(task))
+
+    for agent in crew.agents:
+        if agent.tools:
+            agent.tools = _instrument(agent.tools, agent.role, DELEGATED_TASK)
+
+    if not _listener_registered:
+        from crewai.events import ToolUsageFinishedEvent, crewai_event_bus
+        crewai_event_bus.on(ToolUsageFinishedEvent)(_record_crewai_cache_hit)
+        _listener_registered = True
+    return crew
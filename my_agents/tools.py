@@ -1,10 +1,36 @@
 """Custom Tools für die Agents"""
 
+import fnmatch
 import os
+import re
 from pathlib import Path
 from crewai.tools import BaseTool
-from typing import Type, Optional
+from typing import ClassVar, Dict, List, Tuple, Type, Optional
 from pydantic import BaseModel, Field
+from my_agents.code_outline import extract_outline, get_outline_cache, outline_file, supports_outline
+from my_agents.code_search import get_search_index, mark_search_dirty
+from my_agents.grep_index import get_grep_index, mark_grep_dirty
+from my_agents.atomic_write import resolve_in_work_dir, write_files_atomic
+from my_agents.file_edit import EditConflict, apply_edits
+from my_agents.file_reader import BinaryFileError, get_read_cache, read_file_range, read_text_range
+from my_agents.fs_walker import walk_files
+from my_agents.ignore_rules import get_project_matcher
+from my_agents.output_budget import TOOL_OUTPUT_TOKENS, format_page, get_result_store, with_output_budget
+from my_agents.overlay_fs import get_overlay
+from my_agents.test_runner import format_summary, run_tests
+from my_agents.tool_memo import invalidate_tool_results
+
+
+def _notify_file_changed(work_dir: str, rel_path: str, on_disk: bool = True) -> None:
+    """
+    Meldet geschriebene/gelöschte Dateien an die gemerkten Tool-Ergebnisse
+    und - falls auf der Platte geändert - an die Such-Indizes und den Lese-Cache
+    """
+    invalidate_tool_results(work_dir, rel_path)
+    if on_disk:
+        mark_search_dirty(work_dir, rel_path)
+        mark_grep_dirty(work_dir, rel_path)
+        get_read_cache().invalidate(os.path.join(work_dir, rel_path))
 
 
 class WriteFileInput(BaseModel):
@@ -32,14 +58,22 @@ class WriteFileTool(BaseTool):
             file_path = (work_dir_path / filename).resolve()
             
             # Prüfe ob Pfad innerhalb work_dir liegt
-            if not str(file_path).startswith(str(work_dir_path)):
+            if work_dir_path not in file_path.parents:
                 return f"❌ Fehler: Dateien dürfen nur im Arbeitsverzeichnis erstellt werden: {work_dir_path}"
             
+            # Copy-on-Write: Während eines Crew-Laufs erst am Ende auf die Platte
+            overlay = get_overlay(str(work_dir_path))
+            if overlay is not None:
+                overlay.write_text(str(file_path.relative_to(work_dir_path)), content)
+                _notify_file_changed(str(work_dir_path), str(file_path.relative_to(work_dir_path)), on_disk=False)
+                return f"✅ Datei erfolgreich gespeichert: {file_path.relative_to(work_dir_path)}"
+            
             # Prüfe ob Unterordner erstellt werden müssen
             file_path.parent.mkdir(parents=True, exist_ok=True)
             
             # Schreibe Datei
             file_path.write_text(content, encoding='utf-8')
+            _notify_file_changed(str(work_dir_path), str(file_path.relative_to(work_dir_path)))
             
             return f"✅ Datei erfolgreich gespeichert: {file_path.relative_to(work_dir_path)}"
             
@@ -47,6 +81,133 @@ class WriteFileTool(BaseTool):
             return f"❌ Fehler beim Schreiben der Datei: {str(e)}"
 
 
+class FileEntry(BaseModel):
+    """Eine Datei für WriteFilesTool"""
+    filename: str = Field(..., description="Dateiname (relativ zum Arbeitsverzeichnis)")
+    content: str = Field(..., description="Dateiinhalt")
+
+
+class WriteFilesInput(BaseModel):
+    """Input für WriteFilesTool"""
+    files: List[FileEntry] = Field(..., description="Liste von Dateien: [{filename, content}, ...]")
+
+
+class WriteFilesTool(BaseTool):
+    name: str = "Write Files"
+    description: str = (
+        "Schreibt mehrere Dateien in einem Aufruf (z.B. ein neues Modul mit Tests und Config). "
+        "Input: files - Liste von {filename, content}. Unterordner werden automatisch erstellt, "
+        "existierende Dateien überschrieben. Alles oder nichts: liegt ein Pfad außerhalb des "
+        "Arbeitsverzeichnisses oder schlägt ein Schreibvorgang fehl, wird keine Datei geändert."
+    )
+    args_schema: Type[BaseModel] = WriteFilesInput
+    work_dir: str = Field(description="Working directory path")
+    
+    def _run(self, files: List[FileEntry]) -> str:
+        """Schreibt alle Dateien atomar"""
+        try:
+            if not files:
+                return "⚠️  Keine Dateien angegeben"
+            entries = [entry if isinstance(entry, FileEntry) else FileEntry(**entry) for entry in files]
+            
+            work_dir_path = str(Path(self.work_dir).resolve())
+            overlay = get_overlay(work_dir_path)
+            if overlay is not None:
+                try:
+                    rel_paths = [str(resolve_in_work_dir(Path(work_dir_path), entry.filename).relative_to(work_dir_path))
+                                 for entry in entries]
+                except ValueError as e:
+                    return f"❌ Fehler: {str(e)} - keine Datei wurde geschrieben"
+                created = sum(1 for rel_path in rel_paths if not overlay.exists(rel_path))
+                for rel_path, entry in zip(rel_paths, entries):
+                    overlay.write_text(rel_path, entry.content)
+                    _notify_file_changed(work_dir_path, rel_path, on_disk=False)
+                return (f"✅ {len(entries)} Dateien gespeichert ({created} neu, {len(entries) - created} überschrieben): "
+                        + ", ".join(rel_paths))
+            
+            try:
+                written = write_files_atomic(self.work_dir, [(entry.filename, entry.content) for entry in entries])
+            except ValueError as e:
+                return f"❌ Fehler: {str(e)} - keine Datei wurde geschrieben"
+            
+            for result in written:
+                _notify_file_changed(work_dir_path, result.path)
+            
+            created = sum(1 for result in written if result.created)
+            return (f"✅ {len(written)} Dateien gespeichert ({created} neu, {len(written) - created} überschrieben): "
+                    + ", ".join(result.path for result in written))
+            
+        except Exception as e:
+            return f"❌ Fehler beim Schreiben der Dateien (keine Datei geändert): {str(e)}"
+
+
+class EditFileInput(BaseModel):
+    """Input für EditFileTool"""
+    filename: str = Field(..., description="Dateiname (relativ zum Arbeitsverzeichnis)")
+    edits: str = Field(..., description="Search/Replace-Blöcke oder ein Unified Diff")
+
+
+class EditFileTool(BaseTool):
+    name: str = "Edit File"
+    description: str = (
+        "Ändert Teile einer existierenden Datei, ohne den ganzen Inhalt neu zu senden. "
+        "Input: filename und edits - entweder ein oder mehrere Blöcke\n"
+        "<<<<<<< SEARCH\n(exakter bisheriger Text, ohne Zeilennummern)\n=======\n(neuer Text)\n>>>>>>> REPLACE\n"
+        "oder ein Unified Diff mit '@@ -zeile,anzahl +zeile,anzahl @@'-Hunks. "
+        "Jeder Suchtext muss genau einmal vorkommen. Entweder werden alle Änderungen "
+        "angewendet oder keine; Konflikte werden mit Zeilennummer gemeldet. "
+        "Bevorzuge dieses Tool gegenüber \"Write File\" für Änderungen an bestehenden Dateien."
+    )
+    args_schema: Type[BaseModel] = EditFileInput
+    work_dir: str = Field(description="Working directory path")
+    
+    def _run(self, filename: str, edits: str) -> str:
+        """Wendet Search/Replace-Blöcke oder einen Unified Diff auf eine Datei an"""
+        try:
+            work_dir_path = Path(self.work_dir).resolve()
+            # Sicherheit: Nur Dateien im work_dir erlauben
+            file_path = (work_dir_path / filename).resolve()
+            
+            # Prüfe ob Pfad innerhalb work_dir liegt
+            if work_dir_path not in file_path.parents:
+                return f"❌ Fehler: Dateien dürfen nur im Arbeitsverzeichnis geändert werden: {work_dir_path}"
+            
+            rel_path = file_path.relative_to(work_dir_path)
+            overlay = get_overlay(str(work_dir_path))
+            if not (overlay.exists(str(rel_path)) if overlay is not None else file_path.is_file()):
+                return f"⚠️  Datei existiert nicht: {filename} - neue Dateien mit \"Write File\" anlegen"
+            
+            if overlay is not None:
+                content = overlay.read_text(str(rel_path))
+            else:
+                with open(file_path, encoding='utf-8', newline='') as f:
+                    content = f.read()
+            
+            try:
+                new_content, count = apply_edits(content, edits)
+            except EditConflict as e:
+                return f"❌ Konflikt in {rel_path}, nichts geändert: {str(e)}"
+            
+            if new_content == content:
+                return f"⚠️  Keine Änderung - der neue Inhalt ist identisch: {rel_path}"
+            
+            if overlay is not None:
+                overlay.write_text(str(rel_path), new_content)
+                _notify_file_changed(str(work_dir_path), str(rel_path), on_disk=False)
+            else:
+                with open(file_path, 'w', encoding='utf-8', newline='') as f:
+                    f.write(new_content)
+                _notify_file_changed(str(work_dir_path), str(rel_path))
+            
+            delta = new_content.count('\n') - content.count('\n')
+            return f"✅ {count} Änderung(en) angewendet: {rel_path} ({delta:+d} Zeilen)"
+            
+        except UnicodeDecodeError:
+            return f"❌ Fehler: Datei ist nicht UTF-8-kodiert und kann nicht bearbeitet werden: {filename}"
+        except Exception as e:
+            return f"❌ Fehler beim Bearbeiten der Datei: {str(e)}"
+
+
 class DeleteFileInput(BaseModel):
     """Input für DeleteFileTool"""
     filename: str = Field(..., description="Dateiname (relativ zum Arbeitsverzeichnis)")
@@ -69,17 +230,417 @@ class DeleteFileTool(BaseTool):
             file_path = (work_dir_path / filename).resolve()
             
             # Prüfe ob Pfad innerhalb work_dir liegt
-            if not str(file_path).startswith(str(work_dir_path)):
+            if work_dir_path not in file_path.parents:
                 return f"❌ Fehler: Dateien dürfen nur im Arbeitsverzeichnis gelöscht werden: {work_dir_path}"
             
             # Prüfe ob Datei existiert
+            overlay = get_overlay(str(work_dir_path))
+            if overlay is not None:
+                if not overlay.exists(str(file_path.relative_to(work_dir_path))):
+                    return f"⚠️  Datei existiert nicht: {file_path.relative_to(work_dir_path)}"
+                overlay.delete(str(file_path.relative_to(work_dir_path)))
+                _notify_file_changed(str(work_dir_path), str(file_path.relative_to(work_dir_path)), on_disk=False)
+                return f"✅ Datei erfolgreich gelöscht: {file_path.relative_to(work_dir_path)}"
+            
             if not file_path.exists():
                 return f"⚠️  Datei existiert nicht: {file_path.relative_to(work_dir_path)}"
             
             # Lösche Datei
             file_path.unlink()
+            _notify_file_changed(str(work_dir_path), str(file_path.relative_to(work_dir_path)))
             
             return f"✅ Datei erfolgreich gelöscht: {file_path.relative_to(work_dir_path)}"
             
         except Exception as e:
             return f"❌ Fehler beim Löschen der Datei: {str(e)}"
+
+
+class ReadFileInput(BaseModel):
+    """Input für ReadFileTool"""
+    filename: str = Field(..., description="Dateiname (relativ zum Arbeitsverzeichnis)")
+    start_line: int = Field(1, description="Erste Zeile (1-basiert, Standard: 1)")
+    end_line: Optional[int] = Field(None, description="Letzte Zeile (inklusive), Standard: bis zum Limit")
+
+
+class ReadFileTool(BaseTool):
+    name: str = "Read File"
+    description: str = (
+        "Liest eine Datei im Arbeitsverzeichnis, optional nur einen Zeilenbereich. "
+        "Input: filename (z.B. 'src/app.py'), start_line und end_line (optional). "
+        "Die Ausgabe ist mit Zeilennummern versehen und begrenzt - bei langen Dateien "
+        "steht am Ende, ab welcher Zeile weitergelesen werden kann. "
+        "Nutze \"File Outline\" oder \"Grep\" um die relevanten Zeilen zu finden."
+    )
+    args_schema: Type[BaseModel] = ReadFileInput
+    work_dir: str = Field(description="Working directory path")
+    # Lesend: Ergebnisse werden memoisiert (siehe tool_memo), abhängig von diesem Pfad-Argument
+    memo_path_arg: ClassVar[Optional[str]] = 'filename'
+    output_budget: int = Field(TOOL_OUTPUT_TOKENS, description="Maximale Tokens pro Ausgabe, darüber seitenweise")
+    max_lines: int = Field(400, description="Maximale Anzahl Zeilen pro Aufruf")
+    max_output_chars: int = Field(12000, description="Maximale Länge der Ausgabe")
+    
+    @with_output_budget
+    def _run(self, filename: str, start_line: int = 1, end_line: Optional[int] = None) -> str:
+        """Liest einen Zeilenbereich über den Lese-Cache"""
+        try:
+            work_dir_path = Path(self.work_dir).resolve()
+            # Sicherheit: Nur Dateien im work_dir erlauben
+            file_path = (work_dir_path / filename).resolve()
+            
+            # Prüfe ob Pfad innerhalb work_dir liegt
+            if work_dir_path not in file_path.parents:
+                return f"❌ Fehler: Nur Dateien im Arbeitsverzeichnis sind erlaubt: {work_dir_path}"
+            
+            rel_path = file_path.relative_to(work_dir_path)
+            overlay = get_overlay(str(work_dir_path))
+            in_overlay = overlay is not None and overlay.has(str(rel_path))
+            if not (overlay.exists(str(rel_path)) if in_overlay else file_path.is_file()):
+                return f"⚠️  Datei existiert nicht: {filename}"
+            
+            start_line = max(1, start_line)
+            last_line = start_line + self.max_lines - 1
+            if end_line is not None:
+                if end_line < start_line:
+                    return f"⚠️  Ungültiger Bereich: end_line ({end_line}) liegt vor start_line ({start_line})"
+                last_line = min(end_line, last_line)
+            
+            if in_overlay:
+                # Noch nicht geschriebener Stand dieses Laufs
+                text, last_line, total = read_text_range(overlay.read_text(str(rel_path)), start_line, last_line,
+                                                         max_chars=self.max_output_chars)
+            else:
+                text, last_line, total = read_file_range(str(file_path), start_line, last_line,
+                                                         max_chars=self.max_output_chars)
+            if total == 0:
+                return f"📄 Datei ist leer: {rel_path}"
+            if start_line > total:
+                return f"⚠️  {rel_path} hat nur {total} Zeilen"
+            
+            numbered = "\n".join(f"{start_line + i:>5}: {line}" for i, line in enumerate(text.splitlines()))
+            output = f"📄 {rel_path} (Zeilen {start_line}-{last_line} von {total})\n{numbered}"
+            if last_line < total and (end_line is None or last_line < end_line):
+                output += f"\n\n➡️  Weiter ab Zeile {last_line + 1}: start_line={last_line + 1}"
+            return output
+            
+        except BinaryFileError:
+            return f"⚠️  Binärdatei kann nicht gelesen werden: {filename}"
+        except Exception as e:
+            return f"❌ Fehler beim Lesen der Datei: {str(e)}"
+
+
+class ListDirectoryInput(BaseModel):
+    """Input für ListDirectoryTool"""
+    directory: str = Field(".", description="Unterordner (relativ zum Arbeitsverzeichnis), Standard: '.'")
+    depth: int = Field(2, description="Ordner-Ebenen, deren Dateien einzeln gelistet werden; tiefere Ordner "
+                                      "erscheinen nur mit Dateianzahl (Standard: 2)")
+    glob: Optional[str] = Field(None, description="Optional, nur passende Dateien, z.B. '*.py' oder 'src/*.ts'")
+    cursor: Optional[str] = Field(None, description="Fortsetzung: der cursor-Wert aus der vorherigen Seite")
+
+
+def _group_listing(files: List[str], rel_dir: str, depth: int) -> List[Tuple[str, int]]:
+    """
+    Fasst Dateien unterhalb von depth Ordner-Ebenen zu ihrem Ordner zusammen.
+
+    Returns:
+        Sortierte Einträge (Pfad, Anzahl); Ordner enden auf '/' und tragen
+        die Anzahl ihrer Dateien, Dateien haben Anzahl 0
+    """
+    prefix_parts = 0 if rel_dir == '.' else len(Path(rel_dir).parts)
+    counts: Dict[str, int] = {}
+    for path in files:
+        parts = Path(path).parts
+        if len(parts) - prefix_parts <= depth:
+            counts[path] = 0
+        else:
+            folder = str(Path(*parts[:prefix_parts + depth])) + '/'
+            counts[folder] = counts.get(folder, 0) + 1
+    return sorted(counts.items())
+
+
+class ListDirectoryTool(BaseTool):
+    name: str = "List Directory"
+    description: str = (
+        "Listet die Dateien im Arbeitsverzeichnis oder einem Unterordner. "
+        "Input: directory (optional, z.B. 'src'), depth (optional, Standard 2: tiefere Ordner "
+        "werden als 'ordner/ (N Dateien)' zusammengefasst), glob (optional, z.B. '*.py'), "
+        "cursor (optional, für die nächste Seite). "
+        "Ignoriert node_modules, .venv, Build-Ordner sowie alles aus .gitignore und .agentsignore."
+    )
+    args_schema: Type[BaseModel] = ListDirectoryInput
+    work_dir: str = Field(description="Working directory path")
+    page_size: int = Field(200, description="Einträge pro Seite")
+    # Lesend: Ergebnisse werden memoisiert (siehe tool_memo), abhängig von diesem Pfad-Argument
+    memo_path_arg: ClassVar[Optional[str]] = 'directory'
+    output_budget: int = Field(TOOL_OUTPUT_TOKENS, description="Maximale Tokens pro Ausgabe, darüber seitenweise")
+    
+    @with_output_budget
+    def _run(self, directory: str = ".", depth: int = 2, glob: Optional[str] = None,
+             cursor: Optional[str] = None) -> str:
+        """Listet Dateien unter Beachtung der Ignore-Regeln des Projekts"""
+        try:
+            work_dir_path = Path(self.work_dir).resolve()
+            # Sicherheit: Nur Ordner im work_dir erlauben
+            dir_path = (work_dir_path / directory).resolve()
+            
+            # Prüfe ob Pfad innerhalb work_dir liegt
+            if dir_path != work_dir_path and work_dir_path not in dir_path.parents:
+                return f"❌ Fehler: Nur Ordner im Arbeitsverzeichnis können gelistet werden: {work_dir_path}"
+            
+            rel_dir = str(dir_path.relative_to(work_dir_path))
+            overlay = get_overlay(str(work_dir_path))
+            if not (overlay.is_dir(rel_dir) if overlay is not None else dir_path.is_dir()):
+                return f"⚠️  Ordner existiert nicht: {directory}"
+            
+            matcher = get_project_matcher(str(work_dir_path))
+            if rel_dir != '.' and matcher.is_path_ignored(rel_dir, is_dir=True):
+                return f"⚠️  Ordner wird ignoriert (Standard-Regeln, .gitignore oder .agentsignore): {rel_dir}"
+            
+            files = []
+            if dir_path.is_dir():
+                files = [walked.path for walked in walk_files(str(work_dir_path), matcher, start=rel_dir)]
+            if overlay is not None:
+                files = [path for path in overlay.merge_listing(files, rel_dir)
+                         if not matcher.is_path_ignored(path)]
+            if glob:
+                files = [path for path in files
+                         if fnmatch.fnmatch(path, glob) or fnmatch.fnmatch(os.path.basename(path), glob)]
+            if not files:
+                return f"📂 Keine Dateien in: {rel_dir}" + (f" (glob: {glob})" if glob else "")
+            
+            entries = _group_listing(files, rel_dir, max(1, depth))
+            if cursor:
+                # Cursor = letzter Eintrag der vorherigen Seite (stabil, auch wenn Dateien hinzukommen)
+                entries = [entry for entry in entries if entry[0] > cursor]
+            page = entries[:self.page_size]
+            if not page:
+                return f"📂 Keine weiteren Einträge nach: {cursor}"
+            
+            lines = [f"{path} ({count} Dateien)" if count else path for path, count in page]
+            header = f"📂 {rel_dir}: {len(files)} Dateien" + (f" (glob: {glob})" if glob else "")
+            output = header + "\n- " + "\n- ".join(lines)
+            if len(entries) > len(page):
+                output += (f"\n\n➡️  {len(entries) - len(page)} weitere Einträge: "
+                           f"cursor={page[-1][0]!r}")
+            return output
+            
+        except Exception as e:
+            return f"❌ Fehler beim Lesen des Ordners: {str(e)}"
+
+
+class FileOutlineInput(BaseModel):
+    """Input für FileOutlineTool"""
+    filename: str = Field(..., description="Dateiname (relativ zum Arbeitsverzeichnis)")
+
+
+class FileOutlineTool(BaseTool):
+    name: str = "File Outline"
+    description: str = (
+        "Zeigt die Struktur einer Code-Datei ohne den ganzen Inhalt zu lesen: "
+        "Klassen, Funktionen mit Signaturen, Docstrings und Zeilennummern. "
+        "Input: filename (z.B. 'src/app.py'). Unterstützt Python, JS/TS, Go, Rust und Java. "
+        "Spart Tokens - nutze es vor dem Lesen großer Dateien."
+    )
+    args_schema: Type[BaseModel] = FileOutlineInput
+    work_dir: str = Field(description="Working directory path")
+    # Lesend: Ergebnisse werden memoisiert (siehe tool_memo), abhängig von diesem Pfad-Argument
+    memo_path_arg: ClassVar[Optional[str]] = 'filename'
+    output_budget: int = Field(TOOL_OUTPUT_TOKENS, description="Maximale Tokens pro Ausgabe, darüber seitenweise")
+    
+    @with_output_budget
+    def _run(self, filename: str) -> str:
+        """Liefert die (gecachte) Outline einer Datei"""
+        try:
+            work_dir_path = Path(self.work_dir).resolve()
+            # Sicherheit: Nur Dateien im work_dir erlauben
+            file_path = (work_dir_path / filename).resolve()
+            
+            # Prüfe ob Pfad innerhalb work_dir liegt
+            if work_dir_path not in file_path.parents:
+                return f"❌ Fehler: Nur Dateien im Arbeitsverzeichnis sind erlaubt: {work_dir_path}"
+            
+            rel_path = file_path.relative_to(work_dir_path)
+            overlay = get_overlay(str(work_dir_path))
+            in_overlay = overlay is not None and overlay.has(str(rel_path))
+            if not (overlay.exists(str(rel_path)) if in_overlay else file_path.is_file()):
+                return f"⚠️  Datei existiert nicht: {filename}"
+            
+            if not supports_outline(file_path.name):
+                return f"⚠️  Keine Outline für diesen Dateityp - nutze das Lese-Tool: {rel_path}"
+            
+            if in_overlay:
+                outline = extract_outline(overlay.read_text(str(rel_path)), file_path.suffix)
+            else:
+                outline = outline_file(file_path, get_outline_cache(str(work_dir_path)))
+            if outline is None:
+                return f"⚠️  Outline konnte nicht erstellt werden (Syntaxfehler oder Datei zu groß): {rel_path}"
+            if not outline:
+                return f"📄 Keine Klassen oder Funktionen in: {rel_path}"
+            
+            return f"Outline von {rel_path} (Zeilennummer: Definition):\n{outline}"
+            
+        except Exception as e:
+            return f"❌ Fehler beim Erstellen der Outline: {str(e)}"
+
+
+class SearchCodeInput(BaseModel):
+    """Input für SearchCodeTool"""
+    query: str = Field(..., description="Suchbegriffe, z.B. Funktions- oder Klassennamen oder Stichworte")
+    top_k: int = Field(5, description="Anzahl Treffer (Standard: 5, max. 20)")
+
+
+class SearchCodeTool(BaseTool):
+    name: str = "Search Code"
+    description: str = (
+        "Durchsucht den Code im Arbeitsverzeichnis nach Relevanz (BM25) und liefert die besten "
+        "Treffer mit Dateipfad, Zeilenbereich und Ausschnitt. "
+        "Input: query (z.B. 'user login session'), top_k (optional). "
+        "Schneller als Dateien einzeln zu lesen - nutze es um Code zu finden."
+    )
+    args_schema: Type[BaseModel] = SearchCodeInput
+    work_dir: str = Field(description="Working directory path")
+    # Lesend: Ergebnisse werden memoisiert (siehe tool_memo), abhängig vom ganzen Projekt
+    memo_path_arg: ClassVar[Optional[str]] = None
+    output_budget: int = Field(TOOL_OUTPUT_TOKENS, description="Maximale Tokens pro Ausgabe, darüber seitenweise")
+    
+    @with_output_budget
+    def _run(self, query: str, top_k: int = 5) -> str:
+        """Sucht im (inkrementell aktualisierten) Suchindex des Projekts"""
+        try:
+            index = get_search_index(self.work_dir)
+            hits = index.search(query, max(1, min(top_k, 20)))
+            if not hits:
+                return f"🔍 Keine Treffer für: {query}"
+            
+            results = []
+            for hit in hits:
+                first_line, lines = index.snippet(hit, query)
+                snippet = "\n".join(f"{first_line + i:>5}: {line}" for i, line in enumerate(lines))
+                results.append(f"📄 {hit.path} (Zeilen {hit.start_line}-{hit.end_line}, Score {hit.score:.1f})\n{snippet}")
+            
+            return f"🔍 {len(hits)} Treffer für: {query}\n\n" + "\n\n".join(results)
+            
+        except Exception as e:
+            return f"❌ Fehler bei der Code-Suche: {str(e)}"
+
+
+class GrepInput(BaseModel):
+    """Input für GrepTool"""
+    pattern: str = Field(..., description="Regulärer Ausdruck (Python-Syntax), z.B. 'def \\w+_user' oder 'import requests'")
+    ignore_case: bool = Field(False, description="Groß-/Kleinschreibung ignorieren")
+    path_glob: Optional[str] = Field(None, description="Optional, nur passende Pfade, z.B. '*.py' oder 'src/*'")
+    page: int = Field(1, description="Ergebnis-Seite (Standard: 1)")
+
+
+class GrepTool(BaseTool):
+    name: str = "Grep"
+    description: str = (
+        "Findet alle Zeilen im Arbeitsverzeichnis, die auf einen regulären Ausdruck passen "
+        "(z.B. 'Wo wird X verwendet?'). Durchsucht alle Textdateien außer ignorierten "
+        "(.gitignore/.agentsignore) und Dateien über 2 MB. Liefert Pfad:Zeile: Inhalt, seitenweise. "
+        "Input: pattern, ignore_case (optional), path_glob (optional, z.B. '*.py'), page (optional). "
+        "Nutze es statt Dateien einzeln zu lesen."
+    )
+    args_schema: Type[BaseModel] = GrepInput
+    work_dir: str = Field(description="Working directory path")
+    # Lesend: Ergebnisse werden memoisiert (siehe tool_memo), abhängig vom ganzen Projekt
+    memo_path_arg: ClassVar[Optional[str]] = None
+    output_budget: int = Field(TOOL_OUTPUT_TOKENS, description="Maximale Tokens pro Ausgabe, darüber seitenweise")
+    page_size: int = Field(50, description="Treffer pro Seite")
+    max_output_chars: int = Field(8000, description="Maximale Länge der Ausgabe")
+    
+    @with_output_budget
+    def _run(self, pattern: str, ignore_case: bool = False,
+             path_glob: Optional[str] = None, page: int = 1) -> str:
+        """Sucht über den Trigramm-Index des Projekts"""
+        try:
+            page = max(1, page)
+            index = get_grep_index(self.work_dir)
+            result = index.grep(pattern, ignore_case=ignore_case, path_glob=path_glob,
+                                offset=(page - 1) * self.page_size, limit=self.page_size)
+            if not result.matches:
+                if page > 1:
+                    return f"🔍 Keine weiteren Treffer für: {pattern} (Seite {page})"
+                return f"🔍 Keine Treffer für: {pattern}"
+            
+            lines = []
+            length = 0
+            truncated = False
+            for match in result.matches:
+                line = f"{match.path}:{match.line_number}: {match.line}"
+                if length + len(line) > self.max_output_chars:
+                    truncated = True
+                    break
+                lines.append(line)
+                length += len(line) + 1
+            
+            output = f"🔍 Treffer für: {pattern} (Seite {page})\n" + "\n".join(lines)
+            if truncated:
+                output += f"\n\n⚠️  Ausgabe gekürzt - schränke die Suche mit path_glob oder einem genaueren Muster ein."
+            elif result.has_more:
+                output += f"\n\n➡️  Weitere Treffer: page={page + 1}"
+            return output
+            
+        except re.error as e:
+            return f"❌ Ungültiger regulärer Ausdruck: {str(e)}"
+        except Exception as e:
+            return f"❌ Fehler bei der Suche: {str(e)}"
+
+
+class FetchResultInput(BaseModel):
+    """Input für FetchResultTool"""
+    handle: str = Field(..., description="Handle eines zu großen Ergebnisses, z.B. 'r3'")
+    page: int = Field(2, description="Seite (Standard: 2)")
+
+
+class FetchResultTool(BaseTool):
+    name: str = "Fetch Result"
+    description: str = (
+        "Holt weitere Seiten eines Tool-Ergebnisses, das zu groß für eine Antwort war. "
+        "Input: handle (aus dem Hinweis, z.B. 'r3') und page."
+    )
+    args_schema: Type[BaseModel] = FetchResultInput
+    
+    def _run(self, handle: str, page: int = 2) -> str:
+        """Liefert eine Seite aus dem Ergebnis-Speicher"""
+        result = get_result_store().get(handle)
+        if result is None:
+            return f"⚠️  Unbekanntes oder abgelaufenes Handle: {handle} - Tool erneut aufrufen"
+        if not 1 <= page <= len(result.pages):
+            return f"⚠️  Seite {page} existiert nicht - {handle} hat {len(result.pages)} Seiten"
+        return format_page(result, page)
+
+
+class RunTestsInput(BaseModel):
+    """Input für RunTestsTool"""
+    changed_files: Optional[List[str]] = Field(None, description="Optional, geänderte Dateien - nur Tests, die sie (indirekt) importieren, laufen")
+    tests: Optional[List[str]] = Field(None, description="Optional, nur diese Testdateien oder Ordner")
+    no_cache: bool = Field(False, description="Gespeicherte Ergebnisse ignorieren und alles neu ausführen")
+
+
+class RunTestsTool(BaseTool):
+    name: str = "Run Tests"
+    description: str = (
+        "Führt die pytest-Tests des Projekts aus und liefert eine kurze Zusammenfassung "
+        "(bestanden/fehlgeschlagen, Fehlermeldungen). Sieht auch noch nicht gespeicherte Änderungen. "
+        "Tests, deren Code und Abhängigkeiten sich nicht geändert haben, kommen aus dem Cache. "
+        "Input: changed_files (optional, nur betroffene Tests), tests (optional), no_cache (optional)."
+    )
+    args_schema: Type[BaseModel] = RunTestsInput
+    work_dir: str = Field(description="Working directory path")
+    output_budget: int = Field(TOOL_OUTPUT_TOKENS, description="Maximale Tokens pro Ausgabe, darüber seitenweise")
+    
+    @with_output_budget
+    def _run(self, changed_files: Optional[List[str]] = None, tests: Optional[List[str]] = None,
+             no_cache: bool = False) -> str:
+        """Wählt die betroffenen Tests und führt sie über einen pytest-Prozess-Pool aus"""
+        try:
+            work_dir_path = Path(self.work_dir).resolve()
+            for filename in (changed_files or []) + (tests or []):
+                if filename not in ('.', '') and work_dir_path not in (work_dir_path / filename).resolve().parents:
+                    return f"❌ Fehler: Pfad liegt außerhalb des Arbeitsverzeichnisses: {filename}"
+            summary = run_tests(self.work_dir, changed_files=changed_files, tests=tests, use_cache=not no_cache)
+            return format_summary(summary)
+        except RuntimeError as e:
+            return f"❌ pytest konnte nicht ausgeführt werden: {str(e)}"
+        except Exception as e:
+            return f"❌ Fehler beim Ausführen der Tests: {str(e)}"
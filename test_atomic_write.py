@@ -0,0 +1,96 @@
+import os
+import stat
+
+import pytest
+
+from my_agents import atomic_write
+from my_agents.atomic_write import write_files_atomic
+
+
+def _mode(path):
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+
+def test_write_keeps_mode_of_existing_file(tmp_path):
+    script = tmp_path / 'run.sh'
+    script.write_text('#!/bin/sh\necho alt\n')
+    os.chmod(script, 0o755)
+
+    write_files_atomic(str(tmp_path), [('run.sh', '#!/bin/sh\necho neu\n')])
+
+    assert script.read_text() == '#!/bin/sh\necho neu\n'
+    assert _mode(script) == 0o755
+
+
+def test_new_file_follows_umask(tmp_path):
+    written = write_files_atomic(str(tmp_path), [('pkg/neu.py', 'x = 1\n')])
+
+    assert written[0].created
+    assert _mode(tmp_path / 'pkg' / 'neu.py') == 0o666 & ~atomic_write._UMASK
+
+
+def test_path_outside_work_dir_writes_nothing(tmp_path):
+    work_dir = tmp_path / 'work'
+    work_dir.mkdir()
+    (work_dir / 'a.txt').write_text('alt')
+
+    with pytest.raises(ValueError):
+        write_files_atomic(str(work_dir), [('a.txt', 'neu'), ('../work-evil/b.txt', 'x')])
+
+    assert (work_dir / 'a.txt').read_text() == 'alt'
+    assert not (tmp_path / 'work-evil').exists()
+
+
+def test_failure_rolls_back_replaced_and_created_files(tmp_path, monkeypatch):
+    (tmp_path / 'a.txt').write_text('alt')
+    real_replace = os.replace
+    calls = []
+
+    def failing_replace(src, dst):
+        calls.append(dst)
+        if len(calls) == 2:
+            raise OSError('Platte voll')
+        return real_replace(src, dst)
+
+    monkeypatch.setattr(atomic_write.os, 'replace', failing_replace)
+    with pytest.raises(OSError):
+        write_files_atomic(str(tmp_path), [('a.txt', 'neu'), ('sub/b.txt', 'b')])
+    monkeypatch.undo()
+
+    assert (tmp_path / 'a.txt').read_text() == 'alt'
+    assert not (tmp_path / 'sub').exists()
+    assert sorted(os.listdir(tmp_path)) == ['a.txt']
+
+
+def test_deletes_are_part_of_the_batch(tmp_path, monkeypatch):
+    for name in ('a.txt', 'old.txt', 'gone.txt'):
+        (tmp_path / name).write_text('alt')
+    real_replace = os.replace
+    calls = []
+
+    def failing_replace(src, dst):
+        calls.append(dst)
+        if len(calls) == 3:
+            raise OSError('Zugriff verweigert')
+        return real_replace(src, dst)
+
+    monkeypatch.setattr(atomic_write.os, 'replace', failing_replace)
+    with pytest.raises(OSError):
+        write_files_atomic(str(tmp_path), [('a.txt', 'neu')], deletes=['old.txt', 'gone.txt'])
+    monkeypatch.undo()
+
+    assert sorted(os.listdir(tmp_path)) == ['a.txt', 'gone.txt', 'old.txt']
+    assert all((tmp_path / name).read_text() == 'alt' for name in ('a.txt', 'old.txt', 'gone.txt'))
+
+    write_files_atomic(str(tmp_path), [('a.txt', 'neu')], deletes=['old.txt', 'fehlt.txt'])
+    assert sorted(os.listdir(tmp_path)) == ['a.txt', 'gone.txt']
+
+
+def test_delete_removes_symlink_not_target(tmp_path):
+    (tmp_path / 'target.txt').write_text('bleibt')
+    (tmp_path / 'link.txt').symlink_to(tmp_path / 'target.txt')
+
+    write_files_atomic(str(tmp_path), [], deletes=['link.txt'])
+
+    assert not os.path.lexists(tmp_path / 'link.txt')
+    assert (tmp_path / 'target.txt').read_text() == 'bleibt'
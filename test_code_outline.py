@@ -0,0 +1,21 @@
+from my_agents.code_outline import get_outline_cache, outline_file
+
+
+def test_outline_cache_is_shared_per_project(tmp_path):
+    (tmp_path / 'link').symlink_to(tmp_path, target_is_directory=True)
+
+    cache = get_outline_cache(str(tmp_path))
+    assert get_outline_cache(str(tmp_path)) is cache
+    assert get_outline_cache(str(tmp_path / 'link')) is cache
+
+
+def test_outline_is_served_from_cache(tmp_path):
+    source = tmp_path / 'modul.py'
+    source.write_text('class Rechner:\n    def addiere(self, a, b):\n        """Summe"""\n        return a + b\n')
+    cache = get_outline_cache(str(tmp_path))
+
+    outline = outline_file(source, cache)
+    assert 'Rechner' in outline and 'addiere' in outline
+    hits = cache.hits
+    assert outline_file(source, cache) == outline
+    assert cache.hits == hits + 1
@@ -0,0 +1,67 @@
+import math
+
+import pytest
+
+from my_agents import code_search
+from my_agents.code_search import BM25_B, BM25_K1, SEARCH_CHUNK_LINES, get_search_index, tokenize
+from my_agents.tools import WriteFileTool
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / 'auth.py').write_text('def login_user(name):\n    return check_password(name)\n')
+    yield tmp_path
+    code_search._indexes.pop(code_search._index_key(str(tmp_path))).close()
+
+
+def test_query_refreshes_only_reported_files(project, monkeypatch):
+    index = get_search_index(str(project))
+
+    def no_rescan(project_index=None):
+        raise AssertionError("Suche darf das Verzeichnis nicht erneut scannen")
+
+    monkeypatch.setattr(index, 'update', no_rescan)
+    WriteFileTool(work_dir=str(project))._run(filename='billing.py', content='def create_invoice():\n    pass\n')
+
+    hits = get_search_index(str(project)).search('invoice')
+
+    assert [hit.path for hit in hits] == ['billing.py']
+
+
+def test_tokenize_splits_identifiers():
+    assert tokenize('getUserName') == ['getusername', 'get', 'user', 'name']
+    assert tokenize('MAX_RETRY_COUNT = 3') == ['max_retry_count', 'max', 'retry', 'count']
+    assert tokenize('HTTPServer x') == ['httpserver', 'http', 'server']
+
+
+def test_bm25_prefers_rare_terms_and_higher_frequency(project):
+    (project / 'common.py').write_text('def login_user(name):\n    return name\n')
+    (project / 'rare.py').write_text('def login_admin(token):\n    return token\n')
+    (project / 'many.py').write_text('token = token_from(token)\n')
+    index = get_search_index(str(project))
+
+    # 'login' steht in drei Abschnitten, 'admin' nur in einem
+    assert index.search('login admin')[0].path == 'rare.py'
+    # Bei gleicher Länge gewinnt die höhere Häufigkeit
+    assert [hit.path for hit in index.search('token', top_k=2)] == ['many.py', 'rare.py']
+
+
+def test_bm25_score_and_chunk_lines(project):
+    lines = [f'wert_{i} = {i}' for i in range(2 * SEARCH_CHUNK_LINES)]
+    lines[SEARCH_CHUNK_LINES + 5] = 'seltener_name = 1'
+    (project / 'lang.py').write_text('\n'.join(lines) + '\n')
+    index = get_search_index(str(project))
+
+    hit, = index.search('seltener', top_k=5)
+    assert (hit.path, hit.start_line, hit.end_line) == ('lang.py', SEARCH_CHUNK_LINES + 1, 2 * SEARCH_CHUNK_LINES)
+
+    # Abschnitte: auth.py, lang.py (2x); tf = 1
+    lengths = [len(tokenize(code)) for code in (
+        (project / 'auth.py').read_text(),
+        '\n'.join(lines[:SEARCH_CHUNK_LINES]),
+        '\n'.join(lines[SEARCH_CHUNK_LINES:]),
+    )]
+    avg_length = sum(lengths) / len(lengths)
+    idf = math.log(1 + (3 - 1 + 0.5) / (1 + 0.5))
+    norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[2] / avg_length)
+    assert hit.score == pytest.approx(idf * (BM25_K1 + 1) / (1 + norm))
@@ -0,0 +1,85 @@
+import pytest
+
+from my_agents.file_edit import EditConflict, apply_edits
+from my_agents.tools import DeleteFileTool, EditFileTool, ReadFileTool, WriteFileTool
+
+SOURCE = "def a():\n    return 1\n\n\ndef b():\n    return 2\n"
+
+
+@pytest.fixture
+def sibling(tmp_path):
+    """Arbeitsverzeichnis 'work' und ein Nachbar 'work-evil' mit gleichem Präfix"""
+    (tmp_path / 'work').mkdir()
+    (tmp_path / 'work-evil').mkdir()
+    (tmp_path / 'work-evil' / 'secret.txt').write_text('geheim\n')
+    return tmp_path
+
+
+@pytest.mark.parametrize('tool, kwargs', [
+    (WriteFileTool, {'content': 'x'}),
+    (EditFileTool, {'edits': '<<<<<<< SEARCH\ngeheim\n=======\nweg\n>>>>>>> REPLACE\n'}),
+    (DeleteFileTool, {}),
+    (ReadFileTool, {}),
+])
+def test_tools_reject_sibling_directory_with_same_prefix(sibling, tool, kwargs):
+    result = tool(work_dir=str(sibling / 'work'))._run(filename='../work-evil/secret.txt', **kwargs)
+
+    assert result.startswith('❌')
+    assert (sibling / 'work-evil' / 'secret.txt').read_text() == 'geheim\n'
+
+
+def test_search_replace_blocks():
+    edits = ("<<<<<<< SEARCH\n    return 1\n=======\n    return 10\n>>>>>>> REPLACE\n"
+             "<<<<<<< SEARCH\n    return 2\n=======\n    return 20\n>>>>>>> REPLACE\n")
+
+    result, count = apply_edits(SOURCE, edits)
+
+    assert count == 2
+    assert result == "def a():\n    return 10\n\n\ndef b():\n    return 20\n"
+
+
+def test_ambiguous_search_text_is_a_conflict():
+    with pytest.raises(EditConflict, match='2x'):
+        apply_edits("x = 1\nx = 1\n", "<<<<<<< SEARCH\nx = 1\n=======\nx = 2\n>>>>>>> REPLACE\n")
+
+
+def test_unified_diff_hunk_with_shifted_line_numbers():
+    # Hunk gibt Zeile 2 an, der Kontext steht aber in Zeile 5
+    diff = "--- a/m.py\n+++ b/m.py\n@@ -2,2 +2,2 @@\n def b():\n-    return 2\n+    return 3\n"
+
+    result, count = apply_edits(SOURCE, diff)
+
+    assert count == 1
+    assert result == SOURCE.replace('return 2', 'return 3')
+
+
+def test_unified_diff_pure_insertion():
+    diff = "@@ -1,0 +2,1 @@\n+    '''Doku'''\n"
+
+    result, _ = apply_edits(SOURCE, diff)
+
+    assert result.startswith("def a():\n    '''Doku'''\n    return 1\n")
+
+
+def test_unified_diff_conflict_reports_line():
+    diff = "@@ -1,2 +1,2 @@\n def a():\n-    return 99\n+    return 0\n"
+
+    with pytest.raises(EditConflict, match="Zeile 2 erwartet 'return 99'"):
+        apply_edits(SOURCE, diff)
+
+
+def test_crlf_line_endings_are_kept():
+    result, _ = apply_edits("a\r\nb\r\n", "<<<<<<< SEARCH\nb\n=======\nc\n>>>>>>> REPLACE\n")
+
+    assert result == "a\r\nc\r\n"
+
+
+def test_edit_tool_applies_all_or_nothing(tmp_path):
+    (tmp_path / 'm.py').write_text(SOURCE)
+    edits = ("<<<<<<< SEARCH\n    return 1\n=======\n    return 10\n>>>>>>> REPLACE\n"
+             "<<<<<<< SEARCH\n    return 99\n=======\n    return 0\n>>>>>>> REPLACE\n")
+
+    result = EditFileTool(work_dir=str(tmp_path))._run(filename='m.py', edits=edits)
+
+    assert result.startswith('❌ Konflikt')
+    assert (tmp_path / 'm.py').read_text() == SOURCE
@@ -0,0 +1,34 @@
+import pytest
+
+from my_agents.file_ranker import rank_files, score_files, task_score_delta
+from my_agents.project_index import ProjectIndex
+
+
+def _make_project(root):
+    (root / 'app').mkdir()
+    (root / 'app' / 'main.py').write_text(
+        "from app import billing\n\nif __name__ == '__main__':\n    billing.run()\n")
+    (root / 'app' / 'billing.py').write_text("def run():\n    return 'invoice'\n")
+    (root / 'app' / 'utils.py').write_text("def helper():\n    return 1\n")
+
+
+def test_task_delta_matches_full_task_scores(tmp_path):
+    _make_project(tmp_path)
+    project_index = ProjectIndex.build(str(tmp_path))
+    task = 'Fix invoice rounding'
+
+    base = score_files(project_index)
+    delta = task_score_delta(project_index, task)
+    combined = {path: score + delta.get(path, 0.0) for path, score in base.items()}
+
+    assert combined == pytest.approx(score_files(project_index, task))
+    assert set(delta) == {'app/billing.py'}
+
+
+def test_entry_point_and_import_target_rank_first(tmp_path):
+    _make_project(tmp_path)
+    project_index = ProjectIndex.build(str(tmp_path))
+
+    ranked = [entry.path for entry in rank_files(project_index)]
+    assert ranked[0] == 'app/main.py'
+    assert ranked.index('app/billing.py') < ranked.index('app/utils.py')
@@ -0,0 +1,35 @@
+import mmap
+import os
+
+import pytest
+
+from my_agents import file_reader
+from my_agents.file_reader import BinaryFileError, FileReadCache
+
+
+@pytest.mark.parametrize('use_mmap', [True, False])
+def test_read_lines_and_replace(tmp_path, monkeypatch, use_mmap):
+    monkeypatch.setattr(file_reader, 'USE_MMAP', use_mmap)
+    path = tmp_path / 'text.txt'
+    path.write_text('eins\nzwei\ndrei')
+    cache = FileReadCache()
+
+    opened = cache.get(str(path))
+    assert opened.line_count == 3
+    assert opened.read_lines(2, 3) == 'zwei\ndrei'
+    assert isinstance(opened._data, mmap.mmap) == use_mmap
+
+    replacement = tmp_path / 'neu.txt'
+    replacement.write_text('neu\n')
+    os.replace(replacement, path)
+    assert cache.get(str(path)).read_lines(1, 1) == 'neu\n'
+
+    cache.clear()
+    assert opened._data is None
+
+
+def test_binary_file_is_rejected(tmp_path):
+    path = tmp_path / 'bild.bin'
+    path.write_bytes(b'\x89PNG\0\0\0')
+    with pytest.raises(BinaryFileError):
+        FileReadCache().get(str(path))
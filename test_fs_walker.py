@@ -0,0 +1,50 @@
+import os
+
+import pytest
+
+from my_agents.fs_walker import walk_files
+from my_agents.ignore_rules import IgnoreMatcher
+
+
+def _make_tree(root):
+    (root / '.gitignore').write_text('*.log\nbuild/\n')
+    for i in range(20):
+        package = root / 'pkg' / f'modul{i}' / 'sub'
+        package.mkdir(parents=True)
+        (package / 'core.py').write_text('x = 1\n')
+        (package.parent / 'README.md').write_text('# Modul\n')
+        (package.parent / 'debug.log').write_text('log\n')
+    (root / 'pkg' / 'modul3' / '.agentsignore').write_text('sub/\n!debug.log\n')
+    (root / 'build').mkdir()
+    (root / 'build' / 'out.py').write_text('x = 2\n')
+    (root / 'node_modules' / 'lib').mkdir(parents=True)
+    (root / 'node_modules' / 'lib' / 'index.js').write_text('')
+
+
+def _paths(root, **kwargs):
+    return sorted(entry.path for entry in walk_files(str(root), IgnoreMatcher.for_project(str(root)), **kwargs))
+
+
+@pytest.mark.parametrize('kwargs', [{}, {'file_filter': lambda name: name.endswith('.py')},
+                                    {'start': os.path.join('pkg', 'modul3')}])
+def test_parallel_walk_matches_sequential(tmp_path, kwargs):
+    _make_tree(tmp_path)
+    assert _paths(tmp_path, workers=1, **kwargs) == _paths(tmp_path, workers=8, **kwargs)
+
+
+def test_walk_applies_nested_ignore_files(tmp_path):
+    _make_tree(tmp_path)
+    paths = _paths(tmp_path, workers=1)
+
+    assert os.path.join('pkg', 'modul0', 'sub', 'core.py') in paths
+    assert os.path.join('pkg', 'modul0', 'debug.log') not in paths
+    # .agentsignore in modul3: Unterordner ignoriert, Log-Datei wieder aufgenommen
+    assert os.path.join('pkg', 'modul3', 'sub', 'core.py') not in paths
+    assert os.path.join('pkg', 'modul3', 'debug.log') in paths
+    assert not any(path.startswith(('build', 'node_modules')) for path in paths)
+
+
+def test_start_keeps_paths_relative_to_root(tmp_path):
+    _make_tree(tmp_path)
+    paths = _paths(tmp_path, workers=1, start=os.path.join('pkg', 'modul3'))
+    assert paths == sorted([os.path.join('pkg', 'modul3', name) for name in ('.agentsignore', 'README.md', 'debug.log')])
@@ -0,0 +1,79 @@
+import os
+import re
+
+import pytest
+
+from my_agents import grep_index
+from my_agents.grep_index import _required_literals, get_grep_index
+from my_agents.tools import WriteFileTool
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / 'app.py').write_text('import os\nprint("hallo")\n')
+    (tmp_path / 'Dockerfile').write_text('FROM python:3.11\nRUN pip install hallo\n')
+    (tmp_path / 'pyproject.toml').write_text('[project]\nname = "hallo"\n')
+    (tmp_path / 'logo.bin').write_bytes(b'hallo\0\1\2')
+    yield tmp_path
+    grep_index._indexes.pop(grep_index._index_key(str(tmp_path))).close()
+
+
+def test_grep_covers_files_of_any_extension(project):
+    result = get_grep_index(str(project)).grep('hallo')
+
+    assert sorted({match.path for match in result.matches}) == ['Dockerfile', 'app.py', 'pyproject.toml']
+
+
+def test_query_refreshes_only_reported_files(project, monkeypatch):
+    index = get_grep_index(str(project))
+
+    def no_rescan():
+        raise AssertionError("Suche darf das Verzeichnis nicht erneut scannen")
+
+    monkeypatch.setattr(index, 'update', no_rescan)
+    WriteFileTool(work_dir=str(project))._run(filename='src/neu.py', content='NEUER_WERT = 1\n')
+
+    result = get_grep_index(str(project)).grep('NEUER_WERT')
+
+    assert [match.path for match in result.matches] == ['src/neu.py']
+
+
+@pytest.mark.parametrize('pattern, literals', [
+    ('foo.*barbaz', ['foo', 'barbaz']),
+    ('ab|cd', []),
+    ('(hello)+ x?world', ['hello', 'world']),
+    ('a[bc]def', ['def']),
+    ('(?:abc|abd)xyz', ['xyz']),
+    (r'\bdef\s+run_\w+', ['def', 'run_']),
+    ('(ungültig', []),
+])
+def test_required_literals(pattern, literals):
+    assert _required_literals(pattern) == literals
+
+
+@pytest.mark.parametrize('pattern, ignore_case', [
+    (r'def\s+run_\d+', False),
+    ('HALLO', True),
+    ('hallo|Welt', False),
+    ('x?yz', False),
+    ('ZEILE_[0-9]+_ENDE', True),
+    ('fehlt_überall', False),
+])
+def test_grep_matches_plain_regex_scan(project, pattern, ignore_case):
+    for i in range(30):
+        (project / f'modul{i}.py').write_text(
+            f"def run_{i}():\n    return 'Hallo Welt'\n" if i % 3 else f"# zeile_{i}_ende xyz\n")
+
+    result = get_grep_index(str(project)).grep(pattern, ignore_case=ignore_case, limit=1000)
+
+    regex = re.compile(pattern, re.IGNORECASE if ignore_case else 0)
+    expected = set()
+    for name in os.listdir(project):
+        if not (project / name).is_file():
+            continue
+        text = (project / name).read_text(encoding='utf-8', errors='ignore')
+        if '\0' in text:
+            continue
+        expected.update((name, number) for number, line in enumerate(text.splitlines(), 1) if regex.search(line))
+    assert {(match.path, match.line_number) for match in result.matches} == expected
+    assert not result.has_more
@@ -0,0 +1,68 @@
+import pytest
+
+from my_agents.ignore_rules import IgnoreMatcher, compile_rule
+
+
+def _matcher(*lines, base=''):
+    return IgnoreMatcher([rule for rule in (compile_rule(line, base) for line in lines) if rule is not None])
+
+
+PATHS = [
+    ('a.log', False), ('keep.log', False), ('sub/keep.log', False), ('sub/b.log', False),
+    ('build.txt', False), ('sub/build.txt', False), ('docs/x.md', False), ('sub/docs/x.md', False),
+    ('a/b/gen/x.py', False), ('gen/x.py', False), ('out', True), ('out', False), ('sub/out', True),
+]
+
+
+def test_negation_reincludes_files():
+    matcher = _matcher('*.log', '!keep.log')
+    assert matcher.is_ignored('a.log')
+    assert matcher.is_ignored('sub/b.log')
+    assert not matcher.is_ignored('keep.log')
+    assert not matcher.is_ignored('sub/keep.log')
+
+    # Die letzte passende Regel gewinnt
+    assert _matcher('!keep.log', '*.log').is_ignored('keep.log')
+
+
+def test_anchored_patterns_match_relative_to_ignore_file():
+    matcher = _matcher('/build.txt', 'docs/*.md', '**/gen/*.py')
+    assert matcher.is_ignored('build.txt')
+    assert not matcher.is_ignored('sub/build.txt')
+    assert matcher.is_ignored('docs/x.md')
+    assert not matcher.is_ignored('sub/docs/x.md')
+    assert matcher.is_ignored('gen/x.py')
+    assert matcher.is_ignored('a/b/gen/x.py')
+
+    nested = IgnoreMatcher().extended('sub', ['/local.txt'])
+    assert nested.is_ignored('sub/local.txt')
+    assert not nested.is_ignored('local.txt')
+
+
+def test_dir_only_patterns_skip_files():
+    matcher = _matcher('out/')
+    assert matcher.is_ignored('out', is_dir=True)
+    assert matcher.is_ignored('sub/out', is_dir=True)
+    assert not matcher.is_ignored('out')
+    assert matcher.is_path_ignored('out/result.txt')
+    assert not matcher.is_path_ignored('outer/result.txt')
+
+
+def test_comments_and_escapes():
+    assert compile_rule('# Kommentar') is None
+    assert compile_rule('   ') is None
+    assert _matcher(r'\#datei').is_ignored('#datei')
+    assert _matcher(r'\!wichtig').is_ignored('!wichtig')
+
+
+@pytest.mark.parametrize('lines', [
+    ('*.log', '/build.txt', 'docs/*.md', '**/gen/*.py', 'out/'),
+    ('*.md', 'sub/', 'a/**'),
+])
+def test_combined_regex_matches_ordered_evaluation(lines):
+    combined = _matcher(*lines)
+    # Eine Negation, die nie trifft, erzwingt die Auswertung Regel für Regel
+    ordered = _matcher(*lines, '!__nie_vorhanden__')
+    assert not combined._ordered and ordered._ordered
+    for path, is_dir in PATHS:
+        assert combined.is_ignored(path, is_dir) == ordered.is_ignored(path, is_dir), path
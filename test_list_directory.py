@@ -0,0 +1,62 @@
+import re
+
+import pytest
+
+from my_agents.tools import ListDirectoryTool
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / '.gitignore').write_text('secret/\n')
+    files = ['README.md', 'setup.py', 'src/app.py', 'src/core/models.py', 'src/core/db/engine.py',
+             'src/core/db/session.py', 'secret/key.txt', 'node_modules/lib/index.js', '.venv/bin/python']
+    for rel_path in files:
+        path = tmp_path / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text('x\n')
+    return tmp_path
+
+
+def _entries(output):
+    return [line[2:] for line in output.splitlines() if line.startswith('- ')]
+
+
+def test_listing_skips_ignored_and_groups_deep_folders(project):
+    output = ListDirectoryTool(work_dir=str(project))._run(depth=2)
+
+    assert output.startswith('📂 .: 7 Dateien')
+    assert _entries(output) == ['.gitignore', 'README.md', 'setup.py', 'src/app.py', 'src/core/ (3 Dateien)']
+    assert 'node_modules' not in output and 'secret' not in output
+
+
+def test_depth_and_glob_relative_to_directory(project):
+    tool = ListDirectoryTool(work_dir=str(project))
+
+    assert _entries(tool._run(directory='src/core', depth=1)) == ['src/core/db/ (2 Dateien)', 'src/core/models.py']
+    assert _entries(tool._run(glob='*.py', depth=5)) == [
+        'setup.py', 'src/app.py', 'src/core/db/engine.py', 'src/core/db/session.py', 'src/core/models.py']
+    assert tool._run(glob='*.rs').startswith('📂 Keine Dateien')
+
+
+def test_cursor_pages_cover_every_entry_once(project):
+    tool = ListDirectoryTool(work_dir=str(project), page_size=2)
+
+    seen, cursor = [], None
+    while True:
+        output = tool._run(depth=5, cursor=cursor)
+        seen.extend(_entries(output))
+        match = re.search(r"cursor='([^']*)'", output)
+        if match is None:
+            break
+        cursor = match.group(1)
+
+    assert seen == sorted(seen)
+    assert len(seen) == len(set(seen)) == 7
+
+
+def test_ignored_or_outside_directories_are_refused(project):
+    tool = ListDirectoryTool(work_dir=str(project))
+
+    assert tool._run(directory='node_modules').startswith('⚠️  Ordner wird ignoriert')
+    assert tool._run(directory='secret').startswith('⚠️  Ordner wird ignoriert')
+    assert tool._run(directory='..').startswith('❌')
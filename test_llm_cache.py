@@ -0,0 +1,93 @@
+import json
+
+import httpx
+import pytest
+
+from my_agents.llm_cache import CachingTransport, LLMResponseCache, request_key
+
+URL = 'https://openrouter.ai/api/v1/chat/completions'
+ANSWER = {'choices': [{'message': {'role': 'assistant', 'content': 'Hallo'}}]}
+
+
+@pytest.fixture
+def backend():
+    """Zählt die Anfragen, die den Cache passieren"""
+    calls = []
+
+    def handler(request):
+        calls.append(json.loads(request.read()))
+        body = calls[-1].get('answer', ANSWER)
+        return httpx.Response(calls[-1].get('status', 200), json=body)
+
+    return calls, httpx.MockTransport(handler)
+
+
+def _client(backend, mode):
+    cache = LLMResponseCache(mode=mode, ttl=3600, max_bytes=1024 * 1024)
+    return httpx.Client(transport=CachingTransport(backend[1], cache)), cache
+
+
+def _request(client, content='Sag Hallo', **fields):
+    body = {'model': 'test/model', 'messages': [{'role': 'user', 'content': content}], **fields}
+    return client.post(URL, json=body)
+
+
+def test_same_request_is_served_from_cache(tmp_path, monkeypatch, backend):
+    monkeypatch.chdir(tmp_path)
+    client, cache = _client(backend, 'read-write')
+
+    assert _request(client).json() == ANSWER
+    # Leerraum am Zeilenende und 'user' ändern die Antwort nicht
+    assert _request(client, 'Sag Hallo  \r\n', user='anderer').json() == ANSWER
+    assert len(backend[0]) == 1
+    assert (cache.hits, cache.misses, cache.stores) == (1, 1, 1)
+
+    _request(client, temperature=0.5)
+    assert len(backend[0]) == 2
+
+
+def test_read_only_mode_never_stores(tmp_path, monkeypatch, backend):
+    monkeypatch.chdir(tmp_path)
+    client, cache = _client(backend, 'read-only')
+
+    _request(client)
+    _request(client)
+    assert len(backend[0]) == 2
+    assert cache.stores == 0
+
+    # Vorhandene Einträge werden dagegen genutzt
+    writer, _ = _client(backend, 'read-write')
+    _request(writer, 'Vorab gespeichert')
+    _request(client, 'Vorab gespeichert')
+    assert len(backend[0]) == 3
+
+
+def test_errors_and_streams_are_not_cached(tmp_path, monkeypatch, backend):
+    monkeypatch.chdir(tmp_path)
+    client, cache = _client(backend, 'read-write')
+
+    _request(client, answer={'error': {'message': 'Rate limit'}})
+    _request(client, answer={'error': {'message': 'Rate limit'}})
+    assert _request(client, status=500).status_code == 500
+    _request(client, stream=True)
+    _request(client, stream=True)
+    assert len(backend[0]) == 5
+    assert cache.stores == 0
+
+
+def test_off_mode_passes_everything_through(tmp_path, monkeypatch, backend):
+    monkeypatch.chdir(tmp_path)
+    client, cache = _client(backend, 'off')
+
+    _request(client)
+    _request(client)
+    assert len(backend[0]) == 2
+    assert cache.format_stats() is None
+    assert not (tmp_path / '.agents_cache' / 'llm.sqlite').exists()
+
+
+def test_request_key_depends_on_parameters():
+    body = {'model': 'a', 'messages': [{'role': 'user', 'content': 'x'}]}
+    assert request_key('host/path', body) == request_key('host/path', dict(body, metadata={'run': 1}))
+    assert request_key('host/path', body) != request_key('host/path', dict(body, model='b'))
+    assert request_key('host/path', dict(body, stream=True)) is None
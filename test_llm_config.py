@@ -0,0 +1,47 @@
+import pytest
+
+from my_agents import llm_config
+from my_agents.llm_config import clear_llm_registry, get_http_client, get_llm
+
+
+@pytest.fixture(autouse=True)
+def registry(monkeypatch):
+    monkeypatch.setenv('OPENROUTER_API_KEY', 'test-key')
+    monkeypatch.setattr(llm_config, 'LLM_POOL_ENABLED', True)
+    clear_llm_registry()
+    yield
+    clear_llm_registry()
+
+
+def test_same_model_and_settings_share_one_instance():
+    llm = get_llm('openai/gpt-5-nano')
+
+    assert get_llm('openrouter/openai/gpt-5-nano') is llm
+    assert get_llm('openai/gpt-5-nano', temperature=0.2) is not llm
+    assert get_llm('openai/gpt-5-nano', temperature=0.2) is get_llm('openai/gpt-5-nano', temperature=0.2)
+    assert get_llm('google/gemini-2.5-flash-lite') is not llm
+
+
+def test_instances_share_the_connection_pool():
+    first = get_llm('openai/gpt-5-nano')
+    second = get_llm('moonshotai/kimi-k2.5')
+
+    assert first._client._client is get_http_client()
+    assert second._client._client is get_http_client()
+
+
+def test_clear_registry_creates_new_instances():
+    llm = get_llm('openai/gpt-5-nano')
+    client = get_http_client()
+
+    clear_llm_registry()
+
+    assert get_llm('openai/gpt-5-nano') is not llm
+    assert get_http_client() is not client
+
+
+def test_registry_can_be_disabled(monkeypatch):
+    monkeypatch.setattr(llm_config, 'LLM_POOL_ENABLED', False)
+    monkeypatch.setattr(llm_config.get_llm_cache(), 'mode', 'off')
+
+    assert get_llm('openai/gpt-5-nano') is not get_llm('openai/gpt-5-nano')
@@ -0,0 +1,77 @@
+import re
+
+import pytest
+
+from my_agents.output_budget import ResultStore, apply_output_budget, get_result_store, split_pages
+from my_agents.token_counter import TokenCounter
+from my_agents.tools import FetchResultTool, ReadFileTool
+
+
+class CharCounter(TokenCounter):
+    """1 Token = 1 Zeichen, damit Budgets exakt nachrechenbar sind"""
+    name = 'chars'
+
+    def count(self, text: str) -> int:
+        return len(text)
+
+
+TEXT = "".join(f"zeile {i:04d}: {'x' * (i % 37)}\n" for i in range(500))
+
+
+@pytest.mark.parametrize('budget', [50, 300, 4000])
+def test_split_pages_respects_budget_and_line_boundaries(budget):
+    pages = split_pages(TEXT, budget, CharCounter())
+
+    assert ''.join(pages) == TEXT
+    assert all(len(page) <= budget for page in pages)
+    if budget > 100:
+        # Zeilen sind höchstens 48 Zeichen lang - bei größeren Budgets wird nie mitten in einer Zeile geschnitten
+        assert all(page.endswith('\n') for page in pages)
+
+
+def test_split_pages_cuts_overlong_lines():
+    pages = split_pages('a' * 250, 100, CharCounter())
+    assert [len(page) for page in pages] == [95, 95, 60]
+
+
+def test_store_evicts_least_recently_used():
+    store = ResultStore(max_results=2)
+    first = store.spill('Grep', TEXT, 1000, CharCounter())
+    second = store.spill('Grep', TEXT, 1000, CharCounter())
+    assert store.get(first.handle) is first      # first ist jetzt zuletzt genutzt
+    store.spill('Grep', TEXT, 1000, CharCounter())
+
+    assert store.get(second.handle) is None
+    assert store.get(f" {first.handle} ") is first
+
+
+def test_small_output_is_unchanged():
+    assert apply_output_budget('Grep', 'kurz', 100) == 'kurz'
+    assert apply_output_budget('Grep', TEXT, 0) == TEXT
+
+
+def test_spilled_result_round_trip_through_fetch_result():
+    output = apply_output_budget('Grep', TEXT, 500)
+
+    assert output.startswith('⚠️  Ergebnis zu groß')
+    handle = re.search(r"handle='(r\d+)'", output).group(1)
+    result = get_result_store().get(handle)
+    assert ''.join(result.pages) == TEXT
+    assert result.pages[0].rstrip('\n') in output
+
+    fetch = FetchResultTool()
+    fetched = [fetch._run(handle=handle, page=page) for page in range(2, len(result.pages) + 1)]
+    for page, text in zip(result.pages[1:], fetched):
+        assert page.rstrip('\n') in text
+    assert 'Weiter mit "Fetch Result"' not in fetched[-1]
+    assert fetch._run(handle=handle, page=len(result.pages) + 1).startswith('⚠️')
+    assert fetch._run(handle='r999999', page=2).startswith('⚠️  Unbekanntes')
+
+
+def test_tool_output_is_paged_by_its_budget(tmp_path):
+    (tmp_path / 'lang.txt').write_text(TEXT)
+
+    output = ReadFileTool(work_dir=str(tmp_path), output_budget=300)._run(filename='lang.txt')
+
+    assert output.startswith('⚠️  Ergebnis zu groß')
+    assert 'Fetch Result' in output
@@ -0,0 +1,58 @@
+import pytest
+
+from my_agents.overlay_fs import activate_overlay, deactivate_overlay
+from my_agents.tools import DeleteFileTool, EditFileTool, ReadFileTool, WriteFileTool
+
+
+@pytest.fixture
+def overlay(tmp_path):
+    (tmp_path / 'app.py').write_text('print("alt")\n')
+    (tmp_path / 'old.txt').write_text('weg\n')
+    overlay = activate_overlay(str(tmp_path))
+    yield overlay
+    deactivate_overlay(str(tmp_path))
+
+
+def test_tool_writes_stay_in_memory_until_flush(tmp_path, overlay):
+    work_dir = str(tmp_path)
+    WriteFileTool(work_dir=work_dir)._run(filename='src/new.py', content='x = 1\n')
+    EditFileTool(work_dir=work_dir)._run(
+        filename='app.py', edits='<<<<<<< SEARCH\nprint("alt")\n=======\nprint("neu")\n>>>>>>> REPLACE\n')
+    DeleteFileTool(work_dir=work_dir)._run(filename='old.txt')
+
+    # Platte unverändert, Tools sehen den neuen Stand
+    assert (tmp_path / 'app.py').read_text() == 'print("alt")\n'
+    assert (tmp_path / 'old.txt').exists()
+    assert not (tmp_path / 'src').exists()
+    assert 'print("neu")' in ReadFileTool(work_dir=work_dir)._run(filename='app.py')
+    assert ReadFileTool(work_dir=work_dir)._run(filename='old.txt').startswith('⚠️')
+
+    written, deleted = overlay.flush()
+
+    assert sorted(written) == ['app.py', 'src/new.py']
+    assert deleted == ['old.txt']
+    assert (tmp_path / 'app.py').read_text() == 'print("neu")\n'
+    assert (tmp_path / 'src' / 'new.py').read_text() == 'x = 1\n'
+    assert not (tmp_path / 'old.txt').exists()
+    assert overlay.pending_changes() == []
+
+
+def test_flush_skips_unchanged_and_overlay_only_files(tmp_path, overlay):
+    overlay.write_text('app.py', 'print("alt")\n')
+    overlay.write_text('tmp.py', 'x = 1\n')
+    overlay.delete('tmp.py')
+
+    assert overlay.diff() == ''
+    assert overlay.flush() == ([], [])
+    assert not (tmp_path / 'tmp.py').exists()
+
+
+def test_diff_and_discard(tmp_path, overlay):
+    overlay.write_text('app.py', 'print("neu")\n')
+
+    diff = overlay.diff()
+    assert '--- a/app.py' in diff and '-print("alt")' in diff and '+print("neu")' in diff
+
+    overlay.discard()
+    assert overlay.flush() == ([], [])
+    assert (tmp_path / 'app.py').read_text() == 'print("alt")\n'
@@ -0,0 +1,43 @@
+from my_agents import project_summarizer
+from my_agents.project_index import ProjectIndex
+
+
+class CountingLLM:
+    model = 'test-model'
+
+    def __init__(self):
+        self.calls = 0
+
+    def call(self, messages):
+        self.calls += 1
+        return f"Zusammenfassung {hash(messages[0]['content'])}"
+
+
+def _make_project(root, directories=60):
+    for i in range(directories):
+        package = root / 'pkg' / f'modul{i}'
+        package.mkdir(parents=True)
+        (package / 'core.py').write_text(f"def run_{i}():\n    return {i}\n" * 5)
+
+
+def test_changed_directory_only_resummarizes_its_path(tmp_path, monkeypatch):
+    monkeypatch.delenv('AGENTS_REFRESH_SUMMARY', raising=False)
+    chunk = project_summarizer.chunk_project_by_directory
+    monkeypatch.setattr(project_summarizer, 'chunk_project_by_directory',
+                        lambda project_index: chunk(project_index, 300, 400))
+    _make_project(tmp_path)
+
+    llm = CountingLLM()
+    project_summarizer.summarize_large_project(ProjectIndex.build(str(tmp_path)), llm)
+    first_run = llm.calls
+
+    llm.calls = 0
+    project_summarizer.summarize_large_project(ProjectIndex.build(str(tmp_path)), llm)
+    assert llm.calls == 0
+
+    # Ordner wächst deutlich - Nachbar-Chunks dürfen sich nicht verschieben
+    with open(tmp_path / 'pkg' / 'modul7' / 'core.py', 'a') as f:
+        f.write("def extra():\n    return 'mehr Code'\n" * 20)
+    llm.calls = 0
+    project_summarizer.summarize_large_project(ProjectIndex.build(str(tmp_path)), llm)
+    assert 1 <= llm.calls <= 4 < first_run
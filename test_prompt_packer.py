@@ -0,0 +1,57 @@
+from my_agents.prompt_packer import TRUNCATION_MARKER, Excerpt, pack_excerpts
+from my_agents.token_counter import TokenCounter
+
+
+class CharCounter(TokenCounter):
+    """1 Token = 1 Zeichen, damit Budgets exakt nachrechenbar sind"""
+    name = 'chars'
+
+    def count(self, text: str) -> int:
+        return len(text)
+
+
+COUNTER = CharCounter()
+
+
+def _keys(chosen):
+    return [excerpt.key for excerpt in chosen]
+
+
+def test_highest_density_fills_budget_in_prompt_order():
+    candidates = [
+        Excerpt('a', 'a' * 100, value=10, order=2),
+        Excerpt('b', 'b' * 50, value=10, order=1),
+        Excerpt('c', 'c' * 30, value=1, order=0),
+        Excerpt('null', 'n' * 5, value=0, order=3),
+        Excerpt('leer', '', value=100, order=4),
+    ]
+    chosen = pack_excerpts(candidates, 160, COUNTER)
+
+    assert _keys(chosen) == ['b', 'a']
+    assert sum(excerpt.tokens for excerpt in chosen) <= 160
+
+
+def test_truncatable_excerpt_is_cut_to_remaining_budget():
+    text = "".join(f"zeile {i:04d}\n" for i in range(100))
+    candidates = [
+        Excerpt('kopf', 'k' * 100, value=100),
+        Excerpt('lang', text, value=10, order=1, truncatable=True),
+        Excerpt('fest', text, value=10, order=2),
+    ]
+    chosen = pack_excerpts(candidates, 400, COUNTER)
+
+    assert _keys(chosen) == ['kopf', 'lang']
+    truncated = chosen[1]
+    assert truncated.text.endswith(TRUNCATION_MARKER)
+    assert len(truncated.text[:-len(TRUNCATION_MARKER)].splitlines()[-1]) == len('zeile 0000')   # an einer Zeilengrenze
+    assert 200 <= truncated.tokens <= 300
+    assert sum(excerpt.tokens for excerpt in chosen) <= 400
+
+
+def test_continuation_requires_its_predecessor():
+    head = Excerpt('datei', 'd' * 100, value=10)
+    continuation = Excerpt('datei:mehr', 'm' * 40, value=2, order=1, requires='datei')
+
+    assert _keys(pack_excerpts([head, continuation], 150, COUNTER)) == ['datei', 'datei:mehr']
+    # Kopf passt nicht (nicht kürzbar) - Fortsetzung allein wäre sinnlos
+    assert _keys(pack_excerpts([head, continuation], 60, COUNTER)) == []
@@ -0,0 +1,67 @@
+import os
+
+from my_agents.project_index import ProjectIndex
+from my_agents.scan_cache import ScanCache
+from my_agents.token_counter import CharClassTokenCounter
+
+
+def _cached_paths(cache):
+    return {path for (path,) in cache._conn.execute("SELECT path FROM files")}
+
+
+def test_refresh_of_subset_prunes_deleted_files(tmp_path, monkeypatch):
+    monkeypatch.delenv('AGENTS_SCAN_CACHE', raising=False)
+    (tmp_path / 'a.py').write_text('x = 1\n')
+    (tmp_path / 'b.py').write_text('y = 2\n')
+    with ScanCache(str(tmp_path), CharClassTokenCounter()) as cache:
+        cache.refresh(ProjectIndex.build(str(tmp_path)))
+        assert _cached_paths(cache) == {'a.py', 'b.py'}
+
+    os.remove(tmp_path / 'b.py')
+    project_index = ProjectIndex.build(str(tmp_path))
+    with ScanCache(str(tmp_path), CharClassTokenCounter()) as cache:
+        cache.refresh(project_index, [project_index.get('a.py')])
+        assert _cached_paths(cache) == {'a.py'}
+
+
+class CountingCounter(CharClassTokenCounter):
+    def __init__(self):
+        self.counted = 0
+
+    def count_bytes(self, data):
+        self.counted += 1
+        return super().count_bytes(data)
+
+
+def test_unchanged_files_are_cache_hits(tmp_path, monkeypatch):
+    monkeypatch.delenv('AGENTS_SCAN_CACHE', raising=False)
+    (tmp_path / 'a.py').write_text('x = 1\n')
+    (tmp_path / 'b.py').write_text('y = 2\n')
+    with ScanCache(str(tmp_path), CharClassTokenCounter()) as cache:
+        assert cache.refresh(ProjectIndex.build(str(tmp_path))) == 2
+
+    counter = CountingCounter()
+    project_index = ProjectIndex.build(str(tmp_path))
+    with ScanCache(str(tmp_path), counter) as cache:
+        assert cache.load(project_index) == 2
+        assert cache.refresh(project_index) == 0
+    assert counter.counted == 0
+    assert project_index.get('a.py').tokens == CharClassTokenCounter().count('x = 1\n')
+
+
+def test_only_changed_files_are_read_and_counts_are_shared_by_hash(tmp_path, monkeypatch):
+    monkeypatch.delenv('AGENTS_SCAN_CACHE', raising=False)
+    (tmp_path / 'a.py').write_text('x = 1\n')
+    (tmp_path / 'b.py').write_text('y = 2\n')
+    with ScanCache(str(tmp_path), CharClassTokenCounter()) as cache:
+        cache.refresh(ProjectIndex.build(str(tmp_path)))
+
+    (tmp_path / 'b.py').write_text('y = 2  # geändert\n')
+    # Gleicher Inhalt wie a.py: Token-Anzahl über den Content-Hash
+    (tmp_path / 'c.py').write_text('x = 1\n')
+    counter = CountingCounter()
+    project_index = ProjectIndex.build(str(tmp_path))
+    with ScanCache(str(tmp_path), counter) as cache:
+        assert cache.refresh(project_index) == 2
+    assert counter.counted == 1
+    assert project_index.get('c.py').content_hash == project_index.get('a.py').content_hash
@@ -0,0 +1,84 @@
+import os
+
+from my_agents.test_runner import build_import_graph, format_summary, run_tests
+
+
+def _executed(summary):
+    return [result.path for result in summary.results if not result.cached]
+
+
+def test_changed_data_file_invalidates_cached_result(tmp_path):
+    tests = tmp_path / 'tests'
+    tests.mkdir()
+    (tests / 'data.txt').write_text('1')
+    (tests / 'test_data.py').write_text(
+        "import os\n\n\n"
+        "def test_data():\n"
+        "    with open(os.path.join(os.path.dirname(__file__), 'data.txt')) as f:\n"
+        "        assert f.read() == '1'\n"
+    )
+
+    assert _executed(run_tests(str(tmp_path), workers=1)) == ['tests/test_data.py']
+    assert _executed(run_tests(str(tmp_path), workers=1)) == []
+
+    (tests / 'data.txt').write_text('2')
+    summary = run_tests(str(tmp_path), workers=1)
+
+    assert _executed(summary) == ['tests/test_data.py']
+    assert summary.results[0].failed == 1
+    assert '✅' not in format_summary(summary)
+
+
+def test_changed_data_file_selects_tests_in_its_directory(tmp_path):
+    for name in ('a', 'b'):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / f'test_{name}.py').write_text("def test_ok():\n    pass\n")
+    (tmp_path / 'a' / 'fixture.json').write_text('{}')
+
+    summary = run_tests(str(tmp_path), changed_files=['a/fixture.json'], workers=1)
+
+    assert [result.path for result in summary.results] == ['a/test_a.py']
+
+
+def _make_package(root):
+    files = {
+        'pkg/__init__.py': '',
+        'pkg/core.py': 'def run():\n    return 1\n',
+        'pkg/sub/__init__.py': 'from .util import twice\n',
+        'pkg/sub/helper.py': 'from ..core import run\n',
+        'pkg/sub/util.py': 'from . import helper\n\n\ndef twice():\n    return 2 * helper.run()\n',
+        'src/lib/mod.py': 'VALUE = 3\n',
+        'tests/test_pkg.py': 'from pkg.sub import twice\n\n\ndef test_twice():\n    assert twice() == 2\n',
+        'tests/test_lib.py': 'import sys\nsys.path.insert(0, "src")\nfrom lib.mod import VALUE\n\n\n'
+                             'def test_value():\n    assert VALUE == 3\n',
+    }
+    for rel_path, content in files.items():
+        path = root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+
+
+def _p(rel_path):
+    return rel_path.replace('/', os.sep)
+
+
+def test_import_graph_resolves_relative_and_src_imports(tmp_path):
+    _make_package(tmp_path)
+    graph = build_import_graph(str(tmp_path))
+
+    assert graph.edges[_p('pkg/sub/helper.py')] == {_p('pkg/__init__.py'), _p('pkg/core.py')}
+    assert _p('pkg/sub/helper.py') in graph.edges[_p('pkg/sub/util.py')]
+    assert _p('src/lib/mod.py') in graph.edges[_p('tests/test_lib.py')]
+    assert _p('pkg/core.py') in graph.dependencies(_p('tests/test_pkg.py'))
+    assert _p('pkg/core.py') not in graph.dependencies(_p('tests/test_lib.py'))
+
+
+def test_changed_module_selects_dependent_tests_only(tmp_path):
+    _make_package(tmp_path)
+
+    summary = run_tests(str(tmp_path), changed_files=['pkg/core.py'], workers=1)
+    assert [result.path for result in summary.results] == ['tests/test_pkg.py']
+    assert summary.results[0].failed == 0
+
+    summary = run_tests(str(tmp_path), changed_files=['src/lib/mod.py'], workers=1)
+    assert [result.path for result in summary.results] == ['tests/test_lib.py']
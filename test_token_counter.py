@@ -0,0 +1,34 @@
+import pytest
+
+from my_agents import token_counter
+from my_agents.token_counter import CharClassTokenCounter, TokenCounter, get_token_counter
+
+
+def test_single_spaces_merge_with_next_word():
+    # o200k_base: 'hello', ' world', ',', ' this', ' is', ' a', ' test', '.'
+    assert CharClassTokenCounter().count('hello world, this is a test.') == 8
+
+
+def test_newline_with_indentation_is_one_token():
+    # o200k_base: 'a', '\n   ', ' b'
+    assert CharClassTokenCounter().count('a\n    b') == 3
+
+
+def test_token_counter_is_abstract():
+    with pytest.raises(TypeError):
+        TokenCounter()
+
+
+def test_auto_without_cached_encoding_stays_offline(tmp_path, monkeypatch):
+    monkeypatch.setenv('TIKTOKEN_CACHE_DIR', str(tmp_path))
+    monkeypatch.delenv('AGENTS_TOKENIZER', raising=False)
+
+    def no_download(*args, **kwargs):
+        raise AssertionError("tiktoken darf nicht geladen werden")
+
+    monkeypatch.setattr(token_counter, 'TiktokenCounter', no_download)
+    get_token_counter.cache_clear()
+    try:
+        assert isinstance(get_token_counter('auto'), CharClassTokenCounter)
+    finally:
+        get_token_counter.cache_clear()
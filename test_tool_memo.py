@@ -0,0 +1,66 @@
+import pytest
+
+from my_agents.tool_memo import ToolResultCache, get_tool_cache, memoize_tools
+from my_agents.tools import ReadFileTool, WriteFileTool
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    get_tool_cache().clear()
+    yield
+    get_tool_cache().clear()
+
+
+def test_repeated_read_is_served_from_memo(tmp_path):
+    (tmp_path / 'a.py').write_text('x = 1\n')
+    [read] = memoize_tools([ReadFileTool(work_dir=str(tmp_path))])
+    hits = get_tool_cache().hits
+
+    first = read._run(filename='a.py')
+    # Gleicher Agent, unverändert: nur ein Verweis - direkt danach wieder vollständig
+    assert read._run(filename='a.py').startswith('♻️')
+    assert read._run(filename='a.py') == first
+    assert get_tool_cache().hits == hits + 2
+
+
+def test_write_invalidates_memoized_read(tmp_path):
+    (tmp_path / 'a.py').write_text('x = 1\n')
+    [read] = memoize_tools([ReadFileTool(work_dir=str(tmp_path))])
+    [other_agent_read] = memoize_tools([ReadFileTool(work_dir=str(tmp_path))])
+    assert 'x = 1' in read._run(filename='a.py')
+
+    WriteFileTool(work_dir=str(tmp_path))._run(filename='a.py', content='x = 2\n')
+
+    assert 'x = 2' in read._run(filename='a.py')
+    assert 'x = 2' in other_agent_read._run(filename='a.py')
+
+
+def test_invalidate_only_affects_dependent_entries():
+    cache = ToolResultCache()
+    for tool, scope in (('read', 'pkg/a.py'), ('list', 'pkg'), ('grep', None),
+                        ('read2', 'pkg/b.py'), ('list2', 'pkg2')):
+        cache.put(('/work', tool, '{}'), 'ergebnis', scope)
+    cache.put(('/other', 'grep', '{}'), 'ergebnis', None)
+
+    assert cache.invalidate('/work', 'pkg/a.py') == 3
+
+    assert cache.get(('/work', 'read2', '{}')) is not None
+    assert cache.get(('/work', 'list2', '{}')) is not None
+    assert cache.get(('/other', 'grep', '{}')) is not None
+    assert cache.get(('/work', 'list', '{}')) is None
+
+
+def test_write_through_symlinked_work_dir_invalidates(tmp_path):
+    real = tmp_path / 'real'
+    real.mkdir()
+    (real / 'f.txt').write_text('a\n')
+    link = tmp_path / 'link'
+    link.symlink_to(real)
+    [read] = memoize_tools([ReadFileTool(work_dir=str(link))])
+    assert 'a' in read._run(filename='f.txt')
+
+    WriteFileTool(work_dir=str(link))._run(filename='f.txt', content='b\n')
+
+    result = read._run(filename='f.txt')
+    assert not result.startswith('♻️')
+    assert 'b' in result
@@ -0,0 +1,69 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from my_agents import tool_metrics
+from my_agents.tool_memo import memoize_tools
+from my_agents.tool_metrics import InstrumentedTool, get_tool_metrics, instrument_crew
+from my_agents.tools import ReadFileTool, WriteFileTool
+
+
+@pytest.fixture
+def crew(tmp_path, monkeypatch):
+    monkeypatch.setattr(tool_metrics, 'TOOL_METRICS_ENABLED', True)
+    get_tool_metrics().clear()
+    (tmp_path / 'a.txt').write_text('hallo\n')
+    work_dir = str(tmp_path)
+    agent = SimpleNamespace(role='Entwickler',
+                            tools=memoize_tools([ReadFileTool(work_dir=work_dir), WriteFileTool(work_dir=work_dir)]))
+    task = SimpleNamespace(agent=agent, tools=None, name=None,
+                           description='Implementiere die Funktion\nDetails folgen')
+    yield SimpleNamespace(agents=[agent], tasks=[task])
+    get_tool_metrics().clear()
+
+
+def test_calls_are_recorded_per_agent_and_task(crew, tmp_path):
+    instrument_crew(crew)
+    read, write = crew.tasks[0].tools
+
+    read._run(filename='a.txt')
+    read._run(filename='a.txt')
+    write._run(filename='b.txt', content='neu\n')
+    read._run(filename='../ausserhalb.txt')
+
+    records = get_tool_metrics().records()
+    assert [(r.agent, r.task, r.tool) for r in records] == [
+        ('Entwickler', 'Implementiere die Funktion', 'Read File')] * 2 + [
+        ('Entwickler', 'Implementiere die Funktion', 'Write File'),
+        ('Entwickler', 'Implementiere die Funktion', 'Read File')]
+    assert [r.cache_hit for r in records] == [False, True, False, False]
+    assert [r.error for r in records] == [False, False, False, True]
+    assert records[2].input_bytes == len(json.dumps({'filename': 'b.txt', 'content': 'neu\n'}).encode('utf-8'))
+    assert all(r.output_bytes > 0 and r.seconds >= 0 for r in records)
+
+
+def test_instrumenting_twice_does_not_double_wrap(crew):
+    instrument_crew(crew)
+    instrument_crew(crew)
+
+    for tool in crew.tasks[0].tools + crew.agents[0].tools:
+        assert isinstance(tool, InstrumentedTool)
+        assert not isinstance(tool.tool, InstrumentedTool)
+    assert {tool.task_label for tool in crew.agents[0].tools} == {tool_metrics.DELEGATED_TASK}
+
+
+def test_table_and_report(crew, tmp_path):
+    instrument_crew(crew)
+    read, write = crew.tasks[0].tools
+    read._run(filename='a.txt')
+    write._run(filename='b.txt', content='neu\n')
+
+    table = get_tool_metrics().format_table()
+    assert 'Read File' in table and 'Write File' in table and 'Gesamt' in table
+
+    report = json.loads(get_tool_metrics().write_report(str(tmp_path)).read_text(encoding='utf-8'))
+    assert report['total']['calls'] == 2
+    assert {(group['agent'], group['tool']) for group in report['by_agent_and_tool']} == {
+        ('Entwickler', 'Read File'), ('Entwickler', 'Write File')}
+    assert len(report['calls']) == 2